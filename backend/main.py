@@ -12,9 +12,14 @@ logging.basicConfig(
 from src.companies.company_service import CompanyService
 from src.companies.company_router import router as companies_router
 from src.config import settings
+from src.constants import TENDERS_PATH
 from src.database import connect_to_mongo, close_mongo_connection
 from src.feedback.feedback_router import router as feedback_router
 from src.feedback.feedback_service import FeedbackService
+from src.http_client import create_http_client
+from src.indexes import ensure_indexes
+from src.llm.embeddings import create_local_embedder
+from src.llm.llm_router import router as llm_router
 from src.llm.llm_service import create_llm_client
 from src.organization_classification.classification_router import (
     router as organization_classification_router,
@@ -22,6 +27,10 @@ from src.organization_classification.classification_router import (
 from src.organization_classification.classification_service import ClassificationService
 from src.recommendations.recommendation_router import router as recommendations_router
 from src.recommendations.recommendation_service import RecommendationService
+from src.tenders.tender_catalog import tender_catalog_store
+from src.tenders.tender_embeddings import TenderEmbeddingIndex
+from src.tenders.tender_extraction import DocumentExtractionEngine
+from src.tenders.tender_ingestion import AttachmentIngestionPipeline
 from src.tenders.tender_router import router as tenders_router
 from src.tenders.tender_service import TenderService
 
@@ -30,21 +39,50 @@ from src.tenders.tender_service import TenderService
 async def lifespan(app: FastAPI) -> AsyncIterator[None]:
     db = await connect_to_mongo()
     llm_client = create_llm_client()
+    app.state.llm_scheduler = llm_client.scheduler
+    http_client = create_http_client()
+    extraction_engine = DocumentExtractionEngine.from_settings()
+    await tender_catalog_store.start()
 
     app.state.company_service = CompanyService(db=db, llm_client=llm_client)
     app.state.feedback_service = FeedbackService(db=db)
-    app.state.classification_service = ClassificationService(
-        db=db, llm_client=llm_client
-    )
     app.state.tender_service = TenderService(
+        db=db,
         llm_client=llm_client,
+        http_client=http_client,
+        extraction_engine=extraction_engine,
         company_service=app.state.company_service,
     )
-    app.state.recommendation_service = RecommendationService(
+    app.state.classification_service = ClassificationService(
         db=db, llm_client=llm_client, tender_service=app.state.tender_service
     )
+    tender_embedder = create_local_embedder(settings.tender_embedding_model)
+    app.state.recommendation_service = RecommendationService(
+        db=db,
+        llm_client=llm_client,
+        tender_service=app.state.tender_service,
+        embedder=tender_embedder,
+        tender_embeddings=(
+            TenderEmbeddingIndex.load(TENDERS_PATH, tender_embedder.model_name)
+            if tender_embedder is not None
+            else None
+        ),
+    )
+    await ensure_indexes(db)
+    await app.state.recommendation_service.jobs.resume()
+
+    ingestion = AttachmentIngestionPipeline.from_settings(
+        db, app.state.tender_service.attachment_reader
+    )
+    if settings.attachment_ingestion_enabled:
+        await ingestion.start(tender_catalog_store)
 
     yield
+    await app.state.recommendation_service.jobs.stop()
+    await ingestion.stop()
+    await tender_catalog_store.stop()
+    await http_client.aclose()
+    extraction_engine.shutdown()
     await close_mongo_connection()
 
 
@@ -56,6 +94,7 @@ app = FastAPI(
 
 app.include_router(companies_router, prefix=settings.api_v1_prefix)
 app.include_router(feedback_router, prefix=settings.api_v1_prefix)
+app.include_router(llm_router, prefix=settings.api_v1_prefix)
 app.include_router(organization_classification_router, prefix=settings.api_v1_prefix)
 app.include_router(recommendations_router, prefix=settings.api_v1_prefix)
 app.include_router(tenders_router, prefix=settings.api_v1_prefix)
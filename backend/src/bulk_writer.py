@@ -0,0 +1,141 @@
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Any
+
+from motor.motor_asyncio import AsyncIOMotorCollection
+from pymongo.errors import BulkWriteError, PyMongoError
+
+from src.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Errors kept per report; the counts are always complete
+_MAX_REPORTED_ERRORS = 20
+
+
+@dataclass
+class BulkWriteReport:
+    submitted: int = 0
+    written: int = 0
+    failed: int = 0
+    batches: int = 0
+    # Time spent waiting on MongoDB, to compare with the run it belongs to
+    write_seconds: float = 0.0
+    errors: list[str] = field(default_factory=list)
+
+    def record_error(self, message: str) -> None:
+        if len(self.errors) < _MAX_REPORTED_ERRORS:
+            self.errors.append(message)
+
+
+class BulkWriter:
+    """Buffers write operations and sends them as unordered ``bulk_write`` batches.
+
+    A batch is flushed when it reaches ``batch_size`` operations or has waited
+    ``flush_interval_seconds``, and on exit. Unordered batches let MongoDB apply
+    the remaining operations when some fail; failures are counted in
+    :attr:`report` instead of being raised. Use as an async context manager::
+
+        async with BulkWriter(collection) as writer:
+            await writer.add(ReplaceOne(...))
+        writer.report
+    """
+
+    def __init__(
+        self,
+        collection: AsyncIOMotorCollection,
+        batch_size: int | None = None,
+        flush_interval_seconds: float | None = None,
+    ) -> None:
+        self.collection = collection
+        self.batch_size = batch_size or settings.mongo_bulk_write_batch_size
+        self.flush_interval = (
+            flush_interval_seconds
+            if flush_interval_seconds is not None
+            else settings.mongo_bulk_write_flush_interval_seconds
+        )
+        self.report = BulkWriteReport()
+        self._pending: list[Any] = []
+        self._lock = asyncio.Lock()
+        self._timer: asyncio.Task[None] | None = None
+
+    async def __aenter__(self) -> "BulkWriter":
+        if self.flush_interval > 0:
+            self._timer = asyncio.create_task(self._flush_periodically())
+        return self
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            await asyncio.gather(self._timer, return_exceptions=True)
+        await self.flush()
+        report = self.report
+        log = logger.warning if report.failed else logger.info
+        log(
+            "Bulk writes to '%s': %d/%d written in %d batches (%.2f s), %d failed",
+            self.collection.name,
+            report.written,
+            report.submitted,
+            report.batches,
+            report.write_seconds,
+            report.failed,
+        )
+
+    async def add(self, operation: Any) -> None:
+        self._pending.append(operation)
+        self.report.submitted += 1
+        if len(self._pending) >= self.batch_size:
+            await self.flush()
+
+    async def _flush_periodically(self) -> None:
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            await self.flush()
+
+    async def flush(self) -> None:
+        async with self._lock:
+            batch, self._pending = self._pending, []
+            if not batch:
+                return
+            report = self.report
+            report.batches += 1
+            start = time.perf_counter()
+            try:
+                result = await self.collection.bulk_write(batch, ordered=False)
+            except BulkWriteError as e:
+                details = e.details
+                write_errors = details.get("writeErrors", [])
+                report.written += sum(
+                    details.get(key, 0)
+                    for key in ("nInserted", "nUpserted", "nMatched", "nRemoved")
+                )
+                report.failed += len(write_errors)
+                for error in write_errors:
+                    report.record_error(
+                        f"op #{error.get('index')}: {error.get('errmsg')}"
+                    )
+                logger.error(
+                    "%d of %d writes to '%s' failed",
+                    len(write_errors),
+                    len(batch),
+                    self.collection.name,
+                )
+            except PyMongoError as e:
+                report.failed += len(batch)
+                report.record_error(f"batch of {len(batch)}: {e}")
+                logger.exception(
+                    "Bulk write of %d operations to '%s' failed",
+                    len(batch),
+                    self.collection.name,
+                )
+            else:
+                report.written += (
+                    result.inserted_count
+                    + result.upserted_count
+                    + result.matched_count
+                    + result.deleted_count
+                )
+            finally:
+                report.write_seconds += time.perf_counter() - start
@@ -0,0 +1,551 @@
+"""Operational commands for the backend.
+
+Usage::
+
+    uv run python -m src.cli <command> [options]
+"""
+
+import argparse
+import asyncio
+import gc
+import inspect
+import json
+import logging
+import time
+import tracemalloc
+from collections.abc import Callable, Sized
+from dataclasses import dataclass
+from pathlib import Path
+
+from langchain_core.callbacks import get_usage_metadata_callback
+from motor.motor_asyncio import AsyncIOMotorDatabase
+
+from src.companies.company_constants import (
+    COLLECTION_NAME as COMPANY_PROFILES_COLLECTION,
+)
+from src.companies.company_schemas import CompanyProfile, CompanyProfileDocument
+from src.config import settings
+from src.constants import TENDERS_PATH
+from src.database import close_mongo_connection, connect_to_mongo
+from src.feedback.feedback_constants import COLLECTION_NAME as FEEDBACK_COLLECTION
+from src.http_client import create_http_client
+from src.indexes import ensure_indexes, explain_hot_queries
+from src.llm.embeddings import create_local_embedder
+from src.llm.llm_service import create_llm_client
+from src.organization_classification.classification_constants import (
+    COLLECTION_NAME as ORG_CLASSIFICATION_COLLECTION,
+)
+from src.organization_classification.classification_schemas import (
+    OrganizationClassificationDocument,
+)
+from src.recommendations.recommendation_constants import (
+    COLLECTION_NAME as RECOMMENDATIONS_COLLECTION,
+)
+from src.recommendations.recommendation_prefilter import (
+    measure_recall,
+    prefilter_scores,
+    select_candidates,
+)
+from src.recommendations.recommendation_schemas import (
+    MatchLevel,
+    RecommendationResult,
+)
+from src.recommendations.recommendation_scoring import (
+    RecommendationScorer,
+    build_user_prompt,
+    unique_by_name,
+)
+from src.tenders.tender_attachments import AttachmentReader, get_file_extension
+from src.tenders.tender_catalog import read_catalog, read_tenders_json
+from src.tenders.tender_embeddings import (
+    TenderEmbeddingIndex,
+    embedding_text,
+    write_tender_embeddings,
+)
+from src.tenders.tender_extraction import DocumentExtractionEngine
+from src.tenders.tender_ingestion import AttachmentIngestionPipeline
+from src.tenders.tender_schemas import Tender
+from src.tenders.tender_snapshot import read_snapshot, write_snapshot
+from src.tenders.tender_text_cache import ExtractedTextCache
+
+logger = logging.getLogger(__name__)
+
+
+def build_snapshot(args: argparse.Namespace) -> None:
+    start = time.perf_counter()
+    tenders = read_tenders_json(args.tenders_path)
+    json_ms = (time.perf_counter() - start) * 1000
+
+    snapshot_path = write_snapshot(tenders, args.tenders_path)
+
+    start = time.perf_counter()
+    loaded = read_snapshot(args.tenders_path)
+    snapshot_ms = (time.perf_counter() - start) * 1000
+    if loaded is None:
+        raise SystemExit(f"Snapshot {snapshot_path} could not be read back")
+
+    print(f"Snapshot written to {snapshot_path} ({len(loaded)} tenders)")
+    print(f"JSON load:     {json_ms:8.1f} ms")
+    print(f"Snapshot load: {snapshot_ms:8.1f} ms")
+
+
+def _traced_bytes(load: Callable[[], Sized]) -> tuple[int, int]:
+    gc.collect()
+    tracemalloc.start()
+    loaded = load()
+    gc.collect()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return current, len(loaded)
+
+
+def _load_raw_records(tenders_path: Path) -> list[dict]:
+    with open(tenders_path, "r", encoding="utf-8") as f:
+        return json.load(f)["tenders"]
+
+
+# Shape of the tender dataclasses before slots, interning and URL compression,
+# kept here only as the baseline for bench-memory
+@dataclass
+class _PlainTenderMetadata:
+    name: str
+    organization: str
+    submission_deadline: str
+    initiation_date: str
+    procedure_type: str | None = None
+    source_type: str = ""
+
+
+@dataclass
+class _PlainTender:
+    tender_url: str
+    metadata: _PlainTenderMetadata
+    files_count: int
+    file_urls: list[str]
+
+
+def _load_plain_tenders(tenders_path: Path) -> list[_PlainTender]:
+    return [
+        _PlainTender(
+            tender_url=t["tender_url"],
+            metadata=_PlainTenderMetadata(**t["metadata"]),
+            files_count=t["files_count"],
+            file_urls=t["file_urls"],
+        )
+        for t in _load_raw_records(tenders_path)
+    ]
+
+
+def _load_compact_tenders(tenders_path: Path) -> list[Tender]:
+    # Built from a fresh parse so the raw dicts are released before measuring
+    return [Tender.from_json(t) for t in _load_raw_records(tenders_path)]
+
+
+def bench_memory(args: argparse.Namespace) -> None:
+    plain_bytes, count = _traced_bytes(lambda: _load_plain_tenders(args.tenders_path))
+    compact_bytes, _ = _traced_bytes(lambda: _load_compact_tenders(args.tenders_path))
+
+    print(f"Tenders: {count}")
+    for label, size in (
+        ("Plain dataclasses", plain_bytes),
+        ("Tender objects", compact_bytes),
+    ):
+        print(
+            f"{label:<18} {size / 1024 / 1024:8.2f} MiB  "
+            f"({size / max(count, 1):8.0f} B/tender)"
+        )
+    print(f"Saved: {(1 - compact_bytes / plain_bytes) * 100:.1f}%")
+
+
+async def _time_extraction(
+    engine: DocumentExtractionEngine, files: list[Path], repeat: int, concurrency: int
+) -> float:
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def extract(path: Path) -> None:
+        async with semaphore:
+            await engine.extract(path, get_file_extension(path.name))
+
+    # Warm up once so process start-up is not counted against the pool
+    await extract(files[0])
+    start = time.perf_counter()
+    await asyncio.gather(*(extract(path) for _ in range(repeat) for path in files))
+    return time.perf_counter() - start
+
+
+async def bench_extraction(args: argparse.Namespace) -> None:
+    total = len(args.files) * args.repeat
+    for mode in ("thread", "process"):
+        engine = DocumentExtractionEngine(
+            mode=mode,
+            max_workers=args.workers,
+            max_tasks_per_child=args.max_tasks_per_child,
+            timeout_seconds=args.timeout,
+            pdf_pages_per_task=args.pdf_pages_per_task,
+        )
+        try:
+            elapsed = await _time_extraction(
+                engine, args.files, args.repeat, args.concurrency
+            )
+        finally:
+            engine.shutdown()
+        print(
+            f"{mode:<8} {total} extractions in {elapsed:7.2f} s  "
+            f"({total / elapsed:7.1f} files/s)"
+        )
+
+
+async def ingest_attachments(args: argparse.Namespace) -> None:
+    tenders = read_catalog(args.tenders_path).tenders[: args.limit]
+    db = await connect_to_mongo()
+    http_client = create_http_client()
+    extraction_engine = DocumentExtractionEngine.from_settings()
+    try:
+        text_cache = ExtractedTextCache(db, settings.extracted_text_cache_max_bytes)
+        if not text_cache.enabled:
+            raise SystemExit(
+                "EXTRACTED_TEXT_CACHE_MAX_BYTES is 0; nothing to ingest into"
+            )
+        await ensure_indexes(db)
+        pipeline = AttachmentIngestionPipeline(
+            db=db,
+            attachment_reader=AttachmentReader(
+                http_client, text_cache, extraction_engine
+            ),
+            concurrency=args.concurrency,
+            max_attempts=settings.attachment_ingestion_max_attempts,
+        )
+        report = await pipeline.run(tenders, retry_failed=args.retry_failed)
+    finally:
+        await http_client.aclose()
+        extraction_engine.shutdown()
+        await close_mongo_connection()
+
+    print(f"Attachments: {report.total} ({report.skipped} skipped)")
+    print(f"Succeeded:   {report.succeeded}")
+    print(f"Failed:      {report.failed}")
+    print(f"Elapsed:     {report.elapsed_seconds:.1f} s")
+
+
+async def _load_scoring_inputs(
+    db: AsyncIOMotorDatabase, company_name: str
+) -> tuple[CompanyProfile, dict[str, list[str]], list[str]]:
+    raw_profile = await db[COMPANY_PROFILES_COLLECTION].find_one({"_id": company_name})
+    if raw_profile is None:
+        raise SystemExit(f"Company not found: {company_name}")
+    org_industries: dict[str, list[str]] = {}
+    async for raw in db[ORG_CLASSIFICATION_COLLECTION].find({}):
+        doc = OrganizationClassificationDocument.from_mongo(raw)
+        org_industries[doc.id] = [entry.industry for entry in doc.industries]
+    feedbacks = [
+        doc["feedback_comment"]
+        async for doc in db[FEEDBACK_COLLECTION].find({"company_name": company_name})
+    ]
+    return (
+        CompanyProfileDocument.from_mongo(raw_profile).profile,
+        org_industries,
+        feedbacks,
+    )
+
+
+async def _time_scoring(
+    scorer: RecommendationScorer,
+    profile: CompanyProfile,
+    items: list[tuple[Tender, str]],
+    org_industries: dict[str, list[str]],
+    feedbacks: list[str],
+    concurrency: int,
+) -> tuple[list[RecommendationResult | Exception], float, int, int]:
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def score(
+        batch: list[tuple[Tender, str]],
+    ) -> list[RecommendationResult | Exception]:
+        async with semaphore:
+            try:
+                return await scorer.score_batch(
+                    profile, batch, org_industries, feedbacks
+                )
+            except Exception as e:
+                return [e] * len(batch)
+
+    size = scorer.batch_size
+    with get_usage_metadata_callback() as usage:
+        start = time.perf_counter()
+        outcomes = await asyncio.gather(
+            *(score(items[i : i + size]) for i in range(0, len(items), size))
+        )
+        elapsed = time.perf_counter() - start
+    input_tokens = sum(u["input_tokens"] for u in usage.usage_metadata.values())
+    output_tokens = sum(u["output_tokens"] for u in usage.usage_metadata.values())
+    return (
+        [o for batch in outcomes for o in batch],
+        elapsed,
+        input_tokens,
+        output_tokens,
+    )
+
+
+async def bench_scoring(args: argparse.Namespace) -> None:
+    db = await connect_to_mongo()
+    try:
+        profile, org_industries, feedbacks = await _load_scoring_inputs(
+            db, args.company
+        )
+    finally:
+        await close_mongo_connection()
+
+    tenders = unique_by_name(read_catalog(args.tenders_path).tenders)[: args.limit]
+    items = [
+        (tender, build_user_prompt(profile, tender, org_industries, feedbacks))
+        for tender in tenders
+    ]
+    llm_client = create_llm_client()
+
+    print(f"Tenders: {len(items)}, model: {settings.llm_model}")
+    outcomes: dict[int, list[RecommendationResult | Exception]] = {}
+    for batch_size in (1, args.batch_size):
+        results, elapsed, input_tokens, output_tokens = await _time_scoring(
+            RecommendationScorer(llm_client, batch_size),
+            profile,
+            items,
+            org_industries,
+            feedbacks,
+            args.concurrency,
+        )
+        outcomes[batch_size] = results
+        cost = (
+            input_tokens * args.input_price + output_tokens * args.output_price
+        ) / 1_000_000
+        failed = sum(isinstance(r, Exception) for r in results)
+        print(
+            f"batch={batch_size:<3} {elapsed:7.1f} s  in={input_tokens:>8} tok  "
+            f"out={output_tokens:>7} tok  ${cost:8.4f}  failed={failed}"
+        )
+
+    pairs = [
+        (single, batched)
+        for single, batched in zip(outcomes[1], outcomes[args.batch_size])
+        if not isinstance(single, Exception) and not isinstance(batched, Exception)
+    ]
+    agreeing = sum(
+        single.name_match == batched.name_match
+        and single.industry_match == batched.industry_match
+        for single, batched in pairs
+    )
+    print(f"Same match levels in both modes: {agreeing}/{len(pairs)}")
+
+
+async def eval_prefilter(args: argparse.Namespace) -> None:
+    db = await connect_to_mongo()
+    try:
+        profile, org_industries, _ = await _load_scoring_inputs(db, args.company)
+        stored = {
+            doc["_id"]["tender_name"]: MatchLevel(doc["name_match"])
+            async for doc in db[RECOMMENDATIONS_COLLECTION].find(
+                {"_id.company_name": args.company, "skipped": {"$ne": True}},
+                {"name_match": 1},
+            )
+        }
+    finally:
+        await close_mongo_connection()
+
+    tenders = unique_by_name(read_catalog(args.tenders_path).tenders)
+    scores = prefilter_scores(profile, tenders, org_industries)
+    print(f"Tenders: {len(tenders)}, stored recommendations: {len(stored)}")
+    print("threshold  candidates  recall (name match)  recall (all stored)")
+    for threshold in args.thresholds:
+        candidates = select_candidates(scores, threshold, args.max_candidates)
+        report = measure_recall(tenders, candidates, stored, threshold)
+        print(
+            f"{threshold:9.2f}  {report.candidates:10}  "
+            f"{_format_ratio(report.recall):>19}  "
+            f"{_format_ratio(report.recommended_recall):>19}"
+        )
+
+
+def _format_ratio(value: float | None) -> str:
+    return "n/a" if value is None else f"{value:.1%}"
+
+
+def build_embeddings(args: argparse.Namespace) -> None:
+    if not args.model:
+        raise SystemExit("No model given; set TENDER_EMBEDDING_MODEL or pass --model")
+    embedder = create_local_embedder(args.model)
+    if embedder is None:
+        raise SystemExit(f"Embedding model {args.model} could not be loaded")
+
+    tenders = read_catalog(args.tenders_path).tenders
+    start = time.perf_counter()
+    path = write_tender_embeddings(
+        tenders, embedder, args.tenders_path, args.batch_size
+    )
+    print(f"Embeddings written to {path} in {time.perf_counter() - start:.1f} s")
+
+    index = TenderEmbeddingIndex.load(args.tenders_path, args.model)
+    if index is None:
+        raise SystemExit(f"Embeddings {path} could not be read back")
+    [query] = embedder.embed_sync([embedding_text(tenders[0])])
+    start = time.perf_counter()
+    index.top_k(query, 10)
+    print(
+        f"Top-10 over {len(index)} tenders: "
+        f"{(time.perf_counter() - start) * 1000:.2f} ms"
+    )
+
+
+async def check_indexes(args: argparse.Namespace) -> None:
+    db = await connect_to_mongo()
+    try:
+        await ensure_indexes(db)
+        reports = await explain_hot_queries(db)
+    finally:
+        await close_mongo_connection()
+
+    for report in reports:
+        status = "ok" if report.uses_index else "COLLSCAN"
+        print(
+            f"{status:<8}  {report.collection:<22}  {report.name:<34}  "
+            f"{' > '.join(report.stages)}"
+        )
+    scans = [report.name for report in reports if not report.uses_index]
+    if scans:
+        raise SystemExit(f"{len(scans)} hot query(ies) scan the whole collection")
+
+
+def _build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m src.cli")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    snapshot = commands.add_parser(
+        "build-snapshot",
+        help="Compile tenders.json into a binary snapshot and report load times",
+    )
+    snapshot.add_argument("--tenders-path", type=Path, default=TENDERS_PATH)
+    snapshot.set_defaults(handler=build_snapshot)
+
+    memory = commands.add_parser(
+        "bench-memory",
+        help="Measure resident size of the parsed tender catalog",
+    )
+    memory.add_argument("--tenders-path", type=Path, default=TENDERS_PATH)
+    memory.set_defaults(handler=bench_memory)
+
+    extraction = commands.add_parser(
+        "bench-extraction",
+        help="Compare thread vs process-pool text extraction throughput",
+    )
+    extraction.add_argument("files", type=Path, nargs="+")
+    extraction.add_argument("--repeat", type=int, default=5)
+    extraction.add_argument("--concurrency", type=int, default=8)
+    extraction.add_argument("--workers", type=int, default=settings.extraction_workers)
+    extraction.add_argument(
+        "--max-tasks-per-child",
+        type=int,
+        default=settings.extraction_max_tasks_per_child,
+    )
+    extraction.add_argument(
+        "--pdf-pages-per-task",
+        type=int,
+        default=settings.extraction_pdf_pages_per_task,
+    )
+    extraction.add_argument(
+        "--timeout", type=float, default=settings.extraction_timeout_seconds
+    )
+    extraction.set_defaults(handler=bench_extraction)
+
+    ingest = commands.add_parser(
+        "ingest-attachments",
+        help="Download and extract every catalog attachment into the text cache",
+    )
+    ingest.add_argument("--tenders-path", type=Path, default=TENDERS_PATH)
+    ingest.add_argument(
+        "--concurrency", type=int, default=settings.attachment_ingestion_concurrency
+    )
+    ingest.add_argument(
+        "--limit", type=int, default=None, help="Only ingest the first N tenders"
+    )
+    ingest.add_argument(
+        "--retry-failed",
+        action="store_true",
+        help="Also retry attachments that exhausted their attempts",
+    )
+    ingest.set_defaults(handler=ingest_attachments)
+
+    scoring = commands.add_parser(
+        "bench-scoring",
+        help="Compare per-tender vs batched LLM recommendation scoring "
+        "(tokens, cost, wall-clock, agreement); results are not saved",
+    )
+    scoring.add_argument("company")
+    scoring.add_argument("--tenders-path", type=Path, default=TENDERS_PATH)
+    scoring.add_argument("--limit", type=int, default=50)
+    scoring.add_argument("--batch-size", type=int, default=10)
+    scoring.add_argument(
+        "--concurrency", type=int, default=settings.llm_concurrency_initial
+    )
+    scoring.add_argument(
+        "--input-price",
+        type=float,
+        default=0.15,
+        help="USD per 1M input tokens (default: gpt-4o-mini)",
+    )
+    scoring.add_argument(
+        "--output-price",
+        type=float,
+        default=0.60,
+        help="USD per 1M output tokens (default: gpt-4o-mini)",
+    )
+    scoring.set_defaults(handler=bench_scoring)
+
+    prefilter = commands.add_parser(
+        "eval-prefilter",
+        help="Report recall of the local pre-filter against stored LLM "
+        "recommendations for a range of thresholds",
+    )
+    prefilter.add_argument("company")
+    prefilter.add_argument("--tenders-path", type=Path, default=TENDERS_PATH)
+    prefilter.add_argument(
+        "--thresholds",
+        type=float,
+        nargs="+",
+        default=[0.0, 0.05, 0.1, 0.2, 0.3],
+    )
+    prefilter.add_argument(
+        "--max-candidates",
+        type=int,
+        default=settings.recommendation_prefilter_max_candidates,
+    )
+    prefilter.set_defaults(handler=eval_prefilter)
+
+    embeddings = commands.add_parser(
+        "build-embeddings",
+        help="Embed every tender with the local model into a memory-mapped matrix",
+    )
+    embeddings.add_argument("--tenders-path", type=Path, default=TENDERS_PATH)
+    embeddings.add_argument("--model", default=settings.tender_embedding_model)
+    embeddings.add_argument("--batch-size", type=int, default=256)
+    embeddings.set_defaults(handler=build_embeddings)
+
+    indexes = commands.add_parser(
+        "check-indexes",
+        help="Create registered indexes and verify hot queries avoid collection scans",
+    )
+    indexes.set_defaults(handler=check_indexes)
+
+    return parser
+
+
+def main(argv: list[str] | None = None) -> None:
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s | %(levelname)-8s | %(name)s | %(message)s",
+    )
+    args = _build_parser().parse_args(argv)
+    result = args.handler(args)
+    if inspect.iscoroutine(result):
+        asyncio.run(result)
+
+
+if __name__ == "__main__":
+    main()
@@ -13,6 +13,8 @@ from src.companies.company_schemas import (
     CompanyProfileDocument,
     CompanyProfileResponse,
 )
+from src.llm.llm_scheduler import llm_request_config
+from src.llm.llm_schemas import LLMPriority
 
 logger = logging.getLogger(__name__)
 
@@ -47,6 +49,7 @@ class CompanyService:
                 HumanMessage(content=user_prompt),
             ],
             response_format={"type": "json_object"},
+            config=llm_request_config(LLMPriority.INTERACTIVE, company_name),
         )
 
         raw_content = response.content
@@ -21,6 +21,18 @@ class Settings(BaseSettings):
     # "mongodb" = read cached recommendations from MongoDB, filtered by match levels
     # "llm"    = generate recommendations via LLM, save each to MongoDB
     recommendations_source: Literal["mongodb", "llm"] = "mongodb"
+    # Tenders scored per LLM request. Above 1, one prompt carries the system prompt and
+    # company profile for the whole batch (compare with: python -m src.cli bench-scoring)
+    recommendation_batch_size: int = 1
+
+    # Local lexical pre-filter before LLM scoring: tenders whose name and organization
+    # industries barely overlap the company profile are dropped without an LLM call.
+    # The threshold is relative to the best-scoring tender (0-1); check recall against
+    # stored recommendations with: python -m src.cli eval-prefilter COMPANY
+    recommendation_prefilter_enabled: bool = False
+    recommendation_prefilter_threshold: float = 0.05
+    # Keep at most this many top-scoring tenders per company; 0 = no cap
+    recommendation_prefilter_max_candidates: int = 0
 
     llm_model: str = "gpt-4o-mini"
 
@@ -28,6 +40,88 @@ class Settings(BaseSettings):
     # Useful for test data from the past, e.g. TENDER_DEADLINE_DATE=2026-01-10
     tender_deadline_date: date | None = None
 
+    # How often tenders.json is checked (mtime + size) for changes; 0 disables hot reload
+    tender_catalog_poll_interval_seconds: float = 30.0
+
+    # Load tenders from the compiled snapshot (python -m src.cli build-snapshot) when it
+    # matches the content hash of tenders.json; falls back to parsing the JSON otherwise
+    tender_snapshot_enabled: bool = True
+
+    # Upper bound for text extracted from tender attachments and cached in MongoDB;
+    # least recently read entries are evicted first. 0 disables the cache.
+    extracted_text_cache_max_bytes: int = 512 * 1024 * 1024
+
+    # Shared outbound HTTP client (attachment downloads, Langfuse ingestion)
+    http_max_connections: int = 100
+    http_max_keepalive_connections: int = 20
+    http_keepalive_expiry_seconds: float = 30.0
+    http_max_connections_per_host: int = 10
+    http_timeout_seconds: float = 60.0
+    # Requires the optional "h2" package (pip install "httpx[http2]")
+    http2_enabled: bool = False
+
+    # Attachment text extraction: "process" runs pypdf/python-docx in a process pool
+    # (large PDFs are split into page ranges), "thread" uses asyncio.to_thread
+    extraction_mode: Literal["process", "thread"] = "process"
+    extraction_workers: int = 2
+    # Worker processes are replaced after this many tasks to bound memory growth
+    extraction_max_tasks_per_child: int = 50
+    extraction_timeout_seconds: float = 120.0
+    extraction_pdf_pages_per_task: int = 25
+
+    # Background pre-extraction of every catalog attachment into the text cache
+    # (also available as: python -m src.cli ingest-attachments)
+    attachment_ingestion_enabled: bool = False
+    attachment_ingestion_concurrency: int = 4
+    # Attachments that failed this many times are skipped until retried explicitly
+    attachment_ingestion_max_attempts: int = 3
+
+    # Token budget shared by all tool outputs within one tender agent question; when
+    # exceeded, outputs are truncated in proportion to their size. 0 disables it.
+    agent_context_budget_tokens: int = 48_000
+
+    # Tender chat sessions (history + memoized tool results) expire after this long idle
+    chat_session_ttl_seconds: int = 24 * 3600
+
+    # Cache of agent answers to first questions, keyed by tender, normalized question and
+    # company profile hash. 0 disables it.
+    answer_cache_ttl_seconds: int = 6 * 3600
+    # Optional near-duplicate matching with a local fastembed model
+    # (e.g. "sentence-transformers/paraphrase-multilingual-MiniLM-L12-v2"); empty = exact only
+    answer_cache_embedding_model: str = ""
+    answer_cache_similarity_threshold: float = 0.92
+
+    # Local fastembed model for tender similarity search (requires the optional
+    # 'fastembed' and 'numpy' packages); vectors are precomputed with
+    # python -m src.cli build-embeddings. Empty disables the feature.
+    tender_embedding_model: str = ""
+
+    # Batch results (recommendations, organization classifications) are buffered and
+    # written with unordered bulk_write once this many are pending or after the interval
+    mongo_bulk_write_batch_size: int = 500
+    mongo_bulk_write_flush_interval_seconds: float = 2.0
+
+    # Concurrent LLM calls across all services adapt (AIMD): the limit grows by about
+    # one per window of healthy calls while saturated and is multiplied by the backoff
+    # ratio on a 429 or timeout. Calls slower than the threshold don't grow it.
+    llm_concurrency_initial: int = 5
+    llm_concurrency_min: int = 1
+    llm_concurrency_max: int = 32
+    llm_concurrency_backoff_ratio: float = 0.5
+    llm_concurrency_latency_threshold_seconds: float = 30.0
+    # 429s and timeouts are retried here rather than inside the OpenAI SDK, so the limit
+    # sees every one and each retry waits for a slot again. Waits for Retry-After when
+    # the response has it, otherwise base * 2^attempt seconds.
+    llm_max_retries: int = 2
+    llm_retry_base_delay_seconds: float = 1.0
+
+    # Account-wide OpenAI rate limits enforced before requests are sent (0 disables a
+    # limit). Token cost is estimated from the prompt plus the expected completion
+    # length (or max_tokens when set) and corrected with the reported usage.
+    llm_requests_per_minute: int = 0
+    llm_tokens_per_minute: int = 0
+    llm_expected_output_tokens: int = 500
+
     # Langfuse LLM observability (self-hosted)
     langfuse_secret_key: str = ""
     langfuse_public_key: str = ""
@@ -1 +1,20 @@
+from typing import Any
+
+from pymongo import ASCENDING, IndexModel
+
 COLLECTION_NAME = "feedbacks"
+
+INDEXES = {
+    COLLECTION_NAME: [IndexModel([("company_name", ASCENDING)])],
+}
+
+# Query shapes, shared by the service and the index check (src/indexes.py)
+
+
+def feedbacks_by_company_filter(company_name: str) -> dict[str, Any]:
+    return {"company_name": company_name}
+
+
+# A fixed order keeps prompts, and so input fingerprints, stable across
+# storage-order changes such as a compaction or resync
+FEEDBACK_SORT = [("_id", ASCENDING)]
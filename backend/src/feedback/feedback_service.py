@@ -3,7 +3,10 @@ import uuid
 
 from motor.motor_asyncio import AsyncIOMotorDatabase
 
-from src.feedback.feedback_constants import COLLECTION_NAME
+from src.feedback.feedback_constants import (
+    COLLECTION_NAME,
+    feedbacks_by_company_filter,
+)
 from src.feedback.feedback_schemas import (
     FeedbackDocument,
     FeedbackListResponse,
@@ -21,7 +24,7 @@ class FeedbackService:
         logger.info("Loading feedbacks for company '%s'", company_name)
         collection = self.db[COLLECTION_NAME]
 
-        cursor = collection.find({"company_name": company_name})
+        cursor = collection.find(feedbacks_by_company_filter(company_name))
         documents = await cursor.to_list(length=None)
 
         feedbacks = [
@@ -0,0 +1,92 @@
+import asyncio
+import importlib.util
+import logging
+from collections import defaultdict
+from collections.abc import AsyncIterator, Callable
+
+import httpx
+
+from src.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class _ReleasingStream(httpx.AsyncByteStream):
+    """Response body wrapper that runs ``release`` once the body is closed."""
+
+    def __init__(self, stream: httpx.AsyncByteStream, release: Callable[[], None]):
+        self._stream = stream
+        self._release: Callable[[], None] | None = release
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        async for chunk in self._stream:
+            yield chunk
+
+    async def aclose(self) -> None:
+        try:
+            await self._stream.aclose()
+        finally:
+            if self._release is not None:
+                self._release()
+                self._release = None
+
+
+class _PerHostLimitTransport(httpx.AsyncBaseTransport):
+    """Caps concurrent requests per host on top of the pool-wide limits.
+
+    A slot is held until the response body is closed, so streamed downloads
+    count against the cap for their whole duration.
+    """
+
+    def __init__(self, transport: httpx.AsyncBaseTransport, per_host: int) -> None:
+        self._transport = transport
+        self._semaphores: defaultdict[str, asyncio.Semaphore] = defaultdict(
+            lambda: asyncio.Semaphore(per_host)
+        )
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        semaphore = self._semaphores[request.url.host]
+        await semaphore.acquire()
+        try:
+            response = await self._transport.handle_async_request(request)
+        except BaseException:
+            semaphore.release()
+            raise
+        response.stream = _ReleasingStream(
+            response.stream,  # type: ignore[arg-type]
+            semaphore.release,
+        )
+        return response
+
+    async def aclose(self) -> None:
+        await self._transport.aclose()
+
+
+def _http2_available() -> bool:
+    if not settings.http2_enabled:
+        return False
+    if importlib.util.find_spec("h2") is None:
+        logger.warning("HTTP2_ENABLED is set but 'h2' is not installed; using HTTP/1.1")
+        return False
+    return True
+
+
+def create_http_client() -> httpx.AsyncClient:
+    limits = httpx.Limits(
+        max_connections=settings.http_max_connections,
+        max_keepalive_connections=settings.http_max_keepalive_connections,
+        keepalive_expiry=settings.http_keepalive_expiry_seconds,
+    )
+    transport = httpx.AsyncHTTPTransport(limits=limits, http2=_http2_available())
+    logger.info(
+        "Creating shared HTTP client (max %d connections, %d per host)",
+        settings.http_max_connections,
+        settings.http_max_connections_per_host,
+    )
+    return httpx.AsyncClient(
+        transport=_PerHostLimitTransport(
+            transport, settings.http_max_connections_per_host
+        ),
+        timeout=settings.http_timeout_seconds,
+        follow_redirects=True,
+    )
@@ -0,0 +1,174 @@
+"""MongoDB index registry.
+
+Every module declares the indexes its queries rely on as ``INDEXES`` in its
+constants file (collection name -> ``IndexModel`` list); :func:`ensure_indexes`
+creates all of them at startup. :data:`HOT_QUERIES` lists the queries run on
+request and job paths, built from the same filter/sort builders the services
+use (also in the constants files), and :func:`explain_hot_queries` reports
+the plan MongoDB picks for each, so a missing or unusable index shows up as a
+``COLLSCAN`` (see ``python -m src.cli check-indexes``).
+"""
+
+import logging
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any
+
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import IndexModel
+
+from src.feedback.feedback_constants import (
+    COLLECTION_NAME as FEEDBACK_COLLECTION,
+    FEEDBACK_SORT,
+    INDEXES as FEEDBACK_INDEXES,
+    feedbacks_by_company_filter,
+)
+from src.recommendations.recommendation_constants import (
+    COLLECTION_NAME as RECOMMENDATIONS_COLLECTION,
+    INDEXES as RECOMMENDATION_INDEXES,
+    JOBS_COLLECTION_NAME,
+    active_job_filter,
+    fingerprints_filter,
+    recommendations_by_match_filter,
+    stored_recommendations_filter,
+)
+from src.tenders.tender_constants import (
+    ANSWER_CACHE_COLLECTION_NAME,
+    ATTACHMENT_INGESTION_COLLECTION_NAME,
+    EXTRACTED_TEXT_COLLECTION_NAME,
+    EXTRACTED_TEXT_EVICTION_SORT,
+    INDEXES as TENDER_INDEXES,
+    answers_by_attachment_filter,
+    extracted_text_by_hash_filter,
+    finished_ingestions_filter,
+    similar_answers_filter,
+)
+
+logger = logging.getLogger(__name__)
+
+INDEX_REGISTRY: tuple[dict[str, list[IndexModel]], ...] = (
+    FEEDBACK_INDEXES,
+    RECOMMENDATION_INDEXES,
+    TENDER_INDEXES,
+)
+
+
+async def ensure_indexes(db: AsyncIOMotorDatabase) -> None:
+    for indexes in INDEX_REGISTRY:
+        for collection_name, models in indexes.items():
+            names = await db[collection_name].create_indexes(models)
+            logger.info("Ensured indexes on %s: %s", collection_name, names)
+
+
+@dataclass
+class HotQuery:
+    name: str
+    collection: str
+    filter: dict[str, Any]
+    sort: list[tuple[str, int]] | None = None
+
+
+# Argument values are placeholders: the planner picks an index by query shape
+HOT_QUERIES: tuple[HotQuery, ...] = (
+    HotQuery(
+        name="recommendations by match level",
+        collection=RECOMMENDATIONS_COLLECTION,
+        filter=recommendations_by_match_filter("", "", ""),
+    ),
+    HotQuery(
+        name="stored recommendations",
+        collection=RECOMMENDATIONS_COLLECTION,
+        filter=stored_recommendations_filter(""),
+    ),
+    HotQuery(
+        name="recommendation fingerprints",
+        collection=RECOMMENDATIONS_COLLECTION,
+        filter=fingerprints_filter(""),
+    ),
+    HotQuery(
+        name="feedbacks by company",
+        collection=FEEDBACK_COLLECTION,
+        filter=feedbacks_by_company_filter(""),
+        sort=FEEDBACK_SORT,
+    ),
+    HotQuery(
+        name="active recommendation job",
+        collection=JOBS_COLLECTION_NAME,
+        filter=active_job_filter(""),
+    ),
+    HotQuery(
+        name="extracted text by content hash",
+        collection=EXTRACTED_TEXT_COLLECTION_NAME,
+        filter=extracted_text_by_hash_filter(""),
+    ),
+    HotQuery(
+        name="extracted text eviction order",
+        collection=EXTRACTED_TEXT_COLLECTION_NAME,
+        filter={},
+        sort=EXTRACTED_TEXT_EVICTION_SORT,
+    ),
+    HotQuery(
+        name="finished attachment ingestions",
+        collection=ATTACHMENT_INGESTION_COLLECTION_NAME,
+        filter=finished_ingestions_filter(retry_failed=False, max_attempts=0),
+    ),
+    HotQuery(
+        name="cached answers for similarity",
+        collection=ANSWER_CACHE_COLLECTION_NAME,
+        filter=similar_answers_filter("", "", datetime.now(timezone.utc)),
+    ),
+    HotQuery(
+        name="cached answers by attachment",
+        collection=ANSWER_CACHE_COLLECTION_NAME,
+        filter=answers_by_attachment_filter(""),
+    ),
+)
+
+
+@dataclass
+class QueryPlanReport:
+    name: str
+    collection: str
+    stages: list[str] = field(default_factory=list)
+
+    @property
+    def uses_index(self) -> bool:
+        return "COLLSCAN" not in self.stages
+
+
+def plan_stages(plan: dict[str, Any]) -> list[str]:
+    """Stage names of a winning plan, outermost first.
+
+    Walks every nested plan node, so classic (``inputStage``/``inputStages``),
+    slot-based (``queryPlan``) and sharded (``shards``) explain output all work.
+    """
+    stages: list[str] = []
+
+    def walk(node: Any) -> None:
+        if isinstance(node, dict):
+            if isinstance(node.get("stage"), str):
+                stages.append(node["stage"])
+            for value in node.values():
+                walk(value)
+        elif isinstance(node, list):
+            for item in node:
+                walk(item)
+
+    walk(plan)
+    return stages
+
+
+async def explain_query(db: AsyncIOMotorDatabase, query: HotQuery) -> QueryPlanReport:
+    find: dict[str, Any] = {"find": query.collection, "filter": query.filter}
+    if query.sort:
+        find["sort"] = dict(query.sort)
+    explained = await db.command({"explain": find, "verbosity": "queryPlanner"})
+    return QueryPlanReport(
+        name=query.name,
+        collection=query.collection,
+        stages=plan_stages(explained["queryPlanner"]["winningPlan"]),
+    )
+
+
+async def explain_hot_queries(db: AsyncIOMotorDatabase) -> list[QueryPlanReport]:
+    return [await explain_query(db, query) for query in HOT_QUERIES]
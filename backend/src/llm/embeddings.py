@@ -0,0 +1,57 @@
+"""Optional local text embeddings.
+
+Backed by ``fastembed`` (ONNX models run on CPU, no API calls). The package
+is not a hard dependency: when it is missing, or no model is configured,
+:func:`create_local_embedder` returns ``None`` and callers skip
+similarity-based features.
+"""
+
+import asyncio
+import logging
+import math
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+
+def normalize(vector: list[float]) -> list[float]:
+    norm = math.sqrt(sum(x * x for x in vector))
+    return [x / norm for x in vector] if norm else vector
+
+
+def cosine_similarity(a: list[float], b: list[float]) -> float:
+    """Cosine similarity of two vectors already scaled to unit length."""
+    return sum(x * y for x, y in zip(a, b))
+
+
+class LocalEmbedder:
+    def __init__(self, model: Any, model_name: str) -> None:
+        self._model = model
+        self.model_name = model_name
+
+    def embed_sync(self, texts: list[str]) -> list[list[float]]:
+        return [normalize([float(x) for x in v]) for v in self._model.embed(texts)]
+
+    async def embed(self, texts: list[str]) -> list[list[float]]:
+        return await asyncio.to_thread(self.embed_sync, texts)
+
+
+def create_local_embedder(model_name: str) -> LocalEmbedder | None:
+    if not model_name:
+        return None
+    try:
+        from fastembed import TextEmbedding
+    except ImportError:
+        logger.warning(
+            "Embedding model %s configured but 'fastembed' is not installed; "
+            "similarity matching is disabled",
+            model_name,
+        )
+        return None
+
+    logger.info("Loading local embedding model %s", model_name)
+    try:
+        return LocalEmbedder(TextEmbedding(model_name=model_name), model_name)
+    except Exception:
+        logger.warning("Cannot load embedding model %s", model_name, exc_info=True)
+        return None
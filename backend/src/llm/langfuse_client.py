@@ -33,12 +33,14 @@ class LangfuseTrace:
     def __init__(
         self,
         name: str,
+        http_client: httpx.AsyncClient,
         user_id: str | None = None,
         session_id: str | None = None,
         tags: list[str] | None = None,
     ) -> None:
         self.trace_id = _new_id()
         self.name = name
+        self.http_client = http_client
         self.user_id = user_id
         self.session_id = session_id
         self.tags = tags or []
@@ -163,23 +165,23 @@ class LangfuseTrace:
         batch = [trace_event, *self._events]
 
         try:
-            async with httpx.AsyncClient(timeout=10.0) as client:
-                response = await client.post(
-                    _INGESTION_URL,
-                    json={"batch": batch},
-                    auth=(settings.langfuse_public_key, settings.langfuse_secret_key),
+            response = await self.http_client.post(
+                _INGESTION_URL,
+                json={"batch": batch},
+                auth=(settings.langfuse_public_key, settings.langfuse_secret_key),
+                timeout=10.0,
+            )
+            if response.status_code >= 400:
+                logger.warning(
+                    "Langfuse ingestion failed: %s %s",
+                    response.status_code,
+                    response.text,
+                )
+            else:
+                logger.debug(
+                    "Langfuse trace %s flushed (%d events)",
+                    self.trace_id,
+                    len(batch),
                 )
-                if response.status_code >= 400:
-                    logger.warning(
-                        "Langfuse ingestion failed: %s %s",
-                        response.status_code,
-                        response.text,
-                    )
-                else:
-                    logger.debug(
-                        "Langfuse trace %s flushed (%d events)",
-                        self.trace_id,
-                        len(batch),
-                    )
         except Exception:
             logger.warning("Failed to send trace to Langfuse", exc_info=True)
@@ -0,0 +1,7 @@
+from fastapi import Request
+
+from src.llm.llm_scheduler import LLMScheduler
+
+
+def get_llm_scheduler(request: Request) -> LLMScheduler:
+    return request.app.state.llm_scheduler  # type: ignore[no-any-return]
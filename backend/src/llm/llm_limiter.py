@@ -0,0 +1,106 @@
+"""Adaptive limit on concurrent LLM calls.
+
+The window follows AIMD (additive increase, multiplicative decrease), as in
+TCP congestion control: every healthy call (no error, latency under the
+threshold) made while the window is in use grows it by ``1 / window``, i.e.
+by about one slot per window of calls; a rate-limit response or a timeout
+shrinks it by the backoff ratio. Calls that started before the last decrease
+don't shrink it again, so a burst of 429s from the same window counts once.
+
+The limiter does not queue: :class:`~src.llm.llm_scheduler.LLMScheduler`
+decides which waiting request gets a free slot.
+"""
+
+import asyncio
+import logging
+import time
+
+import openai
+
+from src.llm.llm_schemas import LLMConcurrencyMetrics
+
+logger = logging.getLogger(__name__)
+
+
+def is_overload_error(error: BaseException) -> bool:
+    return isinstance(
+        error, (openai.RateLimitError, openai.APITimeoutError, asyncio.TimeoutError)
+    )
+
+
+def retry_delay_seconds(
+    error: BaseException, attempt: int, base_seconds: float
+) -> float:
+    response = getattr(error, "response", None)
+    retry_after = response.headers.get("retry-after") if response is not None else None
+    try:
+        return max(float(retry_after), 0.0)  # type: ignore[arg-type]
+    except (TypeError, ValueError):
+        return base_seconds * 2**attempt
+
+
+class AdaptiveConcurrencyLimiter:
+    def __init__(
+        self,
+        initial_limit: int,
+        min_limit: int,
+        max_limit: int,
+        backoff_ratio: float,
+        latency_threshold_seconds: float,
+    ) -> None:
+        self.min_limit = max(min_limit, 1)
+        self.max_limit = max(max_limit, self.min_limit)
+        self.backoff_ratio = backoff_ratio
+        self.latency_threshold_seconds = latency_threshold_seconds
+        self._window = float(min(max(initial_limit, self.min_limit), self.max_limit))
+        self._in_flight = 0
+        self._last_decrease_at = 0.0
+        self.metrics = LLMConcurrencyMetrics(limit=self.limit)
+
+    @property
+    def limit(self) -> int:
+        return int(self._window)
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    def snapshot(self) -> LLMConcurrencyMetrics:
+        self.metrics.limit = self.limit
+        self.metrics.in_flight = self._in_flight
+        return self.metrics
+
+    def try_acquire(self) -> bool:
+        if self._in_flight >= self.limit:
+            return False
+        self._in_flight += 1
+        return True
+
+    def release(self) -> None:
+        self._in_flight -= 1
+
+    def record(self, started_at: float, error: BaseException | None) -> None:
+        """Adapt the limit to the outcome of a call; call before :meth:`release`."""
+        self.metrics.calls += 1
+        latency = time.monotonic() - started_at
+        previous = self.limit
+        if error is not None and is_overload_error(error):
+            self.metrics.overloads += 1
+            if started_at >= self._last_decrease_at:
+                self._window = max(self._window * self.backoff_ratio, self.min_limit)
+                self._last_decrease_at = time.monotonic()
+        elif error is not None:
+            self.metrics.errors += 1
+        elif latency > self.latency_threshold_seconds:
+            self.metrics.slow_calls += 1
+        elif self._in_flight >= self.limit:
+            # Only a saturated window says anything about spare capacity
+            self._window = min(self._window + 1 / self._window, self.max_limit)
+        if self.limit != previous:
+            logger.info(
+                "LLM concurrency limit %d -> %d (%d in flight)",
+                previous,
+                self.limit,
+                self._in_flight,
+            )
+        self.metrics.limit = self.limit
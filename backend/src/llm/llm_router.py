@@ -0,0 +1,31 @@
+from fastapi import APIRouter, Depends
+
+from src.llm.llm_dependencies import get_llm_scheduler
+from src.llm.llm_scheduler import LLMScheduler
+from src.llm.llm_schemas import LLMConcurrencyResponse, LLMSchedulerResponse
+
+router = APIRouter(prefix="/llm", tags=["llm"])
+
+
+@router.get(
+    "/concurrency",
+    response_model=LLMConcurrencyResponse,
+    description="Current adaptive limit on concurrent LLM calls, calls in flight "
+    "and call outcomes since the process started.",
+)
+async def get_llm_concurrency(
+    scheduler: LLMScheduler = Depends(get_llm_scheduler),
+) -> LLMConcurrencyResponse:
+    return scheduler.limiter.snapshot().to_response()
+
+
+@router.get(
+    "/scheduler",
+    response_model=LLMSchedulerResponse,
+    description="Configured rate limits (0 means none), what is left of them, and "
+    "waiting and admitted LLM requests per priority class.",
+)
+async def get_llm_scheduler_metrics(
+    scheduler: LLMScheduler = Depends(get_llm_scheduler),
+) -> LLMSchedulerResponse:
+    return scheduler.snapshot().to_response()
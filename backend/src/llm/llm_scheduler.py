@@ -0,0 +1,239 @@
+"""Process-wide admission of LLM requests.
+
+Every request from the shared client waits in one queue. Priority classes
+are served strictly in order (interactive chat before batch scoring); within
+a class, companies take turns, so one company's large batch can't hold back
+another's requests. The request at the head is admitted once the adaptive
+concurrency limit has a free slot and the requests-per-minute and
+tokens-per-minute buckets can cover it. Its token cost is estimated before
+the call (prompt, tool schemas and the expected completion) and corrected
+with the reported usage once the call returns.
+
+Callers declare priority and company through run metadata, see
+:func:`llm_request_config`; it is inherited by nested runs, so the tender
+agent sets it once per question.
+"""
+
+import asyncio
+import logging
+import time
+from collections import OrderedDict, deque
+from collections.abc import AsyncIterator, Sequence
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from typing import Any
+
+from langchain_core.messages import BaseMessage
+from langchain_core.runnables import RunnableConfig
+
+from src.llm.llm_limiter import AdaptiveConcurrencyLimiter
+from src.llm.llm_schemas import LLMPriority, LLMSchedulerMetrics
+from src.llm.tokenizer import count_tokens
+
+logger = logging.getLogger(__name__)
+
+LLM_PRIORITY_METADATA_KEY = "llm_priority"
+LLM_COMPANY_METADATA_KEY = "llm_company"
+
+# Role and separator tokens OpenAI adds around every message
+_MESSAGE_OVERHEAD_TOKENS = 4
+
+
+def llm_request_config(
+    priority: LLMPriority, company_name: str | None = None
+) -> RunnableConfig:
+    metadata: dict[str, Any] = {LLM_PRIORITY_METADATA_KEY: priority.value}
+    if company_name is not None:
+        metadata[LLM_COMPANY_METADATA_KEY] = company_name
+    return {"metadata": metadata}
+
+
+def estimate_request_tokens(
+    messages: Sequence[BaseMessage],
+    tools: Sequence[Any] | None,
+    completion_tokens: int,
+) -> int:
+    prompt = sum(
+        count_tokens(message.text) + _MESSAGE_OVERHEAD_TOKENS for message in messages
+    )
+    if tools:
+        prompt += count_tokens(str(list(tools)))
+    return prompt + completion_tokens
+
+
+class TokenBucket:
+    """Budget of ``per_minute`` units, refilled continuously."""
+
+    def __init__(self, per_minute: int) -> None:
+        self.capacity = float(per_minute)
+        self.rate = per_minute / 60
+        self._available = self.capacity
+        self._updated_at = time.monotonic()
+
+    @property
+    def available(self) -> float:
+        now = time.monotonic()
+        self._available = min(
+            self._available + (now - self._updated_at) * self.rate, self.capacity
+        )
+        self._updated_at = now
+        return self._available
+
+    def wait_seconds(self, amount: float) -> float:
+        # A request larger than the whole budget only waits for a full bucket
+        missing = min(amount, self.capacity) - self.available
+        return missing / self.rate if missing > 0 else 0.0
+
+    def take(self, amount: float) -> None:
+        """Spend ``amount``; negative refunds. May go below zero to record overuse."""
+        self._available = min(self.available - amount, self.capacity)
+
+
+@dataclass
+class AdmissionTicket:
+    priority: LLMPriority
+    company: str
+    estimated_tokens: int
+    admitted: asyncio.Future[None]
+    enqueued_at: float = field(default_factory=time.monotonic)
+    used_tokens: int | None = None
+
+
+class LLMScheduler:
+    def __init__(
+        self,
+        limiter: AdaptiveConcurrencyLimiter,
+        requests_per_minute: int,
+        tokens_per_minute: int,
+    ) -> None:
+        self.limiter = limiter
+        self._requests = (
+            TokenBucket(requests_per_minute) if requests_per_minute > 0 else None
+        )
+        self._tokens = TokenBucket(tokens_per_minute) if tokens_per_minute > 0 else None
+        # Per priority: company -> its waiting requests, in round-robin order
+        self._queues: dict[LLMPriority, OrderedDict[str, deque[AdmissionTicket]]] = {
+            priority: OrderedDict() for priority in LLMPriority
+        }
+        self._timer: asyncio.TimerHandle | None = None
+        self.metrics = LLMSchedulerMetrics(
+            requests_per_minute=max(requests_per_minute, 0),
+            tokens_per_minute=max(tokens_per_minute, 0),
+        )
+
+    def snapshot(self) -> LLMSchedulerMetrics:
+        self.metrics.available_requests = (
+            self._requests.available if self._requests is not None else None
+        )
+        self.metrics.available_tokens = (
+            self._tokens.available if self._tokens is not None else None
+        )
+        for priority, queue in self._queues.items():
+            waiting = [
+                company
+                for company, tickets in queue.items()
+                for ticket in tickets
+                if not ticket.admitted.done()
+            ]
+            self.metrics.waiting[priority] = len(waiting)
+            self.metrics.waiting_companies[priority] = len(set(waiting))
+        return self.metrics
+
+    def _head(self) -> AdmissionTicket | None:
+        for queue in self._queues.values():
+            while queue:
+                company, tickets = next(iter(queue.items()))
+                # Callers cancelled while waiting are dropped lazily
+                while tickets and tickets[0].admitted.done():
+                    tickets.popleft()
+                if tickets:
+                    return tickets[0]
+                del queue[company]
+        return None
+
+    def _wait_seconds(self, ticket: AdmissionTicket) -> float:
+        return max(
+            self._requests.wait_seconds(1) if self._requests is not None else 0.0,
+            (
+                self._tokens.wait_seconds(ticket.estimated_tokens)
+                if self._tokens is not None
+                else 0.0
+            ),
+        )
+
+    def _retry_in(self, delay: float) -> None:
+        loop = asyncio.get_running_loop()
+        due = loop.time() + delay
+        if self._timer is not None:
+            if self._timer.when() <= due:
+                return
+            self._timer.cancel()
+        self._timer = loop.call_at(due, self._on_timer)
+
+    def _on_timer(self) -> None:
+        self._timer = None
+        self._dispatch()
+
+    def _dispatch(self) -> None:
+        # Strict head-of-line order: a large request is not overtaken by
+        # smaller ones, or it could wait for the token bucket forever
+        while (ticket := self._head()) is not None:
+            delay = self._wait_seconds(ticket)
+            if delay > 0:
+                self._retry_in(delay)
+                return
+            if not self.limiter.try_acquire():
+                # Freeing a slot dispatches again
+                return
+
+            queue = self._queues[ticket.priority]
+            queue[ticket.company].popleft()
+            queue.move_to_end(ticket.company)
+            if self._requests is not None:
+                self._requests.take(1)
+            if self._tokens is not None:
+                self._tokens.take(ticket.estimated_tokens)
+            stats = self.metrics.by_priority[ticket.priority]
+            stats.admitted += 1
+            stats.admitted_tokens += ticket.estimated_tokens
+            stats.wait_seconds += time.monotonic() - ticket.enqueued_at
+            ticket.admitted.set_result(None)
+
+    def _finish(self, ticket: AdmissionTicket) -> None:
+        self.limiter.release()
+        if self._tokens is not None and ticket.used_tokens is not None:
+            self._tokens.take(ticket.used_tokens - ticket.estimated_tokens)
+        self._dispatch()
+
+    @asynccontextmanager
+    async def admit(
+        self, priority: LLMPriority, company: str, estimated_tokens: int
+    ) -> AsyncIterator[AdmissionTicket]:
+        """Wait for the request's turn; set ``used_tokens`` on the yielded ticket."""
+        ticket = AdmissionTicket(
+            priority=priority,
+            company=company,
+            estimated_tokens=estimated_tokens,
+            admitted=asyncio.get_running_loop().create_future(),
+        )
+        self._queues[priority].setdefault(company, deque()).append(ticket)
+        self._dispatch()
+        try:
+            await ticket.admitted
+        except asyncio.CancelledError:
+            if ticket.admitted.done() and not ticket.admitted.cancelled():
+                # Admitted just as the caller was cancelled
+                self._finish(ticket)
+            raise
+
+        started_at = time.monotonic()
+        error: BaseException | None = None
+        try:
+            yield ticket
+        except BaseException as e:
+            error = e
+            raise
+        finally:
+            if not isinstance(error, asyncio.CancelledError):
+                self.limiter.record(started_at, error)
+            self._finish(ticket)
@@ -0,0 +1,114 @@
+from dataclasses import dataclass, field
+from enum import StrEnum
+
+from pydantic import BaseModel
+
+
+# --- Domain ---
+
+
+class LLMPriority(StrEnum):
+    """Scheduling classes, highest first."""
+
+    INTERACTIVE = "interactive"
+    BATCH = "batch"
+
+
+@dataclass
+class LLMConcurrencyMetrics:
+    limit: int
+    in_flight: int = 0
+    calls: int = 0
+    overloads: int = 0
+    errors: int = 0
+    slow_calls: int = 0
+
+    def to_response(self) -> "LLMConcurrencyResponse":
+        return LLMConcurrencyResponse(
+            limit=self.limit,
+            in_flight=self.in_flight,
+            calls=self.calls,
+            overloads=self.overloads,
+            errors=self.errors,
+            slow_calls=self.slow_calls,
+        )
+
+
+@dataclass
+class LLMPriorityMetrics:
+    admitted: int = 0
+    admitted_tokens: int = 0
+    wait_seconds: float = 0.0
+
+
+@dataclass
+class LLMSchedulerMetrics:
+    requests_per_minute: int
+    tokens_per_minute: int
+    available_requests: float | None = None
+    available_tokens: float | None = None
+    waiting: dict[LLMPriority, int] = field(default_factory=dict)
+    waiting_companies: dict[LLMPriority, int] = field(default_factory=dict)
+    by_priority: dict[LLMPriority, LLMPriorityMetrics] = field(
+        default_factory=lambda: {
+            priority: LLMPriorityMetrics() for priority in LLMPriority
+        }
+    )
+
+    def to_response(self) -> "LLMSchedulerResponse":
+        return LLMSchedulerResponse(
+            requests_per_minute=self.requests_per_minute,
+            tokens_per_minute=self.tokens_per_minute,
+            available_requests=(
+                None
+                if self.available_requests is None
+                else round(self.available_requests, 1)
+            ),
+            available_tokens=(
+                None if self.available_tokens is None else round(self.available_tokens)
+            ),
+            priorities=[
+                LLMPriorityResponse(
+                    priority=priority,
+                    waiting=self.waiting.get(priority, 0),
+                    waiting_companies=self.waiting_companies.get(priority, 0),
+                    admitted=metrics.admitted,
+                    admitted_tokens=metrics.admitted_tokens,
+                    avg_wait_seconds=(
+                        round(metrics.wait_seconds / metrics.admitted, 3)
+                        if metrics.admitted
+                        else 0.0
+                    ),
+                )
+                for priority, metrics in self.by_priority.items()
+            ],
+        )
+
+
+# --- Response ---
+
+
+class LLMConcurrencyResponse(BaseModel):
+    limit: int
+    in_flight: int
+    calls: int
+    overloads: int
+    errors: int
+    slow_calls: int
+
+
+class LLMPriorityResponse(BaseModel):
+    priority: LLMPriority
+    waiting: int
+    waiting_companies: int
+    admitted: int
+    admitted_tokens: int
+    avg_wait_seconds: float
+
+
+class LLMSchedulerResponse(BaseModel):
+    requests_per_minute: int
+    tokens_per_minute: int
+    available_requests: float | None
+    available_tokens: float | None
+    priorities: list[LLMPriorityResponse]
@@ -1,11 +1,201 @@
+import asyncio
+import logging
+from collections.abc import AsyncIterator
+from contextlib import AbstractAsyncContextManager
+from typing import Any
+
+from langchain_core.callbacks import AsyncCallbackManagerForLLMRun
+from langchain_core.language_models import LanguageModelInput
+from langchain_core.messages import AIMessageChunk, BaseMessage
+from langchain_core.outputs import ChatGenerationChunk, ChatResult
+from langchain_core.runnables import RunnableConfig, ensure_config
 from langchain_openai import ChatOpenAI
+from pydantic import PrivateAttr
 
 from src.config import settings
+from src.llm.llm_limiter import (
+    AdaptiveConcurrencyLimiter,
+    is_overload_error,
+    retry_delay_seconds,
+)
+from src.llm.llm_scheduler import (
+    LLM_COMPANY_METADATA_KEY,
+    LLM_PRIORITY_METADATA_KEY,
+    AdmissionTicket,
+    LLMScheduler,
+    estimate_request_tokens,
+)
+from src.llm.llm_schemas import LLMPriority
+
+logger = logging.getLogger(__name__)
+
+# Private kwarg carrying the metadata of a direct astream() call to _astream
+_SCHEDULING_METADATA_KWARG = "_llm_scheduling_metadata"
+
+
+class ScheduledChatOpenAI(ChatOpenAI):
+    """``ChatOpenAI`` whose requests go through one process-wide scheduler.
+
+    Tool binding and structured output wrap this same instance, so every
+    service and the tender agent share :attr:`scheduler`. Priority and company
+    come from the run metadata (see ``llm_request_config``), including the
+    ``config`` passed to a direct :meth:`astream`; requests without it are
+    scheduled as anonymous batch work.
+    """
+
+    _scheduler: LLMScheduler = PrivateAttr()
+
+    def __init__(self, scheduler: LLMScheduler, **kwargs: Any) -> None:
+        super().__init__(**kwargs)
+        self._scheduler = scheduler
+
+    @property
+    def scheduler(self) -> LLMScheduler:
+        return self._scheduler
+
+    @staticmethod
+    def _request_metadata(
+        run_manager: AsyncCallbackManagerForLLMRun | None, kwargs: dict[str, Any]
+    ) -> dict[str, Any]:
+        # Popped first: it must not reach the OpenAI request
+        metadata = kwargs.pop(_SCHEDULING_METADATA_KWARG, None)
+        if metadata is not None:
+            return metadata
+        if run_manager is not None:
+            return run_manager.metadata
+        # Streaming runs get no run manager; inside the agent graph the run
+        # config is still available from the context
+        return ensure_config().get("metadata", {})
+
+    def _admit(
+        self,
+        messages: list[BaseMessage],
+        metadata: dict[str, Any],
+        kwargs: dict[str, Any],
+    ) -> AbstractAsyncContextManager[AdmissionTicket]:
+        return self._scheduler.admit(
+            LLMPriority(metadata.get(LLM_PRIORITY_METADATA_KEY, LLMPriority.BATCH)),
+            metadata.get(LLM_COMPANY_METADATA_KEY, ""),
+            estimate_request_tokens(
+                messages,
+                kwargs.get("tools"),
+                kwargs.get("max_tokens")
+                or self.max_tokens
+                or settings.llm_expected_output_tokens,
+            ),
+        )
+
+    @staticmethod
+    def _retry_delay(error: Exception, attempt: int) -> float | None:
+        """Seconds to wait before retrying an overloaded call, ``None`` to give up."""
+        if not is_overload_error(error) or attempt >= settings.llm_max_retries:
+            return None
+        delay = retry_delay_seconds(
+            error, attempt, settings.llm_retry_base_delay_seconds
+        )
+        logger.warning(
+            "LLM overloaded (%s); retry %d/%d in %.1f s",
+            type(error).__name__,
+            attempt + 1,
+            settings.llm_max_retries,
+            delay,
+        )
+        return delay
+
+    async def astream(
+        self,
+        input: LanguageModelInput,
+        config: RunnableConfig | None = None,
+        *,
+        stop: list[str] | None = None,
+        **kwargs: Any,
+    ) -> AsyncIterator[AIMessageChunk]:
+        # BaseChatModel.astream calls _astream without its run manager, and
+        # outside a runnable there is no run config in context either
+        kwargs[_SCHEDULING_METADATA_KWARG] = ensure_config(config).get("metadata", {})
+        async for chunk in super().astream(input, config, stop=stop, **kwargs):
+            yield chunk
+
+    async def _agenerate(
+        self,
+        messages: list[BaseMessage],
+        stop: list[str] | None = None,
+        run_manager: AsyncCallbackManagerForLLMRun | None = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        if self.streaming:
+            # Delegates to _astream, which waits for admission
+            return await super()._agenerate(messages, stop, run_manager, **kwargs)
+        metadata = self._request_metadata(run_manager, kwargs)
+        attempt = 0
+        while True:
+            try:
+                async with self._admit(messages, metadata, kwargs) as ticket:
+                    result = await super()._agenerate(
+                        messages, stop, run_manager, **kwargs
+                    )
+                    usage = (result.llm_output or {}).get("token_usage") or {}
+                    ticket.used_tokens = usage.get("total_tokens")
+                    return result
+            except Exception as e:
+                delay = self._retry_delay(e, attempt)
+                if delay is None:
+                    raise
+            await asyncio.sleep(delay)
+            attempt += 1
+
+    async def _astream(
+        self,
+        messages: list[BaseMessage],
+        stop: list[str] | None = None,
+        run_manager: AsyncCallbackManagerForLLMRun | None = None,
+        **kwargs: Any,
+    ) -> AsyncIterator[ChatGenerationChunk]:
+        metadata = self._request_metadata(run_manager, kwargs)
+        attempt = 0
+        while True:
+            yielded = False
+            try:
+                async with self._admit(messages, metadata, kwargs) as ticket:
+                    async for chunk in super()._astream(
+                        messages, stop, run_manager, **kwargs
+                    ):
+                        usage = getattr(chunk.message, "usage_metadata", None)
+                        if usage:
+                            used = ticket.used_tokens or 0
+                            ticket.used_tokens = used + usage["total_tokens"]
+                        yielded = True
+                        yield chunk
+                return
+            except Exception as e:
+                # Chunks already handed out can't be taken back
+                delay = None if yielded else self._retry_delay(e, attempt)
+                if delay is None:
+                    raise
+            await asyncio.sleep(delay)
+            attempt += 1
+
+
+def create_llm_scheduler() -> LLMScheduler:
+    return LLMScheduler(
+        AdaptiveConcurrencyLimiter(
+            initial_limit=settings.llm_concurrency_initial,
+            min_limit=settings.llm_concurrency_min,
+            max_limit=settings.llm_concurrency_max,
+            backoff_ratio=settings.llm_concurrency_backoff_ratio,
+            latency_threshold_seconds=settings.llm_concurrency_latency_threshold_seconds,
+        ),
+        requests_per_minute=settings.llm_requests_per_minute,
+        tokens_per_minute=settings.llm_tokens_per_minute,
+    )
 
 
-def create_llm_client() -> ChatOpenAI:
-    return ChatOpenAI(
+def create_llm_client() -> ScheduledChatOpenAI:
+    return ScheduledChatOpenAI(
+        scheduler=create_llm_scheduler(),
         api_key=settings.openai_api_key,
         model=settings.llm_model,
         temperature=0.2,
+        # Retried in ScheduledChatOpenAI, through the concurrency limit
+        max_retries=0,
     )
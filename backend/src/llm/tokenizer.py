@@ -0,0 +1,53 @@
+"""Local token counting for prompt budgeting.
+
+Uses the tiktoken encoding of the configured model. tiktoken fetches its BPE
+tables on first use; when they cannot be loaded (e.g. no network), counts fall
+back to an estimate of ``CHARS_PER_TOKEN`` characters per token.
+"""
+
+import functools
+import logging
+from typing import Any
+
+from src.config import settings
+
+logger = logging.getLogger(__name__)
+
+CHARS_PER_TOKEN = 4
+_FALLBACK_ENCODING = "o200k_base"
+
+
+@functools.cache
+def _encoding() -> Any | None:
+    try:
+        import tiktoken
+
+        try:
+            return tiktoken.encoding_for_model(settings.llm_model)
+        except KeyError:
+            return tiktoken.get_encoding(_FALLBACK_ENCODING)
+    except Exception:
+        logger.warning(
+            "tiktoken encoding unavailable; estimating tokens from text length",
+            exc_info=True,
+        )
+        return None
+
+
+def count_tokens(text: str) -> int:
+    encoding = _encoding()
+    if encoding is None:
+        return -(-len(text) // CHARS_PER_TOKEN)
+    return len(encoding.encode(text, disallowed_special=()))
+
+
+def truncate_to_tokens(text: str, max_tokens: int) -> str:
+    if max_tokens <= 0:
+        return ""
+    encoding = _encoding()
+    if encoding is None:
+        return text[: max_tokens * CHARS_PER_TOKEN]
+    tokens = encoding.encode(text, disallowed_special=())
+    if len(tokens) <= max_tokens:
+        return text
+    return encoding.decode(tokens[:max_tokens])
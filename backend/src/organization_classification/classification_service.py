@@ -1,3 +1,4 @@
+import asyncio
 import json
 import logging
 from collections import defaultdict
@@ -5,9 +6,12 @@ from collections import defaultdict
 from langchain_core.messages import HumanMessage, SystemMessage
 from langchain_openai import ChatOpenAI
 from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import ReplaceOne
 
+from src.bulk_writer import BulkWriter
 from src.config import settings
-from src.constants import TENDERS_PATH
+from src.llm.llm_scheduler import llm_request_config
+from src.llm.llm_schemas import LLMPriority
 from src.organization_classification.classification_constants import (
     CLASSIFICATION_SYSTEM_PROMPT,
     COLLECTION_NAME,
@@ -18,27 +22,28 @@ from src.organization_classification.classification_schemas import (
     OrganizationClassificationData,
     OrganizationClassificationDocument,
 )
+from src.tenders.tender_schemas import Tender
+from src.tenders.tender_service import TenderService
 
 logger = logging.getLogger(__name__)
 
 
 class ClassificationService:
-    def __init__(self, db: AsyncIOMotorDatabase, llm_client: ChatOpenAI) -> None:
+    def __init__(
+        self,
+        db: AsyncIOMotorDatabase,
+        llm_client: ChatOpenAI,
+        tender_service: TenderService,
+    ) -> None:
         self.db = db
         self.llm_client = llm_client
+        self.tender_service = tender_service
 
     @staticmethod
-    def _load_tenders() -> list[dict]:
-        with open(TENDERS_PATH, "r", encoding="utf-8") as f:
-            return json.load(f)["tenders"]
-
-    @staticmethod
-    def _group_by_organization(tenders: list[dict]) -> dict[str, list[str]]:
+    def _group_by_organization(tenders: list[Tender]) -> dict[str, list[str]]:
         grouped: dict[str, set[str]] = defaultdict(set)
         for t in tenders:
-            org = t["metadata"]["organization"]
-            name = t["metadata"]["name"]
-            grouped[org].add(name)
+            grouped[t.metadata.organization].add(t.metadata.name)
         return {org: sorted(names) for org, names in grouped.items()}
 
     @staticmethod
@@ -60,6 +65,7 @@ class ClassificationService:
                 HumanMessage(content=user_prompt),
             ],
             response_format={"type": "json_object"},
+            config=llm_request_config(LLMPriority.BATCH),
         )
 
         raw = json.loads(response.content)  # type: ignore[arg-type]
@@ -70,14 +76,6 @@ class ClassificationService:
             ],
         )
 
-    async def _save_one_to_mongo(
-        self, document: OrganizationClassificationDocument
-    ) -> None:
-        collection = self.db[COLLECTION_NAME]
-        mongo_doc = document.to_mongo()
-        await collection.replace_one({"_id": mongo_doc["_id"]}, mongo_doc, upsert=True)
-        logger.info("Saved classification for '%s' to MongoDB", document.id)
-
     async def _load_from_mongo(self) -> ClassifyResponse:
         logger.info("Loading organization classifications from MongoDB")
         collection = self.db[COLLECTION_NAME]
@@ -94,10 +92,12 @@ class ClassificationService:
         return ClassifyResponse(organizations=organizations)
 
     async def _classify_via_llm(self) -> ClassifyResponse:
-        all_tenders = self._load_tenders()
+        all_tenders = self.tender_service.load_tenders()
         grouped = self._group_by_organization(all_tenders)
 
-        for index, (org_name, tender_names) in enumerate(grouped.items(), 1):
+        async def _classify_and_store(
+            index: int, org_name: str, tender_names: list[str]
+        ) -> None:
             logger.info(
                 "Classifying organization %d/%d: '%s' (%d tenders)",
                 index,
@@ -111,8 +111,20 @@ class ClassificationService:
                 org_name,
                 [ind.industry for ind in classified.industries],
             )
-            document = OrganizationClassificationDocument.from_domain(classified)
-            await self._save_one_to_mongo(document)
+            mongo_doc = OrganizationClassificationDocument.from_domain(
+                classified
+            ).to_mongo()
+            await writer.add(
+                ReplaceOne({"_id": mongo_doc["_id"]}, mongo_doc, upsert=True)
+            )
+
+        # Concurrency is bounded by the LLM client's shared adaptive limit
+        async with BulkWriter(self.db[COLLECTION_NAME]) as writer:
+            async with asyncio.TaskGroup() as group:
+                for index, (org_name, tender_names) in enumerate(grouped.items(), 1):
+                    group.create_task(
+                        _classify_and_store(index, org_name, tender_names)
+                    )
 
         return await self._load_from_mongo()
 
@@ -1,8 +1,70 @@
+from typing import Any
+
+from pymongo import ASCENDING, DESCENDING, IndexModel
+
 COLLECTION_NAME = "recommendations"
 
-LLM_CONCURRENCY = 5
+JOBS_COLLECTION_NAME = "recommendation_jobs"
+
+INDEXES = {
+    COLLECTION_NAME: [
+        # Listing by match levels; the company prefix also serves fingerprint lookups
+        IndexModel(
+            [
+                ("_id.company_name", ASCENDING),
+                ("name_match", ASCENDING),
+                ("industry_match", ASCENDING),
+            ]
+        ),
+    ],
+    JOBS_COLLECTION_NAME: [
+        # At most one queued/running job per company
+        IndexModel(
+            [("company_name", ASCENDING)],
+            unique=True,
+            partialFilterExpression={"active": True},
+        ),
+        IndexModel([("company_name", ASCENDING), ("created_at", DESCENDING)]),
+    ],
+}
+
+# Weight of the organization-industry score relative to the tender-name score in
+# the local pre-filter
+PREFILTER_ORGANIZATION_WEIGHT = 0.5
+
+# Job progress is written to MongoDB (and cancellation checked) at most this often
+JOB_PROGRESS_FLUSH_SECONDS = 2.0
+# A worker's claim on a job lapses this long after its last renewal; renewed
+# every third of it, and unclaimed jobs are looked for this often
+JOB_LEASE_SECONDS = 60.0
+
+# Query shapes, shared by the services and the index check (src/indexes.py)
+
+
+def stored_recommendations_filter(company_name: str) -> dict[str, Any]:
+    return {"_id.company_name": company_name, "skipped": {"$ne": True}}
+
+
+def recommendations_by_match_filter(
+    company_name: str, name_match: str, industry_match: str
+) -> dict[str, Any]:
+    return {
+        "_id.company_name": company_name,
+        "name_match": name_match,
+        "industry_match": industry_match,
+        "skipped": {"$ne": True},
+    }
 
-RECOMMENDATION_SYSTEM_PROMPT = """\
+
+def fingerprints_filter(company_name: str) -> dict[str, Any]:
+    return {"_id.company_name": company_name, "input_fingerprint": {"$ne": None}}
+
+
+def active_job_filter(company_name: str) -> dict[str, Any]:
+    return {"company_name": company_name, "active": True}
+
+
+_SINGLE_TENDER_INTRO = """\
 You are a Polish public procurement expert specializing in matching tenders to company profiles.
 
 You receive:
@@ -13,6 +75,10 @@ preferences and adjust your scoring accordingly.
 
 Your task is to evaluate the tender against the company profile on TWO separate axes.
 
+"""
+
+# Shared by the single-tender and batched prompts
+_SCORING_RULES = """\
 ## Match levels
 
 For each axis assign one of:
@@ -41,6 +107,9 @@ If user feedback on rejected tenders is provided, treat it as additional signal
 preferences. For example, if the user says "too short deadline" for a tender, penalize similar \
 tenders. If they say "not our area", it reinforces NO_MATCH on the name axis.
 
+"""
+
+_SINGLE_TENDER_RESPONSE_FORMAT = """\
 ## Response format
 
 Respond ONLY with valid JSON:
@@ -51,3 +120,42 @@ Respond ONLY with valid JSON:
   "industry_reason": "<one sentence reasoning in Polish>"
 }\
 """
+
+RECOMMENDATION_SYSTEM_PROMPT = (
+    _SINGLE_TENDER_INTRO + _SCORING_RULES + _SINGLE_TENDER_RESPONSE_FORMAT
+)
+
+_BATCH_INTRO = """\
+You are a Polish public procurement expert specializing in matching tenders to company profiles.
+
+You receive:
+1. A company profile — its industries, service categories, and target contracting authorities.
+2. A numbered list of tenders, each with its contracting organization and the organization's industries.
+3. Optionally, user feedback on previously rejected tenders — use it to understand the user's \
+preferences and adjust your scoring accordingly.
+
+Your task is to evaluate EACH tender independently against the company profile on TWO separate axes. \
+Do not let one tender influence the score of another.
+
+"""
+
+_BATCH_RESPONSE_FORMAT = """\
+## Response format
+
+Respond ONLY with valid JSON containing one result per tender, identified by its number:
+{
+  "results": [
+    {
+      "id": <tender number>,
+      "name_match": "PERFECT_MATCH" | "PARTIAL_MATCH" | "DONT_KNOW" | "NO_MATCH",
+      "name_reason": "<one sentence reasoning in Polish>",
+      "industry_match": "PERFECT_MATCH" | "PARTIAL_MATCH" | "DONT_KNOW" | "NO_MATCH",
+      "industry_reason": "<one sentence reasoning in Polish>"
+    }
+  ]
+}\
+"""
+
+BATCH_RECOMMENDATION_SYSTEM_PROMPT = (
+    _BATCH_INTRO + _SCORING_RULES + _BATCH_RESPONSE_FORMAT
+)
@@ -0,0 +1,324 @@
+"""Background recommendation jobs persisted in MongoDB.
+
+A job runs one incremental classification pass for a company. Its progress
+counts are flushed to the ``recommendation_jobs`` collection while it runs,
+so they can be polled from any request.
+
+Each job is leased to one worker process: the runner that claims it (with an
+atomic update on ``lease_owner``/``lease_expires_at``) renews the lease while
+the job runs and releases it on shutdown. Every runner periodically looks for
+active jobs whose lease is free or has lapsed, so jobs left by a stopped or
+crashed worker are resumed exactly once, by whichever worker claims them
+first; thanks to input fingerprints, tenders evaluated before the
+interruption are not sent to the LLM again.
+"""
+
+import asyncio
+import logging
+import time
+import contextlib
+import uuid
+from collections.abc import Awaitable, Callable
+from datetime import datetime, timedelta, timezone
+
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError
+
+from src.recommendations.recommendation_constants import (
+    JOB_LEASE_SECONDS,
+    JOB_PROGRESS_FLUSH_SECONDS,
+    JOBS_COLLECTION_NAME,
+    active_job_filter,
+)
+from src.recommendations.recommendation_schemas import (
+    ACTIVE_JOB_STATUSES,
+    JobStatus,
+    RecommendationJobDocument,
+    RecommendationProgress,
+)
+
+logger = logging.getLogger(__name__)
+
+ClassifyFn = Callable[
+    [str, Callable[[RecommendationProgress], Awaitable[None]]],
+    Awaitable[RecommendationProgress],
+]
+
+
+class JobCancelledError(Exception):
+    pass
+
+
+class JobLeaseLostError(Exception):
+    """Another worker claimed the job after this one's lease lapsed."""
+
+
+def _is_lease_lost(error: Exception) -> bool:
+    if isinstance(error, ExceptionGroup):
+        return error.subgroup(JobLeaseLostError) is not None
+    return isinstance(error, JobLeaseLostError)
+
+
+def _is_cancellation(error: Exception) -> bool:
+    # Raised from inside the classification task group, it arrives wrapped
+    if isinstance(error, ExceptionGroup):
+        return error.subgroup(JobCancelledError) is not None
+    return isinstance(error, JobCancelledError)
+
+
+class RecommendationJobRunner:
+    def __init__(self, db: AsyncIOMotorDatabase, classify: ClassifyFn) -> None:
+        self.collection = db[JOBS_COLLECTION_NAME]
+        self.classify = classify
+        self.owner_id = uuid.uuid4().hex
+        self.lease = timedelta(seconds=JOB_LEASE_SECONDS)
+        self._tasks: dict[str, asyncio.Task[None]] = {}
+        self._resume_task: asyncio.Task[None] | None = None
+        self._stopping = False
+
+    @staticmethod
+    def _to_mongo(job: RecommendationJobDocument) -> dict[str, object]:
+        return {**job.to_mongo(), "active": job.status in ACTIVE_JOB_STATUSES}
+
+    async def _find_active(self, company_name: str) -> RecommendationJobDocument | None:
+        raw = await self.collection.find_one(active_job_filter(company_name))
+        return RecommendationJobDocument.from_mongo(raw) if raw else None
+
+    @staticmethod
+    def _claimable(now: datetime) -> dict[str, object]:
+        # A missing lease (jobs from before leases, or released) matches None
+        return {
+            "active": True,
+            "$or": [
+                {"lease_expires_at": None},
+                {"lease_expires_at": {"$lte": now}},
+            ],
+        }
+
+    async def _claim(self, job_id: str) -> RecommendationJobDocument | None:
+        """Take the job's lease, or ``None`` if another worker holds it."""
+        now = datetime.now(timezone.utc)
+        raw = await self.collection.find_one_and_update(
+            {"_id": job_id, **self._claimable(now)},
+            {
+                "$set": {
+                    "lease_owner": self.owner_id,
+                    "lease_expires_at": now + self.lease,
+                }
+            },
+            return_document=ReturnDocument.AFTER,
+        )
+        return RecommendationJobDocument.from_mongo(raw) if raw else None
+
+    def _owned(self, job: RecommendationJobDocument) -> dict[str, object]:
+        return {"_id": job.job_id, "lease_owner": self.owner_id}
+
+    async def _renew_lease(self, job: RecommendationJobDocument) -> None:
+        while True:
+            await asyncio.sleep(JOB_LEASE_SECONDS / 3)
+            expires_at = datetime.now(timezone.utc) + self.lease
+            result = await self.collection.update_one(
+                self._owned(job), {"$set": {"lease_expires_at": expires_at}}
+            )
+            if result.matched_count == 0:
+                # Progress flushes notice too and stop the job
+                logger.warning("Lost the lease on recommendation job %s", job.job_id)
+                return
+            job.lease_expires_at = expires_at
+
+    async def start(self, company_name: str) -> RecommendationJobDocument:
+        """Queue a job for the company, or return the one already in progress."""
+        active = await self._find_active(company_name)
+        if active is not None:
+            return active
+
+        now = datetime.now(timezone.utc)
+        job = RecommendationJobDocument(
+            job_id=uuid.uuid4().hex,
+            company_name=company_name,
+            status=JobStatus.QUEUED,
+            created_at=now,
+            updated_at=now,
+            progress=RecommendationProgress(),
+            lease_owner=self.owner_id,
+            lease_expires_at=now + self.lease,
+        )
+        try:
+            await self.collection.insert_one(self._to_mongo(job))
+        except DuplicateKeyError:
+            # Lost a race with a concurrent request for the same company
+            active = await self._find_active(company_name)
+            if active is not None:
+                return active
+            raise
+        logger.info("Queued recommendation job %s for '%s'", job.job_id, company_name)
+        self._spawn(job)
+        return job
+
+    async def get(self, company_name: str, job_id: str) -> RecommendationJobDocument:
+        raw = await self.collection.find_one(
+            {"_id": job_id, "company_name": company_name}
+        )
+        if raw is None:
+            raise ValueError(f"Recommendation job not found: {job_id}")
+        return RecommendationJobDocument.from_mongo(raw)
+
+    async def cancel(self, company_name: str, job_id: str) -> RecommendationJobDocument:
+        job = await self.get(company_name, job_id)
+        if job.status not in ACTIVE_JOB_STATUSES:
+            return job
+
+        await self.collection.update_one(
+            {"_id": job_id}, {"$set": {"cancel_requested": True}}
+        )
+        task = self._tasks.get(job_id)
+        if task is not None:
+            task.cancel()
+            await asyncio.wait([task])
+        # Otherwise the job is picked up by whichever run sees the flag first
+        return await self.get(company_name, job_id)
+
+    def _spawn(self, job: RecommendationJobDocument) -> None:
+        task = asyncio.create_task(self._run(job))
+        self._tasks[job.job_id] = task
+        task.add_done_callback(lambda _: self._tasks.pop(job.job_id, None))
+
+    async def _finish(
+        self,
+        job: RecommendationJobDocument,
+        status: JobStatus,
+        error: str | None = None,
+    ) -> None:
+        now = datetime.now(timezone.utc)
+        job.status = status
+        job.error = error
+        job.updated_at = job.finished_at = now
+        job.lease_owner = job.lease_expires_at = None
+        await self.collection.replace_one(
+            {"_id": job.job_id, "lease_owner": self.owner_id}, self._to_mongo(job)
+        )
+        logger.info(
+            "Recommendation job %s for '%s' %s: %s",
+            job.job_id,
+            job.company_name,
+            status,
+            job.progress,
+        )
+
+    async def _mark_running(self, job: RecommendationJobDocument) -> None:
+        now = datetime.now(timezone.utc)
+        job.status = JobStatus.RUNNING
+        job.started_at = job.updated_at = now
+        job.progress = RecommendationProgress()
+        await self.collection.replace_one(self._owned(job), self._to_mongo(job))
+
+    async def _run(self, job: RecommendationJobDocument) -> None:
+        last_flush = 0.0
+
+        async def on_progress(progress: RecommendationProgress) -> None:
+            nonlocal last_flush
+            job.progress = progress
+            if time.monotonic() - last_flush < JOB_PROGRESS_FLUSH_SECONDS:
+                return
+            last_flush = time.monotonic()
+            raw = await self.collection.find_one_and_update(
+                self._owned(job),
+                {
+                    "$set": {
+                        "total": progress.total,
+                        "unchanged": progress.unchanged,
+                        "processed": progress.processed,
+                        "skipped": progress.skipped,
+                        "failed": progress.failed,
+                        "filtered": progress.filtered,
+                        "write_failed": progress.write_failed,
+                        "updated_at": datetime.now(timezone.utc),
+                    }
+                },
+                projection={"cancel_requested": 1},
+                return_document=ReturnDocument.AFTER,
+            )
+            if raw is None:
+                raise JobLeaseLostError
+            if raw.get("cancel_requested"):
+                raise JobCancelledError
+
+        renewal = asyncio.create_task(self._renew_lease(job))
+        try:
+            await self._mark_running(job)
+            await self.classify(job.company_name, on_progress)
+        except asyncio.CancelledError:
+            if self._stopping:
+                # Left running in MongoDB, so the next start resumes it
+                await self._release(job)
+                raise
+            await self._finish(job, JobStatus.CANCELLED)
+        except Exception as e:
+            if _is_lease_lost(e):
+                logger.warning(
+                    "Recommendation job %s was taken over; stopping here", job.job_id
+                )
+                return
+            if _is_cancellation(e):
+                await self._finish(job, JobStatus.CANCELLED)
+                return
+            logger.exception("Recommendation job %s failed", job.job_id)
+            await self._finish(job, JobStatus.FAILED, str(e))
+        else:
+            await self._finish(job, JobStatus.COMPLETED)
+        finally:
+            renewal.cancel()
+
+    async def _release(self, job: RecommendationJobDocument) -> None:
+        await self.collection.update_one(
+            self._owned(job),
+            {"$set": {"lease_owner": None, "lease_expires_at": None}},
+        )
+
+    async def _resume_unclaimed(self) -> None:
+        cursor = self.collection.find(
+            self._claimable(datetime.now(timezone.utc)), {"_id": 1}
+        )
+        async for raw in cursor:
+            job = await self._claim(raw["_id"])
+            if job is None or job.job_id in self._tasks:
+                # Claimed by another worker in the meantime
+                continue
+            if job.cancel_requested:
+                await self._finish(job, JobStatus.CANCELLED)
+                continue
+            logger.info(
+                "Resuming recommendation job %s for '%s'",
+                job.job_id,
+                job.company_name,
+            )
+            self._spawn(job)
+
+    async def _resume_periodically(self) -> None:
+        while True:
+            await asyncio.sleep(JOB_LEASE_SECONDS)
+            try:
+                await self._resume_unclaimed()
+            except Exception:
+                logger.exception("Looking for recommendation jobs to resume failed")
+
+    async def resume(self) -> None:
+        """Claim and restart active jobs no worker holds, now and periodically.
+
+        Safe with several app processes sharing the jobs collection: a job is
+        only run by the worker whose claim succeeded.
+        """
+        await self._resume_unclaimed()
+        self._resume_task = asyncio.create_task(self._resume_periodically())
+
+    async def stop(self) -> None:
+        self._stopping = True
+        if self._resume_task is not None:
+            self._resume_task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._resume_task
+        tasks = list(self._tasks.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
@@ -0,0 +1,103 @@
+"""Local lexical pre-filter that picks which tenders are worth an LLM call.
+
+Each tender gets two BM25 scores computed over the whole catalog, with the
+same diacritic folding and stemming as tender search:
+
+- its name against the company's service categories and industries,
+- its organization's classified industries against the company's
+  industries and target authorities.
+
+The combined score is scaled to 0-1 relative to the best tender, and only
+tenders above the threshold (optionally capped to the top N) are scored by
+the LLM. The rest are treated as irrelevant, like results dropped by
+``_should_skip``.
+"""
+
+from src.companies.company_schemas import CompanyProfile
+from src.recommendations.recommendation_constants import PREFILTER_ORGANIZATION_WEIGHT
+from src.recommendations.recommendation_schemas import MatchLevel, PrefilterReport
+from src.tenders.tender_schemas import Tender
+from src.tenders.tender_search import Bm25Index, term_frequencies
+
+
+def _relative_scores(index: Bm25Index, query: str) -> list[float]:
+    scores = [0.0] * len(index)
+    matches, _ = index.search(query, len(index))
+    for doc_id, score in matches:
+        scores[doc_id] = score
+    best = max(scores, default=0.0)
+    return [score / best for score in scores] if best else scores
+
+
+def prefilter_scores(
+    profile: CompanyProfile,
+    tenders: list[Tender],
+    org_industries: dict[str, list[str]],
+) -> list[float]:
+    company_info = profile.company_info
+    criteria = profile.matching_criteria
+
+    name_index = Bm25Index(
+        [term_frequencies([(tender.metadata.name, 1.0)]) for tender in tenders]
+    )
+    org_index = Bm25Index(
+        [
+            term_frequencies(
+                [(" ".join(org_industries.get(tender.metadata.organization, [])), 1.0)]
+            )
+            for tender in tenders
+        ]
+    )
+    name_scores = _relative_scores(
+        name_index, " ".join([*criteria.service_categories, *company_info.industries])
+    )
+    org_scores = _relative_scores(
+        org_index, " ".join([*criteria.target_authorities, *company_info.industries])
+    )
+
+    combined = [
+        name + PREFILTER_ORGANIZATION_WEIGHT * org
+        for name, org in zip(name_scores, org_scores)
+    ]
+    best = max(combined, default=0.0)
+    return [score / best for score in combined] if best else combined
+
+
+def select_candidates(
+    scores: list[float], threshold: float, max_candidates: int
+) -> set[int]:
+    """Indexes of tenders scoring above ``threshold``, best ``max_candidates`` first."""
+    ranked = sorted(
+        (i for i, score in enumerate(scores) if score > threshold),
+        key=lambda i: -scores[i],
+    )
+    if max_candidates > 0:
+        ranked = ranked[:max_candidates]
+    return set(ranked)
+
+
+def measure_recall(
+    tenders: list[Tender],
+    candidates: set[int],
+    stored: dict[str, MatchLevel],
+    threshold: float,
+) -> PrefilterReport:
+    """Compare candidates with stored LLM name matches (tender name -> level)."""
+    passed = {tenders[i].metadata.name for i in candidates}
+    relevant = {
+        name
+        for name, level in stored.items()
+        if level in (MatchLevel.PERFECT_MATCH, MatchLevel.PARTIAL_MATCH)
+    }
+    catalog = {tender.metadata.name for tender in tenders}
+    relevant &= catalog
+    recommended = stored.keys() & catalog
+    return PrefilterReport(
+        threshold=threshold,
+        tenders=len(tenders),
+        candidates=len(candidates),
+        relevant=len(relevant),
+        relevant_passed=len(relevant & passed),
+        recommended=len(recommended),
+        recommended_passed=len(recommended & passed),
+    )
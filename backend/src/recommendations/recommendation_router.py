@@ -1,4 +1,5 @@
 import logging
+from datetime import datetime, timezone
 
 from fastapi import APIRouter, Depends, HTTPException, Query
 
@@ -7,7 +8,10 @@ from src.recommendations.recommendation_dependencies import (
 )
 from src.recommendations.recommendation_schemas import (
     MatchLevel,
+    PrefilterReportResponse,
+    RecommendationJobResponse,
     RecommendationsResponse,
+    SimilarTendersResponse,
     TenderRecommendation,
 )
 from src.recommendations.recommendation_service import RecommendationService
@@ -20,8 +24,9 @@ router = APIRouter(prefix="/tenders", tags=["recommendations"])
 @router.get(
     "/recommendations",
     response_model=RecommendationsResponse,
-    description="Get tender recommendations for a company. "
-    "Source (MongoDB or LLM) is controlled by RECOMMENDATIONS_SOURCE env var.",
+    description="Get stored tender recommendations for a company. "
+    "With RECOMMENDATIONS_SOURCE=llm, also starts (or reuses) a background job "
+    "that evaluates new or changed tenders; poll it via job_id.",
 )
 async def recommendations_endpoint(
     service: RecommendationService = Depends(get_recommendation_service),
@@ -42,7 +47,7 @@ async def recommendations_endpoint(
         industry_match,
     )
     try:
-        recommendations = await service.get_recommendations(
+        recommendations, job_id = await service.get_recommendations(
             company, name_match, industry_match
         )
     except ValueError as e:
@@ -57,6 +62,7 @@ async def recommendations_endpoint(
     return RecommendationsResponse(
         company=company,
         recommendations=recommendations,
+        job_id=job_id,
     )
 
 
@@ -93,3 +99,110 @@ async def refresh_recommendation_endpoint(
         result.industry_match,
     )
     return result
+
+
+@router.post(
+    "/recommendations/{company}/jobs",
+    response_model=RecommendationJobResponse,
+    status_code=202,
+    description="Start a background job evaluating new or changed tenders for a company. "
+    "Returns the job already in progress, if any.",
+)
+async def start_recommendation_job_endpoint(
+    company: str,
+    service: RecommendationService = Depends(get_recommendation_service),
+) -> RecommendationJobResponse:
+    logger.info("POST recommendation job for company='%s'", company)
+    try:
+        await service.ensure_company_exists(company)
+    except ValueError as e:
+        logger.warning("Cannot start job for company='%s': %s", company, e)
+        raise HTTPException(status_code=404, detail=str(e))
+
+    job = await service.jobs.start(company)
+    return job.to_response(datetime.now(timezone.utc))
+
+
+@router.get(
+    "/recommendations/{company}/jobs/{job_id}",
+    response_model=RecommendationJobResponse,
+    description="Progress of a recommendation job: processed/total/skipped/failed counts and ETA.",
+)
+async def get_recommendation_job_endpoint(
+    company: str,
+    job_id: str,
+    service: RecommendationService = Depends(get_recommendation_service),
+) -> RecommendationJobResponse:
+    try:
+        job = await service.jobs.get(company, job_id)
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    return job.to_response(datetime.now(timezone.utc))
+
+
+@router.post(
+    "/recommendations/{company}/jobs/{job_id}/cancel",
+    response_model=RecommendationJobResponse,
+    description="Cancel a queued or running recommendation job. "
+    "Tenders evaluated so far keep their results.",
+)
+async def cancel_recommendation_job_endpoint(
+    company: str,
+    job_id: str,
+    service: RecommendationService = Depends(get_recommendation_service),
+) -> RecommendationJobResponse:
+    logger.info("POST cancel job %s for company='%s'", job_id, company)
+    try:
+        job = await service.jobs.cancel(company, job_id)
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    return job.to_response(datetime.now(timezone.utc))
+
+
+@router.get(
+    "/recommendations/{company}/prefilter",
+    response_model=PrefilterReportResponse,
+    description="Recall of the local pre-filter against the company's stored LLM recommendations "
+    "at the given (or configured) threshold.",
+)
+async def prefilter_report_endpoint(
+    company: str,
+    service: RecommendationService = Depends(get_recommendation_service),
+    threshold: float | None = Query(
+        default=None, ge=0.0, le=1.0, description="Relative score threshold"
+    ),
+) -> PrefilterReportResponse:
+    try:
+        report = await service.evaluate_prefilter(company, threshold)
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    return report.to_response()
+
+
+@router.get(
+    "/recommendations/{company}/similar",
+    response_model=SimilarTendersResponse,
+    description="Tenders most similar to the company's service categories, ranked by "
+    "local embeddings (no LLM calls). Requires TENDER_EMBEDDING_MODEL and precomputed "
+    "embeddings.",
+)
+async def similar_tenders_endpoint(
+    company: str,
+    service: RecommendationService = Depends(get_recommendation_service),
+    limit: int = Query(default=20, ge=1, le=200),
+) -> SimilarTendersResponse:
+    if not service.similarity_available:
+        raise HTTPException(
+            status_code=503,
+            detail="Tender embeddings are not available; set TENDER_EMBEDDING_MODEL "
+            "and run: python -m src.cli build-embeddings",
+        )
+    try:
+        tenders = await service.similar_tenders(company, limit)
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    return SimilarTendersResponse(
+        company=company,
+        model=service.tender_embeddings.model_name,  # type: ignore[union-attr]
+        tenders=tenders,
+    )
@@ -5,6 +5,17 @@ from enum import StrEnum
 from pydantic import BaseModel
 
 
+class JobStatus(StrEnum):
+    QUEUED = "queued"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+    CANCELLED = "cancelled"
+
+
+ACTIVE_JOB_STATUSES = (JobStatus.QUEUED, JobStatus.RUNNING)
+
+
 class MatchLevel(StrEnum):
     PERFECT_MATCH = "PERFECT_MATCH"
     PARTIAL_MATCH = "PARTIAL_MATCH"
@@ -25,6 +36,55 @@ class RecommendationResult:
     industry_reason: str
 
 
+@dataclass
+class RecommendationProgress:
+    """Counts reported by one classification run as tenders are evaluated."""
+
+    total: int = 0
+    unchanged: int = 0
+    processed: int = 0
+    skipped: int = 0
+    failed: int = 0
+    # Changed tenders dropped by the local pre-filter before any LLM call
+    filtered: int = 0
+    # Evaluated, but the result could not be written to MongoDB
+    write_failed: int = 0
+
+
+@dataclass
+class PrefilterReport:
+    threshold: float
+    tenders: int
+    candidates: int
+    # Stored recommendations whose LLM name match is PERFECT or PARTIAL
+    relevant: int
+    relevant_passed: int
+    # All stored (non-skipped) recommendations
+    recommended: int
+    recommended_passed: int
+
+    @property
+    def recall(self) -> float | None:
+        return self.relevant_passed / self.relevant if self.relevant else None
+
+    @property
+    def recommended_recall(self) -> float | None:
+        return self.recommended_passed / self.recommended if self.recommended else None
+
+    def to_response(self) -> "PrefilterReportResponse":
+        return PrefilterReportResponse(
+            threshold=self.threshold,
+            tenders=self.tenders,
+            candidates=self.candidates,
+            relevant=self.relevant,
+            relevant_passed=self.relevant_passed,
+            recall=self.recall,
+            recommended=self.recommended,
+            recommended_passed=self.recommended_passed,
+            recommended_recall=self.recommended_recall,
+        )
+
+
 # --- Document (MongoDB) ---
 
 
@@ -38,6 +98,10 @@ class RecommendationDocument:
     industry_match: MatchLevel
     industry_reason: str
     created_at: datetime
+    # Hash of everything the LLM saw; unchanged inputs are not re-evaluated
+    input_fingerprint: str | None = None
+    # Evaluated as irrelevant: kept only to remember the fingerprint
+    skipped: bool = False
 
     def to_mongo(self) -> dict[str, object]:
         return {
@@ -51,6 +115,8 @@ class RecommendationDocument:
             "industry_match": self.industry_match,
             "industry_reason": self.industry_reason,
             "created_at": self.created_at,
+            "input_fingerprint": self.input_fingerprint,
+            "skipped": self.skipped,
         }
 
     @classmethod
@@ -65,6 +131,8 @@ class RecommendationDocument:
             industry_match=MatchLevel(doc["industry_match"]),  # type: ignore[arg-type]
             industry_reason=doc["industry_reason"],  # type: ignore[arg-type]
             created_at=doc.get("created_at", datetime.min),  # type: ignore[arg-type]
+            input_fingerprint=doc.get("input_fingerprint"),  # type: ignore[arg-type]
+            skipped=doc.get("skipped", False),  # type: ignore[arg-type]
         )
 
     @classmethod
@@ -73,6 +141,8 @@ class RecommendationDocument:
         company_name: str,
         result: RecommendationResult,
         created_at: datetime,
+        input_fingerprint: str | None = None,
+        skipped: bool = False,
     ) -> "RecommendationDocument":
         return cls(
             company_name=company_name,
@@ -83,6 +153,8 @@ class RecommendationDocument:
             industry_match=result.industry_match,
             industry_reason=result.industry_reason,
             created_at=created_at,
+            input_fingerprint=input_fingerprint,
+            skipped=skipped,
         )
 
     def to_response(self) -> "TenderRecommendation":
@@ -96,6 +168,101 @@ class RecommendationDocument:
         )
 
 
+@dataclass
+class RecommendationJobDocument:
+    job_id: str
+    company_name: str
+    status: JobStatus
+    created_at: datetime
+    updated_at: datetime
+    progress: RecommendationProgress
+    started_at: datetime | None = None
+    finished_at: datetime | None = None
+    # Set by the cancel endpoint; checked by whichever worker runs the job
+    cancel_requested: bool = False
+    error: str | None = None
+    # Worker running the job, and until when its claim holds without renewal
+    lease_owner: str | None = None
+    lease_expires_at: datetime | None = None
+
+    def to_mongo(self) -> dict[str, object]:
+        return {
+            "_id": self.job_id,
+            "company_name": self.company_name,
+            "status": self.status,
+            "created_at": self.created_at,
+            "updated_at": self.updated_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "cancel_requested": self.cancel_requested,
+            "error": self.error,
+            "lease_owner": self.lease_owner,
+            "lease_expires_at": self.lease_expires_at,
+            "total": self.progress.total,
+            "unchanged": self.progress.unchanged,
+            "processed": self.progress.processed,
+            "skipped": self.progress.skipped,
+            "failed": self.progress.failed,
+            "filtered": self.progress.filtered,
+            "write_failed": self.progress.write_failed,
+        }
+
+    @classmethod
+    def from_mongo(cls, doc: dict[str, object]) -> "RecommendationJobDocument":
+        return cls(
+            job_id=doc["_id"],  # type: ignore[arg-type]
+            company_name=doc["company_name"],  # type: ignore[arg-type]
+            status=JobStatus(doc["status"]),  # type: ignore[arg-type]
+            created_at=doc["created_at"],  # type: ignore[arg-type]
+            updated_at=doc["updated_at"],  # type: ignore[arg-type]
+            started_at=doc.get("started_at"),  # type: ignore[arg-type]
+            finished_at=doc.get("finished_at"),  # type: ignore[arg-type]
+            cancel_requested=doc.get("cancel_requested", False),  # type: ignore[arg-type]
+            error=doc.get("error"),  # type: ignore[arg-type]
+            lease_owner=doc.get("lease_owner"),  # type: ignore[arg-type]
+            lease_expires_at=doc.get("lease_expires_at"),  # type: ignore[arg-type]
+            progress=RecommendationProgress(
+                total=doc.get("total", 0),  # type: ignore[arg-type]
+                unchanged=doc.get("unchanged", 0),  # type: ignore[arg-type]
+                processed=doc.get("processed", 0),  # type: ignore[arg-type]
+                skipped=doc.get("skipped", 0),  # type: ignore[arg-type]
+                failed=doc.get("failed", 0),  # type: ignore[arg-type]
+                filtered=doc.get("filtered", 0),  # type: ignore[arg-type]
+                write_failed=doc.get("write_failed", 0),  # type: ignore[arg-type]
+            ),
+        )
+
+    def eta_seconds(self, now: datetime) -> float | None:
+        """Remaining time extrapolated from the throughput since the job started."""
+        progress = self.progress
+        done = progress.processed + progress.failed
+        if self.status != JobStatus.RUNNING or self.started_at is None or not done:
+            return None
+        # Mongo returns naive UTC datetimes unless the client is tz-aware
+        started_at = self.started_at.replace(tzinfo=now.tzinfo)
+        elapsed = (now - started_at).total_seconds()
+        return round(elapsed / done * (progress.total - done), 1)
+
+    def to_response(self, now: datetime) -> "RecommendationJobResponse":
+        return RecommendationJobResponse(
+            job_id=self.job_id,
+            company=self.company_name,
+            status=self.status,
+            total=self.progress.total,
+            processed=self.progress.processed,
+            skipped=self.progress.skipped,
+            failed=self.progress.failed,
+            unchanged=self.progress.unchanged,
+            filtered=self.progress.filtered,
+            write_failed=self.progress.write_failed,
+            eta_seconds=self.eta_seconds(now),
+            error=self.error,
+            created_at=self.created_at,
+            started_at=self.started_at,
+            finished_at=self.finished_at,
+        )
+
+
 # --- Response ---
 
 
@@ -111,3 +278,55 @@ class TenderRecommendation(BaseModel):
 class RecommendationsResponse(BaseModel):
     company: str
     recommendations: list[TenderRecommendation]
+    # Background job evaluating new or changed tenders (LLM source only)
+    job_id: str | None = None
+
+
+class RecommendationJobResponse(BaseModel):
+    job_id: str
+    company: str
+    status: JobStatus
+    # Tenders needing an LLM evaluation in this run
+    total: int
+    # Evaluated so far, including those judged irrelevant (skipped)
+    processed: int
+    skipped: int
+    failed: int
+    # Not re-evaluated because their inputs did not change
+    unchanged: int
+    # Dropped by the local pre-filter without an LLM call
+    filtered: int
+    # Evaluated but not saved (reported by bulk writes, at the end of the run)
+    write_failed: int
+    eta_seconds: float | None
+    error: str | None
+    created_at: datetime
+    started_at: datetime | None
+    finished_at: datetime | None
+
+
+class PrefilterReportResponse(BaseModel):
+    threshold: float
+    tenders: int
+    candidates: int
+    relevant: int
+    relevant_passed: int
+    recall: float | None
+    recommended: int
+    recommended_passed: int
+    recommended_recall: float | None
+
+
+class SimilarTender(BaseModel):
+    tender_name: str
+    organization: str
+    tender_url: str
+    # Cosine similarity of the tender's name and organization to the company's
+    # service categories
+    score: float
+
+
+class SimilarTendersResponse(BaseModel):
+    company: str
+    model: str
+    tenders: list[SimilarTender]
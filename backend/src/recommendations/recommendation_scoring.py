@@ -0,0 +1,240 @@
+"""LLM scoring of tenders against a company profile.
+
+Tenders are scored either one per request or in batches, where a single
+request carries the system prompt, company profile and feedback once for
+several numbered tenders. A batch whose response cannot be parsed, or that
+misses some tenders, falls back to single-tender requests for those tenders.
+"""
+
+import hashlib
+import json
+import logging
+
+from langchain_core.messages import HumanMessage, SystemMessage
+from langchain_core.runnables import RunnableConfig
+from langchain_openai import ChatOpenAI
+
+from src.companies.company_schemas import CompanyProfile
+from src.config import settings
+from src.recommendations.recommendation_constants import (
+    BATCH_RECOMMENDATION_SYSTEM_PROMPT,
+    RECOMMENDATION_SYSTEM_PROMPT,
+)
+from src.recommendations.recommendation_schemas import MatchLevel, RecommendationResult
+from src.tenders.tender_schemas import Tender
+
+logger = logging.getLogger(__name__)
+
+
+def unique_by_name(tenders: list[Tender]) -> list[Tender]:
+    """Recommendations are keyed by tender name; the first tender wins, as in
+    catalog lookups."""
+    unique: dict[str, Tender] = {}
+    for tender in tenders:
+        unique.setdefault(tender.metadata.name, tender)
+    return list(unique.values())
+
+
+def _company_section(profile: CompanyProfile) -> str:
+    company_info = profile.company_info
+    criteria = profile.matching_criteria
+
+    industries = ", ".join(company_info.industries)
+    categories = "\n".join(f"- {cat}" for cat in criteria.service_categories)
+    authorities = ", ".join(criteria.target_authorities)
+
+    return f"""\
+## Company profile: {company_info.name}
+
+### Company's Industries
+{industries}
+
+### Company's Service categories
+{categories}
+
+### Company's Target contracting authorities
+{authorities}
+"""
+
+
+def _tender_lines(tender: Tender, org_industries: dict[str, list[str]]) -> str:
+    org = tender.metadata.organization
+    org_ind = org_industries.get(org, [])
+    org_ind_str = f"\n**Industries:** {', '.join(org_ind)}" if org_ind else ""
+    return f"**Name:** {tender.metadata.name}\n**Organization:** {org}{org_ind_str}"
+
+
+def _feedback_section(feedbacks: list[str]) -> str:
+    if not feedbacks:
+        return ""
+    feedback_lines = "\n".join(f"- {fb}" for fb in feedbacks)
+    return f"""
+
+## User feedback on previously rejected tenders
+{feedback_lines}\
+"""
+
+
+def build_user_prompt(
+    profile: CompanyProfile,
+    tender: Tender,
+    org_industries: dict[str, list[str]],
+    feedbacks: list[str],
+) -> str:
+    return (
+        _company_section(profile)
+        + f"\n## Tender\n{_tender_lines(tender, org_industries)}"
+        + _feedback_section(feedbacks)
+    )
+
+
+def build_batch_prompt(
+    profile: CompanyProfile,
+    tenders: list[Tender],
+    org_industries: dict[str, list[str]],
+    feedbacks: list[str],
+) -> str:
+    numbered = "\n\n".join(
+        f"### Tender {i}\n{_tender_lines(tender, org_industries)}"
+        for i, tender in enumerate(tenders, 1)
+    )
+    return (
+        _company_section(profile)
+        + f"\n## Tenders\n\n{numbered}"
+        + _feedback_section(feedbacks)
+    )
+
+
+def input_fingerprint(user_prompt: str) -> str:
+    """Hash of the full single-tender LLM input for one tender.
+
+    The user prompt already carries the tender, the relevant company profile
+    fields, the organization's industries and the feedback, so any change to
+    those - or to the model or system prompt - changes the fingerprint. It
+    is computed the same way whether the tender is then scored alone or in
+    a batch, so changing the batch size does not trigger re-evaluation.
+    """
+    digest = hashlib.sha256()
+    for part in (settings.llm_model, RECOMMENDATION_SYSTEM_PROMPT, user_prompt):
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\x00")
+    return digest.hexdigest()
+
+
+def _parse_result(raw: dict, tender: Tender) -> RecommendationResult:
+    return RecommendationResult(
+        tender_name=tender.metadata.name,
+        organization=tender.metadata.organization,
+        name_match=MatchLevel(raw["name_match"]),
+        name_reason=raw["name_reason"],
+        industry_match=MatchLevel(raw["industry_match"]),
+        industry_reason=raw["industry_reason"],
+    )
+
+
+def parse_batch_response(
+    content: str, tenders: list[Tender]
+) -> list[RecommendationResult | None]:
+    """Map a batched response back to its tenders by number.
+
+    Raises ``ValueError`` when the response is not the expected JSON shape;
+    individual malformed or missing entries come back as ``None``.
+    """
+    raw = json.loads(content)
+    items = raw.get("results") if isinstance(raw, dict) else None
+    if not isinstance(items, list):
+        raise ValueError("Batch response has no 'results' list")
+
+    results: list[RecommendationResult | None] = [None] * len(tenders)
+    for item in items:
+        try:
+            index = int(item["id"]) - 1
+            if 0 <= index < len(tenders) and results[index] is None:
+                results[index] = _parse_result(item, tenders[index])
+        except (KeyError, TypeError, ValueError):
+            logger.warning("Ignoring malformed batch entry: %s", item)
+    return results
+
+
+class RecommendationScorer:
+    def __init__(self, llm_client: ChatOpenAI, batch_size: int) -> None:
+        self.llm_client = llm_client
+        self.batch_size = max(batch_size, 1)
+
+    async def score(
+        self, user_prompt: str, tender: Tender, config: RunnableConfig | None = None
+    ) -> RecommendationResult:
+        tender_name = tender.metadata.name
+        logger.info(
+            "Calling LLM for tender='%s', org='%s'",
+            tender_name,
+            tender.metadata.organization,
+        )
+        response = await self.llm_client.ainvoke(
+            [
+                SystemMessage(content=RECOMMENDATION_SYSTEM_PROMPT),
+                HumanMessage(content=user_prompt),
+            ],
+            response_format={"type": "json_object"},
+            config=config,
+        )
+
+        result = _parse_result(json.loads(response.content), tender)  # type: ignore[arg-type]
+        logger.info(
+            "LLM result for tender='%s': name_match=%s, industry_match=%s",
+            tender_name,
+            result.name_match,
+            result.industry_match,
+        )
+        return result
+
+    async def score_batch(
+        self,
+        profile: CompanyProfile,
+        items: list[tuple[Tender, str]],
+        org_industries: dict[str, list[str]],
+        feedbacks: list[str],
+        config: RunnableConfig | None = None,
+    ) -> list[RecommendationResult | Exception]:
+        """Score ``(tender, single-tender prompt)`` pairs in one request.
+
+        Returns a result or the exception that prevented it, per item. The
+        single-tender prompts are only used for the fallback.
+        """
+        tenders = [tender for tender, _ in items]
+        results: list[RecommendationResult | None] = [None] * len(items)
+        if len(items) > 1:
+            logger.info("Calling LLM for a batch of %d tenders", len(items))
+            response = await self.llm_client.ainvoke(
+                [
+                    SystemMessage(content=BATCH_RECOMMENDATION_SYSTEM_PROMPT),
+                    HumanMessage(
+                        content=build_batch_prompt(
+                            profile, tenders, org_industries, feedbacks
+                        )
+                    ),
+                ],
+                response_format={"type": "json_object"},
+                config=config,
+            )
+            try:
+                results = parse_batch_response(response.content, tenders)  # type: ignore[arg-type]
+            except ValueError:
+                logger.warning(
+                    "Unparseable batch response; scoring %d tenders one by one",
+                    len(items),
+                    exc_info=True,
+                )
+
+        missing = [i for i, result in enumerate(results) if result is None]
+        if missing and len(items) > 1:
+            logger.info("Falling back to single calls for %d tenders", len(missing))
+
+        outcomes: list[RecommendationResult | Exception] = list(results)  # type: ignore[arg-type]
+        for i in missing:
+            tender, user_prompt = items[i]
+            try:
+                outcomes[i] = await self.score(user_prompt, tender, config)
+            except Exception as e:
+                outcomes[i] = e
+        return outcomes
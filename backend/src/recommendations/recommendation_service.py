@@ -1,18 +1,26 @@
 import asyncio
-import json
 import logging
+from collections.abc import Awaitable, Callable
 from datetime import datetime, timezone
 
-from langchain_core.messages import HumanMessage, SystemMessage
 from langchain_openai import ChatOpenAI
 from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import ReplaceOne
 
+from src.bulk_writer import BulkWriter
 from src.companies.company_constants import (
     COLLECTION_NAME as COMPANY_PROFILES_COLLECTION,
 )
 from src.companies.company_schemas import CompanyProfile, CompanyProfileDocument
 from src.config import settings
-from src.feedback.feedback_constants import COLLECTION_NAME as FEEDBACK_COLLECTION
+from src.feedback.feedback_constants import (
+    COLLECTION_NAME as FEEDBACK_COLLECTION,
+    FEEDBACK_SORT,
+    feedbacks_by_company_filter,
+)
+from src.llm.embeddings import LocalEmbedder
+from src.llm.llm_scheduler import llm_request_config
+from src.llm.llm_schemas import LLMPriority
 from src.organization_classification.classification_constants import (
     COLLECTION_NAME as ORG_CLASSIFICATION_COLLECTION,
 )
@@ -21,20 +29,39 @@ from src.organization_classification.classification_schemas import (
 )
 from src.recommendations.recommendation_constants import (
     COLLECTION_NAME as RECOMMENDATIONS_COLLECTION,
-    LLM_CONCURRENCY,
-    RECOMMENDATION_SYSTEM_PROMPT,
+    fingerprints_filter,
+    recommendations_by_match_filter,
+    stored_recommendations_filter,
+)
+from src.recommendations.recommendation_jobs import RecommendationJobRunner
+from src.recommendations.recommendation_prefilter import (
+    measure_recall,
+    prefilter_scores,
+    select_candidates,
+)
+from src.recommendations.recommendation_scoring import (
+    RecommendationScorer,
+    build_user_prompt,
+    input_fingerprint,
+    unique_by_name,
 )
 from src.recommendations.recommendation_schemas import (
     MatchLevel,
+    PrefilterReport,
     RecommendationDocument,
+    RecommendationProgress,
     RecommendationResult,
+    SimilarTender,
     TenderRecommendation,
 )
+from src.tenders.tender_embeddings import TenderEmbeddingIndex
 from src.tenders.tender_schemas import Tender
 from src.tenders.tender_service import TenderService
 
 logger = logging.getLogger(__name__)
 
+ProgressCallback = Callable[[RecommendationProgress], Awaitable[None]]
+
 
 class RecommendationService:
     def __init__(
@@ -42,10 +69,18 @@ class RecommendationService:
         db: AsyncIOMotorDatabase,
         llm_client: ChatOpenAI,
         tender_service: TenderService,
+        embedder: LocalEmbedder | None = None,
+        tender_embeddings: TenderEmbeddingIndex | None = None,
     ) -> None:
         self.db = db
         self.llm_client = llm_client
         self.tender_service = tender_service
+        self.embedder = embedder
+        self.tender_embeddings = tender_embeddings
+        self.scorer = RecommendationScorer(
+            llm_client, settings.recommendation_batch_size
+        )
+        self.jobs = RecommendationJobRunner(db, self._classify_via_llm)
 
     async def _get_org_industries(self) -> dict[str, list[str]]:
         logger.info("Loading organization industries from MongoDB")
@@ -64,7 +99,9 @@ class RecommendationService:
     async def _get_feedbacks(self, company_name: str) -> list[str]:
         logger.info("Loading feedbacks for company '%s'", company_name)
         collection = self.db[FEEDBACK_COLLECTION]
-        cursor = collection.find({"company_name": company_name})
+        cursor = collection.find(
+            feedbacks_by_company_filter(company_name), sort=FEEDBACK_SORT
+        )
         docs = await cursor.to_list(length=None)
         feedbacks = [doc["feedback_comment"] for doc in docs]
         logger.info(
@@ -72,79 +109,14 @@ class RecommendationService:
         )
         return feedbacks
 
-    @staticmethod
-    def build_user_prompt(
-        profile: CompanyProfile,
-        tender: Tender,
-        org_industries: dict[str, list[str]],
-        feedbacks: list[str],
-    ) -> str:
-        company_info = profile.company_info
-        criteria = profile.matching_criteria
-
-        industries = ", ".join(company_info.industries)
-        categories = "\n".join(f"- {cat}" for cat in criteria.service_categories)
-        authorities = ", ".join(criteria.target_authorities)
-
-        org = tender.metadata.organization
-        org_ind = org_industries.get(org, [])
-        org_ind_str = f"\n**Industries:** {', '.join(org_ind)}" if org_ind else ""
-
-        prompt = f"""\
-## Company profile: {company_info.name}
-
-### Company's Industries
-{industries}
-
-### Company's Service categories
-{categories}
-
-### Company's Target contracting authorities
-{authorities}
-
-## Tender
-**Name:** {tender.metadata.name}
-**Organization:** {org}{org_ind_str}\
-"""
-
-        if feedbacks:
-            feedback_lines = "\n".join(f"- {fb}" for fb in feedbacks)
-            prompt += f"""
-
-## User feedback on previously rejected tenders
-{feedback_lines}\
-"""
-
-        return prompt
-
-    async def _call_llm(
-        self, user_prompt: str, tender_name: str, organization: str
-    ) -> RecommendationResult:
-        logger.info("Calling LLM for tender='%s', org='%s'", tender_name, organization)
-        response = await self.llm_client.ainvoke(
-            [
-                SystemMessage(content=RECOMMENDATION_SYSTEM_PROMPT),
-                HumanMessage(content=user_prompt),
-            ],
-            response_format={"type": "json_object"},
-        )
-
-        raw = json.loads(response.content)  # type: ignore[arg-type]
-        result = RecommendationResult(
-            tender_name=tender_name,
-            organization=organization,
-            name_match=MatchLevel(raw["name_match"]),
-            name_reason=raw["name_reason"],
-            industry_match=MatchLevel(raw["industry_match"]),
-            industry_reason=raw["industry_reason"],
-        )
-        logger.info(
-            "LLM result for tender='%s': name_match=%s, industry_match=%s",
-            tender_name,
-            result.name_match,
-            result.industry_match,
+    async def _get_fingerprints(self, company_name: str) -> dict[str, str]:
+        collection = self.db[RECOMMENDATIONS_COLLECTION]
+        cursor = collection.find(
+            fingerprints_filter(company_name), {"input_fingerprint": 1}
         )
-        return result
+        return {
+            doc["_id"]["tender_name"]: doc["input_fingerprint"] async for doc in cursor
+        }
 
     @staticmethod
     def _should_skip(result: RecommendationResult) -> bool:
@@ -153,15 +125,27 @@ class RecommendationService:
             MatchLevel.DONT_KNOW,
         )
 
+    @staticmethod
+    def _recommendation_mongo_doc(
+        company_name: str,
+        result: RecommendationResult,
+        input_fingerprint: str | None = None,
+        skipped: bool = False,
+    ) -> dict[str, object]:
+        now = datetime.now(timezone.utc)
+        return RecommendationDocument.from_domain(
+            company_name, result, now, input_fingerprint, skipped
+        ).to_mongo()
+
     async def _save_recommendation(
         self,
         company_name: str,
         result: RecommendationResult,
+        input_fingerprint: str | None = None,
     ) -> None:
-        now = datetime.now(timezone.utc)
-        document = RecommendationDocument.from_domain(company_name, result, now)
-        mongo_doc = document.to_mongo()
-
+        mongo_doc = self._recommendation_mongo_doc(
+            company_name, result, input_fingerprint
+        )
         collection = self.db[RECOMMENDATIONS_COLLECTION]
         await collection.replace_one({"_id": mongo_doc["_id"]}, mongo_doc, upsert=True)
         logger.info(
@@ -198,31 +182,75 @@ class RecommendationService:
         collection = self.db[RECOMMENDATIONS_COLLECTION]
 
         cursor = collection.find(
-            {
-                "_id.company_name": company_name,
-                "name_match": name_match,
-                "industry_match": industry_match,
-            }
+            recommendations_by_match_filter(company_name, name_match, industry_match)
         )
         raw_docs = await cursor.to_list(length=None)
 
         documents = [RecommendationDocument.from_mongo(doc) for doc in raw_docs]
 
         # Back-fill organization for legacy docs that may lack it
-        org_lookup: dict[str, str] = {}
-        needs_lookup = any(not doc.organization for doc in documents)
-        if needs_lookup:
-            org_lookup = {
-                t.metadata.name: t.metadata.organization
-                for t in self.tender_service.load_tenders()
-            }
-            for doc in documents:
-                if not doc.organization:
-                    doc.organization = org_lookup.get(doc.tender_name, "")
+        for doc in documents:
+            if not doc.organization:
+                tender = self.tender_service.get_tender_by_name(doc.tender_name)
+                doc.organization = tender.metadata.organization if tender else ""
 
         return [doc.to_response() for doc in documents]
 
-    async def _classify_via_llm(self, company_name: str) -> None:
+    @staticmethod
+    def _prefilter(
+        profile: CompanyProfile,
+        tenders: list[Tender],
+        org_industries: dict[str, list[str]],
+    ) -> set[int] | None:
+        if not settings.recommendation_prefilter_enabled:
+            return None
+        return select_candidates(
+            prefilter_scores(profile, tenders, org_industries),
+            settings.recommendation_prefilter_threshold,
+            settings.recommendation_prefilter_max_candidates,
+        )
+
+    async def _get_stored_name_matches(
+        self, company_name: str
+    ) -> dict[str, MatchLevel]:
+        collection = self.db[RECOMMENDATIONS_COLLECTION]
+        cursor = collection.find(
+            stored_recommendations_filter(company_name), {"name_match": 1}
+        )
+        return {
+            doc["_id"]["tender_name"]: MatchLevel(doc["name_match"])
+            async for doc in cursor
+        }
+
+    async def evaluate_prefilter(
+        self, company_name: str, threshold: float | None = None
+    ) -> PrefilterReport:
+        """Recall of the local pre-filter against the company's stored LLM results."""
+        if threshold is None:
+            threshold = settings.recommendation_prefilter_threshold
+        profile = await self._get_company_profile(company_name)
+        tenders = unique_by_name(self.tender_service.load_tenders())
+        org_industries = await self._get_org_industries()
+        candidates = select_candidates(
+            prefilter_scores(profile, tenders, org_industries),
+            threshold,
+            settings.recommendation_prefilter_max_candidates,
+        )
+        stored = await self._get_stored_name_matches(company_name)
+        report = measure_recall(tenders, candidates, stored, threshold)
+        logger.info("Pre-filter report for '%s': %s", company_name, report)
+        return report
+
+    async def _classify_via_llm(
+        self, company_name: str, on_progress: ProgressCallback | None = None
+    ) -> RecommendationProgress:
+        """Evaluate every new or changed tender for a company.
+
+        ``on_progress`` is awaited once the pending tenders are known and after
+        each evaluation; an exception it raises (e.g. a cancellation) stops
+        the remaining evaluations. A failing LLM call is counted and logged
+        without aborting the run.
+        """
         logger.info("Starting LLM classification for company '%s'", company_name)
         profile = await self._get_company_profile(company_name)
 
@@ -230,55 +258,121 @@ class RecommendationService:
         org_industries = await self._get_org_industries()
         feedbacks = await self._get_feedbacks(company_name)
 
-        total = len(tenders)
+        unique = unique_by_name(tenders)
+        candidates = self._prefilter(profile, unique, org_industries)
+
+        known = await self._get_fingerprints(company_name)
+        pending: list[tuple[Tender, str, str]] = []
+        progress = RecommendationProgress()
+        for i, tender in enumerate(unique):
+            user_prompt = build_user_prompt(profile, tender, org_industries, feedbacks)
+            fingerprint = input_fingerprint(user_prompt)
+            if known.get(tender.metadata.name) == fingerprint:
+                progress.unchanged += 1
+            elif candidates is not None and i not in candidates:
+                progress.filtered += 1
+            else:
+                pending.append((tender, user_prompt, fingerprint))
+
+        total = progress.total = len(pending)
+        batch_size = self.scorer.batch_size
+        batches = [pending[i : i + batch_size] for i in range(0, total, batch_size)]
         logger.info(
-            "Processing %d tenders (%d concurrent) for '%s'",
+            "Processing %d of %d tenders in %d requests "
+            "(%d unchanged, %d pre-filtered) for '%s'",
             total,
-            LLM_CONCURRENCY,
+            len(tenders),
+            len(batches),
+            progress.unchanged,
+            progress.filtered,
             company_name,
         )
-
-        semaphore = asyncio.Semaphore(LLM_CONCURRENCY)
-
-        async def _process_tender(index: int, tender: Tender) -> None:
-            async with semaphore:
-                logger.info(
-                    "[%d/%d] Evaluating tender: '%s'",
-                    index,
-                    total,
-                    tender.metadata.name,
-                )
-                user_prompt = self.build_user_prompt(
-                    profile, tender, org_industries, feedbacks
-                )
-                result = await self._call_llm(
-                    user_prompt,
-                    tender.metadata.name,
-                    tender.metadata.organization,
+        if on_progress is not None:
+            await on_progress(progress)
+
+        async def _process_batch(
+            index: int, batch: list[tuple[Tender, str, str]]
+        ) -> None:
+            logger.info(
+                "[%d/%d] Evaluating %d tender(s), starting with '%s'",
+                index,
+                len(batches),
+                len(batch),
+                batch[0][0].metadata.name,
+            )
+            try:
+                outcomes = await self.scorer.score_batch(
+                    profile,
+                    [(tender, user_prompt) for tender, user_prompt, _ in batch],
+                    org_industries,
+                    feedbacks,
+                    llm_request_config(LLMPriority.BATCH, company_name),
                 )
+            except Exception as e:
+                outcomes = [e] * len(batch)
 
-                if self._should_skip(result):
+            for (tender, _, fingerprint), outcome in zip(batch, outcomes):
+                if isinstance(outcome, Exception):
+                    logger.error(
+                        "LLM evaluation failed for tender '%s'",
+                        tender.metadata.name,
+                        exc_info=outcome,
+                    )
+                    progress.failed += 1
+                    continue
+
+                skipped = self._should_skip(outcome)
+                if skipped:
                     logger.info(
                         "Skipping tender '%s' — name=%s, industry=%s",
                         tender.metadata.name,
-                        result.name_match,
-                        result.industry_match,
+                        outcome.name_match,
+                        outcome.industry_match,
                     )
-                    return
 
-                await self._save_recommendation(company_name, result)
+                mongo_doc = self._recommendation_mongo_doc(
+                    company_name, outcome, fingerprint, skipped
+                )
+                await writer.add(
+                    ReplaceOne({"_id": mongo_doc["_id"]}, mongo_doc, upsert=True)
+                )
+                progress.processed += 1
+                progress.skipped += skipped
+
+            if on_progress is not None:
+                await on_progress(progress)
 
-        tasks = [_process_tender(i, tender) for i, tender in enumerate(tenders, 1)]
-        await asyncio.gather(*tasks)
+        # Results already evaluated are still written when the run is cancelled
+        async with BulkWriter(self.db[RECOMMENDATIONS_COLLECTION]) as writer:
+            # Unlike gather, a task group cancels the other evaluations when one raises
+            async with asyncio.TaskGroup() as group:
+                for i, batch in enumerate(batches, 1):
+                    group.create_task(_process_batch(i, batch))
+        progress.write_failed = writer.report.failed
+
+        logger.info(
+            "Finished processing %d tenders for '%s' (%d failed, %d not saved)",
+            total,
+            company_name,
+            progress.failed,
+            progress.write_failed,
+        )
+        return progress
 
-        logger.info("Finished processing all %d tenders for '%s'", total, company_name)
+    async def ensure_company_exists(self, company_name: str) -> None:
+        await self._get_company_profile(company_name)
 
     async def get_recommendations(
         self,
         company_name: str,
         name_match: MatchLevel,
         industry_match: MatchLevel,
-    ) -> list[TenderRecommendation]:
+    ) -> tuple[list[TenderRecommendation], str | None]:
+        """Return stored recommendations.
+
+        With the LLM source, also makes sure a background job is evaluating
+        new or changed tenders; its ID is returned so the caller can poll it.
+        """
         source = settings.recommendations_source
         logger.info(
             "Getting recommendations for company='%s' (source=%s, name_match=%s, industry_match=%s)",
@@ -288,8 +382,10 @@ class RecommendationService:
             industry_match,
         )
 
+        job_id = None
         if source == "llm":
-            await self._classify_via_llm(company_name)
+            await self.ensure_company_exists(company_name)
+            job_id = (await self.jobs.start(company_name)).job_id
 
         results = await self._load_from_mongo(company_name, name_match, industry_match)
         logger.info(
@@ -297,6 +393,42 @@ class RecommendationService:
             len(results),
             company_name,
         )
+        return results, job_id
+
+    @property
+    def similarity_available(self) -> bool:
+        return self.embedder is not None and self.tender_embeddings is not None
+
+    async def similar_tenders(
+        self, company_name: str, limit: int
+    ) -> list[SimilarTender]:
+        """Tenders closest to the company's service categories by embedding."""
+        if self.embedder is None or self.tender_embeddings is None:
+            raise RuntimeError("Tender embeddings are not available")
+        profile = await self._get_company_profile(company_name)
+        query = "; ".join(profile.matching_criteria.service_categories)
+        [vector] = await self.embedder.embed([query])
+
+        catalog = self.tender_service.load_catalog()
+        results: list[SimilarTender] = []
+        # Over-fetch a little: rows of tenders removed since the build are skipped
+        for tender_url, score in self.tender_embeddings.top_k(vector, limit * 2):
+            tender = catalog.get_by_url(tender_url)
+            if tender is None:
+                continue
+            results.append(
+                SimilarTender(
+                    tender_name=tender.metadata.name,
+                    organization=tender.metadata.organization,
+                    tender_url=tender_url,
+                    score=round(score, 4),
+                )
+            )
+            if len(results) == limit:
+                break
+        logger.info(
+            "Found %d similar tenders for company '%s'", len(results), company_name
+        )
         return results
 
     async def refresh_recommendation(
@@ -318,15 +450,16 @@ class RecommendationService:
         org_industries = await self._get_org_industries()
         feedbacks = await self._get_feedbacks(company_name)
 
-        user_prompt = self.build_user_prompt(profile, tender, org_industries, feedbacks)
+        user_prompt = build_user_prompt(profile, tender, org_industries, feedbacks)
 
-        result = await self._call_llm(
+        result = await self.scorer.score(
             user_prompt,
-            tender.metadata.name,
-            tender.metadata.organization,
+            tender,
+            llm_request_config(LLMPriority.INTERACTIVE, company_name),
         )
 
-        await self._save_recommendation(company_name, result)
+        fingerprint = input_fingerprint(user_prompt)
+        await self._save_recommendation(company_name, result, fingerprint)
         logger.info(
             "Refresh complete for tender='%s': name_match=%s, industry_match=%s",
             tender_name,
@@ -334,5 +467,5 @@ class RecommendationService:
             result.industry_match,
         )
         return RecommendationDocument.from_domain(
-            company_name, result, datetime.now(timezone.utc)
+            company_name, result, datetime.now(timezone.utc), fingerprint
         ).to_response()
@@ -0,0 +1,177 @@
+import hashlib
+import logging
+import re
+from datetime import datetime, timedelta, timezone
+
+from motor.motor_asyncio import AsyncIOMotorDatabase
+
+from src.llm.embeddings import LocalEmbedder, cosine_similarity
+from src.tenders.tender_constants import (
+    ANSWER_CACHE_COLLECTION_NAME,
+    answers_by_attachment_filter,
+    similar_answers_filter,
+)
+from src.tenders.tender_schemas import (
+    AnswerCacheMetrics,
+    CachedAnswerDocument,
+    Tender,
+    TenderCatalogDiff,
+)
+from src.tenders.tender_search import fold_diacritics
+
+logger = logging.getLogger(__name__)
+
+_WORD_PATTERN = re.compile(r"\w+")
+
+
+def normalize_question(question: str) -> str:
+    """Lowercase, diacritic-free words, ignoring whitespace and punctuation.
+
+    Every word is kept unstemmed: short words such as "do"/"od" ("until"/
+    "since") change what is asked, so only spelling variants share a key.
+    """
+    return " ".join(_WORD_PATTERN.findall(fold_diacritics(question)))
+
+
+def profile_hash(profile_json: str | None, company_name: str) -> str:
+    # Without a stored profile the answer can only depend on the company name
+    source = profile_json if profile_json is not None else f"name:{company_name}"
+    return hashlib.sha256(source.encode("utf-8")).hexdigest()
+
+
+def _cache_key(tender_url: str, normalized_question: str, profile: str) -> str:
+    raw = "\x1f".join((tender_url, normalized_question, profile))
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class AnswerCache:
+    """MongoDB cache of agent answers to standalone tender questions.
+
+    Answers are found by exact key (tender URL, normalized question, company
+    profile hash) and, when a local embedding model is configured, by cosine
+    similarity against other questions about the same tender and profile.
+    Embeddings are computed from the question as asked, not from its
+    normalized form.
+    Entries expire through a TTL index and are dropped when the tender or
+    one of its attachments changes.
+    """
+
+    def __init__(
+        self,
+        db: AsyncIOMotorDatabase,
+        ttl_seconds: int,
+        embedder: LocalEmbedder | None,
+        similarity_threshold: float,
+    ) -> None:
+        self.collection = db[ANSWER_CACHE_COLLECTION_NAME]
+        self.ttl = timedelta(seconds=ttl_seconds)
+        self.embedder = embedder
+        self.similarity_threshold = similarity_threshold
+        self.metrics = AnswerCacheMetrics()
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl.total_seconds() > 0
+
+    async def _embed(self, question: str) -> list[float] | None:
+        if self.embedder is None:
+            return None
+        try:
+            [embedding] = await self.embedder.embed([question])
+        except Exception:
+            logger.warning("Failed to embed question for answer cache", exc_info=True)
+            return None
+        return embedding
+
+    async def _find_similar(
+        self, tender_url: str, profile: str, embedding: list[float]
+    ) -> CachedAnswerDocument | None:
+        now = datetime.now(timezone.utc)
+        cursor = self.collection.find(similar_answers_filter(tender_url, profile, now))
+        best: CachedAnswerDocument | None = None
+        best_score = self.similarity_threshold
+        async for raw in cursor:
+            candidate = CachedAnswerDocument.from_mongo(raw)
+            if candidate.embedding is None:
+                continue
+            score = cosine_similarity(embedding, candidate.embedding)
+            if score >= best_score:
+                best, best_score = candidate, score
+        if best is not None:
+            logger.info(
+                "Answer cache similar hit (%.3f): '%s'",
+                best_score,
+                best.normalized_question,
+            )
+        return best
+
+    async def get(self, tender: Tender, question: str, profile: str) -> str | None:
+        if not self.enabled:
+            return None
+        normalized = normalize_question(question)
+        raw = await self.collection.find_one(
+            {
+                "_id": _cache_key(tender.tender_url, normalized, profile),
+                # The TTL monitor only runs once a minute
+                "expires_at": {"$gt": datetime.now(timezone.utc)},
+            }
+        )
+        if raw is not None:
+            self.metrics.exact_hits += 1
+            logger.info("Answer cache exact hit for '%s'", normalized)
+            return CachedAnswerDocument.from_mongo(raw).answer
+
+        embedding = await self._embed(question)
+        if embedding is not None:
+            similar = await self._find_similar(tender.tender_url, profile, embedding)
+            if similar is not None:
+                self.metrics.similar_hits += 1
+                return similar.answer
+
+        self.metrics.misses += 1
+        return None
+
+    async def put(
+        self, tender: Tender, question: str, profile: str, answer: str
+    ) -> None:
+        if not self.enabled:
+            return
+        normalized = normalize_question(question)
+        now = datetime.now(timezone.utc)
+        document = CachedAnswerDocument(
+            cache_key=_cache_key(tender.tender_url, normalized, profile),
+            tender_url=tender.tender_url,
+            tender_name=tender.metadata.name,
+            file_urls=list(tender.file_urls),
+            normalized_question=normalized,
+            profile_hash=profile,
+            answer=answer,
+            embedding=await self._embed(question),
+            created_at=now,
+            expires_at=now + self.ttl,
+        )
+        mongo_doc = document.to_mongo()
+        await self.collection.replace_one(
+            {"_id": mongo_doc["_id"]}, mongo_doc, upsert=True
+        )
+        self.metrics.stores += 1
+
+    async def _invalidate(self, query: dict[str, object], reason: str) -> None:
+        result = await self.collection.delete_many(query)
+        if result.deleted_count:
+            self.metrics.invalidated += result.deleted_count
+            logger.info(
+                "Invalidated %d cached answer(s): %s", result.deleted_count, reason
+            )
+
+    async def invalidate_tenders(self, diff: TenderCatalogDiff) -> None:
+        urls = [*diff.removed, *diff.changed]
+        if urls:
+            await self._invalidate(
+                {"tender_url": {"$in": urls}}, f"{len(urls)} tender(s) changed"
+            )
+
+    async def invalidate_attachment(self, file_url: str) -> None:
+        await self._invalidate(
+            answers_by_attachment_filter(file_url), f"attachment {file_url} changed"
+        )
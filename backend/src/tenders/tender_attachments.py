@@ -0,0 +1,248 @@
+import asyncio
+import hashlib
+import logging
+import tempfile
+from collections.abc import Awaitable, Callable
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import IO
+from urllib.parse import unquote, urlparse
+
+import httpx
+
+from src.tenders.tender_constants import (
+    DOWNLOAD_CHUNK_SIZE,
+    MAX_FILE_SIZE_BYTES,
+    SPOOL_MAX_MEMORY_BYTES,
+    SUPPORTED_FILE_EXTENSIONS,
+)
+from src.tenders.tender_exceptions import AttachmentReadError
+from src.tenders.tender_extraction import DocumentExtractionEngine, ExtractionSource
+from src.tenders.tender_schemas import ExtractedTextDocument
+from src.tenders.tender_text_cache import ExtractedTextCache
+
+logger = logging.getLogger(__name__)
+
+ContentChangeListener = Callable[[str], Awaitable[None]]
+
+
+def get_file_extension(url: str) -> str:
+    path = unquote(urlparse(url).path)
+    dot_index = path.rfind(".")
+    if dot_index == -1:
+        return ""
+    return path[dot_index:].lower()
+
+
+def _too_large_error(size_bytes: int | None) -> AttachmentReadError:
+    limit_mb = MAX_FILE_SIZE_BYTES // (1024 * 1024)
+    size = (
+        f"{size_bytes / (1024 * 1024):.1f} MB"
+        if size_bytes is not None
+        else f"more than {limit_mb} MB"
+    )
+    return AttachmentReadError(
+        f"File too large ({size}). Maximum supported size is {limit_mb} MB."
+    )
+
+
+class DownloadedFile:
+    """Attachment body kept in memory while small, spooled to a temp file beyond that.
+
+    Spooled bytes are buffered and written out in blocks of about
+    ``SPOOL_MAX_MEMORY_BYTES`` on a worker thread, so disk I/O doesn't block
+    the event loop; call :meth:`finish` before reading :attr:`source`.
+    """
+
+    def __init__(self, suffix: str, etag: str | None, last_modified: str | None):
+        self.suffix = suffix
+        self.etag = etag
+        self.last_modified = last_modified
+        self.size = 0
+        self._digest = hashlib.sha256()
+        self._buffer = bytearray()
+        self._file: IO[bytes] | None = None
+
+    def _spill(self, data: bytes | bytearray) -> None:
+        if self._file is None:
+            self._file = tempfile.NamedTemporaryFile(suffix=self.suffix, delete=False)
+        self._file.write(data)
+
+    async def write(self, chunk: bytes) -> None:
+        self.size += len(chunk)
+        self._digest.update(chunk)
+        self._buffer.extend(chunk)
+        if len(self._buffer) > SPOOL_MAX_MEMORY_BYTES:
+            data, self._buffer = self._buffer, bytearray()
+            await asyncio.to_thread(self._spill, data)
+
+    async def finish(self) -> None:
+        """Write out what is still buffered once the file has been spooled."""
+        if self._file is None:
+            return
+        data, self._buffer = self._buffer, bytearray()
+        await asyncio.to_thread(self._spill, data)
+        await asyncio.to_thread(self._file.flush)
+
+    @property
+    def content_hash(self) -> str:
+        return self._digest.hexdigest()
+
+    @property
+    def source(self) -> ExtractionSource:
+        if self._file is None:
+            return bytes(self._buffer)
+        return Path(self._file.name)
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            Path(self._file.name).unlink(missing_ok=True)
+            self._file = None
+        self._buffer = bytearray()
+
+
+class AttachmentReader:
+    """Downloads tender attachments and returns their text, backed by a cache."""
+
+    def __init__(
+        self,
+        http_client: httpx.AsyncClient,
+        text_cache: ExtractedTextCache,
+        extraction_engine: DocumentExtractionEngine,
+    ) -> None:
+        self.http_client = http_client
+        self.text_cache = text_cache
+        self.extraction_engine = extraction_engine
+        self._content_listeners: list[ContentChangeListener] = []
+
+    def subscribe_content_changes(self, listener: ContentChangeListener) -> None:
+        """Call ``listener(file_url)`` when a cached file turns out to have new content."""
+        self._content_listeners.append(listener)
+
+    async def _notify_content_changed(self, file_url: str) -> None:
+        logger.info("Attachment content changed: %s", file_url)
+        for listener in self._content_listeners:
+            try:
+                await listener(file_url)
+            except Exception:
+                logger.exception("Content change listener %r failed", listener)
+
+    async def read_text(self, file_url: str) -> str:
+        extension = get_file_extension(file_url)
+        if extension not in SUPPORTED_FILE_EXTENSIONS:
+            raise AttachmentReadError(
+                f"Cannot read file with extension '{extension}'. "
+                f"Supported formats: {', '.join(sorted(SUPPORTED_FILE_EXTENSIONS))}."
+            )
+
+        cached = await self.text_cache.get(file_url)
+        headers: dict[str, str] = {}
+        if cached is not None:
+            if cached.etag:
+                headers["If-None-Match"] = cached.etag
+            if cached.last_modified:
+                headers["If-Modified-Since"] = cached.last_modified
+
+        try:
+            download = await self._download(file_url, extension, headers)
+        except httpx.HTTPStatusError as exc:
+            raise AttachmentReadError(
+                f"Failed to download file: HTTP {exc.response.status_code}"
+            ) from exc
+        except httpx.RequestError as exc:
+            raise AttachmentReadError(f"Failed to download file: {exc}") from exc
+
+        if download is None:
+            logger.info("Extracted text cache hit (not modified): %s", file_url)
+            await self.text_cache.touch(file_url)
+            return cached.text  # type: ignore[union-attr]
+
+        try:
+            text = await self._text_for_download(file_url, extension, download, cached)
+        finally:
+            download.close()
+        return text
+
+    async def _download(
+        self, file_url: str, extension: str, headers: dict[str, str]
+    ) -> DownloadedFile | None:
+        """Stream the file body, aborting as soon as it exceeds the size limit.
+
+        Returns ``None`` when the server reports the cached copy is still valid.
+        """
+        async with self.http_client.stream(
+            "GET", file_url, headers=headers
+        ) as response:
+            if headers and response.status_code == 304:
+                return None
+            response.raise_for_status()
+
+            declared = response.headers.get("Content-Length")
+            if declared is not None and declared.isdigit():
+                if int(declared) > MAX_FILE_SIZE_BYTES:
+                    raise _too_large_error(int(declared))
+
+            download = DownloadedFile(
+                suffix=extension,
+                etag=response.headers.get("ETag"),
+                last_modified=response.headers.get("Last-Modified"),
+            )
+            try:
+                async for chunk in response.aiter_bytes(DOWNLOAD_CHUNK_SIZE):
+                    if download.size + len(chunk) > MAX_FILE_SIZE_BYTES:
+                        raise _too_large_error(None)
+                    await download.write(chunk)
+                await download.finish()
+            except BaseException:
+                download.close()
+                raise
+        return download
+
+    async def _text_for_download(
+        self,
+        file_url: str,
+        extension: str,
+        download: DownloadedFile,
+        cached: ExtractedTextDocument | None,
+    ) -> str:
+        content_hash = download.content_hash
+        if cached is not None and cached.content_hash == content_hash:
+            logger.info("Extracted text cache hit (same content): %s", file_url)
+            await self.text_cache.touch(file_url, download.etag, download.last_modified)
+            return cached.text
+
+        same_content = await self.text_cache.find_by_hash(content_hash)
+        if same_content is not None:
+            logger.info(
+                "Extracted text cache hit (content of %s): %s",
+                same_content.file_url,
+                file_url,
+            )
+            text = same_content.text
+        else:
+            try:
+                text = await self.extraction_engine.extract(download.source, extension)
+            except Exception as exc:
+                logger.exception("Failed to extract text from %s", file_url)
+                raise AttachmentReadError(
+                    f"Failed to extract text from file: {exc}"
+                ) from exc
+
+        now = datetime.now(timezone.utc)
+        await self.text_cache.put(
+            ExtractedTextDocument(
+                file_url=file_url,
+                content_hash=content_hash,
+                etag=download.etag,
+                last_modified=download.last_modified,
+                extension=extension,
+                text=text,
+                size_bytes=len(text.encode("utf-8")),
+                created_at=now,
+                last_accessed_at=now,
+            )
+        )
+        if cached is not None:
+            await self._notify_content_changed(file_url)
+        return text
@@ -0,0 +1,269 @@
+import asyncio
+import contextlib
+import inspect
+import json
+import logging
+import time
+from bisect import bisect_left
+from collections import defaultdict
+from collections.abc import Awaitable, Callable
+from datetime import date
+from pathlib import Path
+
+from src.config import settings
+from src.constants import TENDERS_PATH
+from src.tenders.tender_schemas import Tender, TenderCatalogDiff, TenderSearchHit
+from src.tenders.tender_search import Bm25Index, term_frequencies
+from src.tenders.tender_snapshot import read_snapshot
+
+logger = logging.getLogger(__name__)
+
+# Organization names are indexed too, but matter less than the tender subject
+ORGANIZATION_FIELD_WEIGHT = 0.5
+
+
+def normalize_key(value: str) -> str:
+    return " ".join(value.casefold().split())
+
+
+class TenderCatalog:
+    """Immutable, indexed view over the tender dataset.
+
+    Built once per load so that lookups by name, URL and organization are
+    dictionary hits instead of scans over every tender.
+    """
+
+    def __init__(self, tenders: list[Tender]) -> None:
+        self.tenders = tenders
+
+        self._by_name: dict[str, Tender] = {}
+        self._by_url: dict[str, Tender] = {}
+        # Normalized organization -> positions of its tenders in the catalog
+        by_org: dict[str, list[int]] = defaultdict(list)
+        for position, tender in enumerate(tenders):
+            # First occurrence wins, matching the previous linear-scan semantics
+            self._by_name.setdefault(tender.metadata.name, tender)
+            self._by_url.setdefault(tender.tender_url, tender)
+            by_org[normalize_key(tender.metadata.organization)].append(position)
+        self._by_org = dict(by_org)
+
+        self._org_keys = list(self._by_org)
+
+        # Tenders with a malformed deadline cannot be range-queried and are left out
+        dated = [t for t in tenders if t.metadata.parsed_deadline is not None]
+        dated.sort(
+            key=lambda t: (t.metadata.deadline_date, t.metadata.submission_deadline)
+        )
+        self._by_deadline = dated
+        self._deadline_keys = [t.metadata.deadline_date for t in dated]
+
+        self._search_index = Bm25Index(
+            [
+                term_frequencies(
+                    [
+                        (t.metadata.name, 1.0),
+                        (t.metadata.organization, ORGANIZATION_FIELD_WEIGHT),
+                    ]
+                )
+                for t in tenders
+            ]
+        )
+
+    def __len__(self) -> int:
+        return len(self.tenders)
+
+    def get_by_name(self, name: str) -> Tender | None:
+        return self._by_name.get(name)
+
+    def get_by_url(self, tender_url: str) -> Tender | None:
+        return self._by_url.get(tender_url)
+
+    def list_by_deadline(
+        self,
+        open_after: date | None,
+        deadline_before: date | None,
+        offset: int,
+        limit: int,
+    ) -> tuple[list[Tender], int]:
+        """Page of tenders with ``open_after <= deadline < deadline_before``, soonest first."""
+        start = (
+            bisect_left(self._deadline_keys, open_after)
+            if open_after is not None
+            else 0
+        )
+        end = (
+            bisect_left(self._deadline_keys, deadline_before)
+            if deadline_before is not None
+            else len(self._deadline_keys)
+        )
+        total = max(end - start, 0)
+        page_start = start + offset
+        page_end = min(page_start + limit, end)
+        return self._by_deadline[page_start:page_end], total
+
+    def diff(self, newer: "TenderCatalog") -> TenderCatalogDiff:
+        old, new = self._by_url, newer._by_url
+        return TenderCatalogDiff(
+            added=[url for url in new if url not in old],
+            removed=[url for url in old if url not in new],
+            changed=[url for url in new if url in old and old[url] != new[url]],
+        )
+
+    def search(self, query: str, limit: int) -> tuple[list[TenderSearchHit], int]:
+        top, total = self._search_index.search(query, limit)
+        hits = [
+            TenderSearchHit(tender=self.tenders[doc_id], score=score)
+            for doc_id, score in top
+        ]
+        return hits, total
+
+    def list_by_organization(self, organization: str) -> list[Tender]:
+        """Tenders whose organization contains ``organization``, in catalog order."""
+        key = normalize_key(organization)
+        # Substring matching runs over distinct organizations only, which is
+        # a much smaller set than all tenders
+        positions = sorted(
+            position
+            for org_key in self._org_keys
+            if key in org_key
+            for position in self._by_org[org_key]
+        )
+        return [self.tenders[position] for position in positions]
+
+
+CatalogListener = Callable[[TenderCatalogDiff], Awaitable[None] | None]
+
+
+def read_tenders_json(path: Path) -> list[Tender]:
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    return [Tender.from_json(t) for t in data["tenders"]]
+
+
+def read_catalog(path: Path) -> TenderCatalog:
+    logger.info("Loading tenders from %s", path)
+    start = time.perf_counter()
+
+    tenders = read_snapshot(path) if settings.tender_snapshot_enabled else None
+    source = "snapshot"
+    if tenders is None:
+        tenders = read_tenders_json(path)
+        source = "JSON"
+    loaded_ms = (time.perf_counter() - start) * 1000
+
+    catalog = TenderCatalog(tenders)
+    logger.info(
+        "Loaded %d tenders from %s in %.1f ms (catalog indexed in %.1f ms)",
+        len(catalog),
+        source,
+        loaded_ms,
+        (time.perf_counter() - start) * 1000 - loaded_ms,
+    )
+    return catalog
+
+
+class TenderCatalogStore:
+    """Process-wide holder of the current :class:`TenderCatalog`.
+
+    Watches the source file by mtime and size; when either changes, the file
+    is re-parsed off the event loop and the new catalog replaces the old one
+    in a single reference assignment, so readers never observe a half-built
+    catalog. Subscribers receive the added/removed/changed diff.
+    """
+
+    def __init__(self, path: Path, poll_interval_seconds: float) -> None:
+        self.path = path
+        self.poll_interval_seconds = poll_interval_seconds
+        self._catalog: TenderCatalog | None = None
+        self._signature: tuple[int, int] | None = None
+        self._listeners: list[CatalogListener] = []
+        self._reload_lock = asyncio.Lock()
+        self._watch_task: asyncio.Task[None] | None = None
+
+    def _stat_signature(self) -> tuple[int, int]:
+        stat = self.path.stat()
+        return stat.st_mtime_ns, stat.st_size
+
+    def _load(self) -> tuple[TenderCatalog, tuple[int, int]]:
+        signature = self._stat_signature()
+        return read_catalog(self.path), signature
+
+    @property
+    def catalog(self) -> TenderCatalog:
+        if self._catalog is None:
+            self._catalog, self._signature = self._load()
+        return self._catalog
+
+    def subscribe(self, listener: CatalogListener) -> None:
+        self._listeners.append(listener)
+
+    async def reload_if_changed(self) -> TenderCatalogDiff | None:
+        async with self._reload_lock:
+            try:
+                signature = self._stat_signature()
+            except OSError:
+                logger.warning("Cannot stat tenders file %s", self.path, exc_info=True)
+                return None
+            if self._catalog is not None and signature == self._signature:
+                return None
+
+            try:
+                new_catalog, signature = await asyncio.to_thread(self._load)
+            except (OSError, ValueError, KeyError, TypeError):
+                # Most likely a partially written file; retry on the next poll
+                logger.exception("Failed to reload tenders from %s", self.path)
+                return None
+
+            old_catalog = self._catalog
+            self._catalog, self._signature = new_catalog, signature
+            if old_catalog is None:
+                return None
+
+            diff = old_catalog.diff(new_catalog)
+            logger.info(
+                "Reloaded tender catalog: %d added, %d removed, %d changed",
+                len(diff.added),
+                len(diff.removed),
+                len(diff.changed),
+            )
+
+        if not diff.is_empty:
+            await self._notify(diff)
+        return diff
+
+    async def _notify(self, diff: TenderCatalogDiff) -> None:
+        for listener in self._listeners:
+            try:
+                result = listener(diff)
+                if inspect.isawaitable(result):
+                    await result
+            except Exception:
+                logger.exception("Tender catalog listener %r failed", listener)
+
+    async def _watch(self) -> None:
+        while True:
+            await asyncio.sleep(self.poll_interval_seconds)
+            await self.reload_if_changed()
+
+    async def start(self) -> None:
+        await self.reload_if_changed()
+        if self.poll_interval_seconds > 0 and self._watch_task is None:
+            logger.info(
+                "Watching %s for changes every %gs",
+                self.path,
+                self.poll_interval_seconds,
+            )
+            self._watch_task = asyncio.create_task(self._watch())
+
+    async def stop(self) -> None:
+        if self._watch_task is None:
+            return
+        self._watch_task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await self._watch_task
+        self._watch_task = None
+
+
+tender_catalog_store = TenderCatalogStore(
+    TENDERS_PATH, settings.tender_catalog_poll_interval_seconds
+)
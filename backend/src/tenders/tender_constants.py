@@ -1,6 +1,58 @@
+from datetime import datetime
+from typing import Any
+
+from pymongo import ASCENDING, IndexModel
+
+EXTRACTED_TEXT_COLLECTION_NAME = "extracted_texts"
+# Single document holding the running size total of the extracted text cache
+EXTRACTED_TEXT_STATS_COLLECTION_NAME = "extracted_text_stats"
+ATTACHMENT_INGESTION_COLLECTION_NAME = "attachment_ingestion"
+CHAT_SESSION_COLLECTION_NAME = "chat_sessions"
+ANSWER_CACHE_COLLECTION_NAME = "answer_cache"
+
+INDEXES = {
+    EXTRACTED_TEXT_COLLECTION_NAME: [
+        IndexModel([("content_hash", ASCENDING)]),
+        # Least recently read entries are evicted first
+        IndexModel([("last_accessed_at", ASCENDING)]),
+    ],
+    ATTACHMENT_INGESTION_COLLECTION_NAME: [IndexModel([("status", ASCENDING)])],
+    CHAT_SESSION_COLLECTION_NAME: [
+        IndexModel([("expires_at", ASCENDING)], expireAfterSeconds=0),
+    ],
+    ANSWER_CACHE_COLLECTION_NAME: [
+        IndexModel([("expires_at", ASCENDING)], expireAfterSeconds=0),
+        IndexModel([("tender_url", ASCENDING), ("profile_hash", ASCENDING)]),
+        IndexModel([("file_urls", ASCENDING)]),
+    ],
+}
+
+# Older turns are dropped from a session's history beyond this count
+MAX_SESSION_TURNS = 10
+# Memoized tool outputs stop growing past this size to stay under Mongo's 16 MB limit
+MAX_SESSION_TOOL_RESULTS_CHARS = 4_000_000
+# Progress of a background ingestion pass is logged every this many attachments
+INGESTION_LOG_EVERY = 100
+
 MAX_FILE_SIZE_BYTES = 20 * 1024 * 1024  # 20 MB
+DOWNLOAD_CHUNK_SIZE = 64 * 1024
+# Attachments larger than this are spooled to a temporary file instead of RAM
+SPOOL_MAX_MEMORY_BYTES = 2 * 1024 * 1024
 MAX_EXTRACTED_TEXT_CHARS = 50_000
+# MongoDB documents are capped at 16 MB; larger texts are extracted but not cached
+MAX_CACHED_TEXT_BYTES = 15 * 1024 * 1024
 SUPPORTED_FILE_EXTENSIONS = frozenset({".pdf", ".docx", ".txt"})
+DOCUMENT_CHUNK_CHARS = 1_500
+DOCUMENT_CHUNK_OVERLAP_CHARS = 200
+DOCUMENT_SEARCH_TOP_K = 5
+# Per-tender chunk indexes kept in memory (least recently used are dropped)
+MAX_INDEXED_TENDERS = 32
+# Indexes missing a file that failed to download or parse are rebuilt after this
+INCOMPLETE_INDEX_TTL_SECONDS = 60
+SEARCH_RESULTS_LIMIT = 20
+MAX_SEARCH_RESULTS_LIMIT = 100
+TENDER_PAGE_SIZE = 20
+MAX_TENDER_PAGE_SIZE = 100
 
 TENDER_AGENT_SYSTEM_PROMPT = """\
 You are an expert assistant for analyzing Polish public procurement tenders.
@@ -21,8 +73,10 @@ When answering:
 
 When the user asks about the contents of tender documents (e.g., contract terms, penalties, \
 requirements, specifications):
-1. First use `get_tender_files` to retrieve the list of file URLs for the tender.
-2. Then use `read_file_content` with the relevant file URL(s) to extract text.
+1. Use `search_tender_documents` with the tender name and a short keyword query (in Polish, \
+as the documents are Polish) to get the most relevant passages from all attached files. \
+Search again with different keywords if the passages do not answer the question.
+2. Use `get_tender_files` and `read_file_content` only when you need a whole, short document.
 3. Base your answer on the actual document text — do not guess or make up content.
 4. Only PDF, DOCX, and TXT files are supported. If a file is in another format, let the user know.
 5. If the extracted text is truncated, mention that not all content could be read.
@@ -42,3 +96,41 @@ Always format your responses using Markdown:
 - Use headings (##, ###) only when the answer has multiple distinct sections.
 - Keep paragraphs short and scannable.
 """
+
+# Query shapes, shared by the services and the index check (src/indexes.py)
+
+
+def extracted_text_by_hash_filter(content_hash: str) -> dict[str, Any]:
+    return {"content_hash": content_hash}
+
+
+# Least recently read entries are evicted first
+EXTRACTED_TEXT_EVICTION_SORT = [("last_accessed_at", ASCENDING)]
+
+
+def finished_ingestions_filter(retry_failed: bool, max_attempts: int) -> dict[str, Any]:
+    """Files a pass skips: done (or evicted since) and, unless retried, given up."""
+    finished: dict[str, Any] = {"status": {"$in": ["done", "evicted"]}}
+    if retry_failed:
+        return finished
+    return {
+        "$or": [
+            finished,
+            {"status": "failed", "attempts": {"$gte": max_attempts}},
+        ]
+    }
+
+
+def similar_answers_filter(
+    tender_url: str, profile_hash: str, now: datetime
+) -> dict[str, Any]:
+    return {
+        "tender_url": tender_url,
+        "profile_hash": profile_hash,
+        "embedding": {"$ne": None},
+        "expires_at": {"$gt": now},
+    }
+
+
+def answers_by_attachment_filter(file_url: str) -> dict[str, Any]:
+    return {"file_urls": file_url}
@@ -0,0 +1,98 @@
+"""Per-question token budget for tool outputs fed back to the tender agent.
+
+The budget is enforced in a ``pre_model_hook``: before every model call, tool
+results produced since the previous call are measured with the local
+tokenizer and, if together they exceed what is left of the budget, each is
+cut to a share proportional to its size. The outcome is stored on the tool
+message itself, so the budget is naturally scoped to one agent run.
+"""
+
+from collections.abc import Callable
+from typing import Any
+
+from langchain_core.messages import BaseMessage, ToolMessage
+
+from src.llm.tokenizer import count_tokens, truncate_to_tokens
+
+CONTEXT_BUDGET_METADATA_KEY = "context_budget"
+
+_TRUNCATION_NOTE = (
+    "\n\n[... truncated to fit the context budget for this question; "
+    "search for more specific passages if needed ...]"
+)
+
+
+def allocate_proportionally(requested: list[int], available: int) -> list[int]:
+    """Split ``available`` tokens between requests in proportion to their size."""
+    total = sum(requested)
+    if total <= available:
+        return list(requested)
+    return [available * tokens // total for tokens in requested]
+
+
+def _budget_info(message: BaseMessage) -> dict[str, int] | None:
+    return message.response_metadata.get(CONTEXT_BUDGET_METADATA_KEY)
+
+
+def build_context_budget_hook(
+    budget_tokens: int,
+) -> Callable[[dict[str, Any]], dict[str, Any]]:
+    def apply_context_budget(state: dict[str, Any]) -> dict[str, Any]:
+        used = 0
+        fresh: list[ToolMessage] = []
+        for message in state["messages"]:
+            if not isinstance(message, ToolMessage):
+                continue
+            info = _budget_info(message)
+            if info is not None:
+                used += info["kept_tokens"]
+            elif isinstance(message.content, str):
+                fresh.append(message)
+        if not fresh:
+            return {}
+
+        requested = [count_tokens(message.content) for message in fresh]  # type: ignore[arg-type]
+        granted = allocate_proportionally(requested, max(budget_tokens - used, 0))
+
+        updated: list[ToolMessage] = []
+        for message, original, kept in zip(fresh, requested, granted):
+            content: str = message.content  # type: ignore[assignment]
+            if kept < original:
+                content = truncate_to_tokens(content, kept) + _TRUNCATION_NOTE
+            updated.append(
+                message.model_copy(
+                    update={
+                        "content": content,
+                        "response_metadata": {
+                            **message.response_metadata,
+                            CONTEXT_BUDGET_METADATA_KEY: {
+                                "original_tokens": original,
+                                "kept_tokens": kept,
+                            },
+                        },
+                    }
+                )
+            )
+        return {"messages": updated}
+
+    return apply_context_budget
+
+
+def summarize_context_budget(
+    messages: list[BaseMessage], budget_tokens: int
+) -> dict[str, int]:
+    original = kept = truncated = 0
+    for message in messages:
+        info = _budget_info(message) if isinstance(message, ToolMessage) else None
+        if info is None:
+            continue
+        original += info["original_tokens"]
+        kept += info["kept_tokens"]
+        truncated += info["kept_tokens"] < info["original_tokens"]
+    return {
+        "budget_tokens": budget_tokens,
+        "tool_output_tokens": original,
+        "kept_tokens": kept,
+        "saved_tokens": original - kept,
+        "truncated_outputs": truncated,
+    }
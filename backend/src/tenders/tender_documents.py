@@ -0,0 +1,220 @@
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+
+from src.tenders.tender_attachments import AttachmentReader, get_file_extension
+from src.tenders.tender_constants import (
+    DOCUMENT_CHUNK_CHARS,
+    DOCUMENT_CHUNK_OVERLAP_CHARS,
+    INCOMPLETE_INDEX_TTL_SECONDS,
+    SUPPORTED_FILE_EXTENSIONS,
+)
+from src.tenders.tender_exceptions import AttachmentReadError
+from src.tenders.tender_schemas import (
+    DocumentChunk,
+    DocumentChunkHit,
+    Tender,
+    TenderCatalogDiff,
+)
+from src.tenders.tender_search import Bm25Index, term_frequencies
+
+logger = logging.getLogger(__name__)
+
+
+def chunk_text(text: str, chunk_chars: int, overlap_chars: int) -> list[str]:
+    """Split ``text`` into windows of at most ``chunk_chars`` overlapping by ``overlap_chars``.
+
+    Windows end on a paragraph, line or word boundary when one exists in
+    their second half, so chunks rarely cut a sentence mid-word.
+    """
+    chunks: list[str] = []
+    start = 0
+    length = len(text)
+    while start < length:
+        end = min(start + chunk_chars, length)
+        if end < length:
+            floor = start + chunk_chars // 2
+            for separator in ("\n\n", "\n", " "):
+                cut = text.rfind(separator, floor, end)
+                if cut != -1:
+                    end = cut
+                    break
+
+        chunk = text[start:end].strip()
+        if chunk:
+            chunks.append(chunk)
+        if end >= length:
+            break
+
+        next_start = max(end - overlap_chars, start + 1)
+        boundaries = [
+            i
+            for i in (text.find(sep, next_start, end) for sep in (" ", "\n"))
+            if i != -1
+        ]
+        start = min(boundaries) + 1 if boundaries else next_start
+    return chunks
+
+
+class TenderDocumentIndex:
+    """BM25 index over the chunked text of all readable attachments of one tender."""
+
+    def __init__(self, chunks: list[DocumentChunk], unreadable: dict[str, str]) -> None:
+        self.chunks = chunks
+        self.unreadable = unreadable
+        # False when a download or extraction failed; such indexes expire early
+        self.complete = True
+        self.built_at = time.monotonic()
+        self.chunks_per_file: dict[str, int] = {}
+        for chunk in chunks:
+            self.chunks_per_file[chunk.file_url] = (
+                self.chunks_per_file.get(chunk.file_url, 0) + 1
+            )
+        self._index = Bm25Index([term_frequencies([(c.text, 1.0)]) for c in chunks])
+
+    @classmethod
+    def build(
+        cls, texts: dict[str, str], unreadable: dict[str, str]
+    ) -> "TenderDocumentIndex":
+        chunks = [
+            DocumentChunk(file_url=file_url, position=position, text=chunk)
+            for file_url, text in texts.items()
+            for position, chunk in enumerate(
+                chunk_text(text, DOCUMENT_CHUNK_CHARS, DOCUMENT_CHUNK_OVERLAP_CHARS)
+            )
+        ]
+        return cls(chunks, unreadable)
+
+    @property
+    def expired(self) -> bool:
+        return (
+            not self.complete
+            and time.monotonic() - self.built_at > INCOMPLETE_INDEX_TTL_SECONDS
+        )
+
+    def search(self, query: str, limit: int) -> tuple[list[DocumentChunkHit], int]:
+        top, total = self._index.search(query, limit)
+        hits = [
+            DocumentChunkHit(chunk=self.chunks[doc_id], score=score)
+            for doc_id, score in top
+        ]
+        return hits, total
+
+
+class TenderDocumentRetriever:
+    """Builds and keeps per-tender chunk indexes for document search.
+
+    Attachment text comes from :class:`AttachmentReader` (and therefore from
+    the extracted text cache when available). Indexes are held in a small LRU
+    keyed by tender URL and dropped when the catalog reports the tender as
+    changed or removed, or when one of its attachments turns out to have new
+    content; a build already running for such a tender still answers its
+    callers but is not kept. An index missing a file that failed to read is
+    kept for ``INCOMPLETE_INDEX_TTL_SECONDS`` only, so the failure is retried
+    without every question re-downloading the tender's attachments.
+    """
+
+    def __init__(
+        self, attachment_reader: AttachmentReader, max_indexed_tenders: int
+    ) -> None:
+        self.attachment_reader = attachment_reader
+        self.max_indexed_tenders = max_indexed_tenders
+        self._indexes: OrderedDict[str, TenderDocumentIndex] = OrderedDict()
+        # Tender URL -> the tender and its index build in progress
+        self._building: dict[str, tuple[Tender, asyncio.Task[TenderDocumentIndex]]] = {}
+
+    async def _read(self, file_url: str) -> str | AttachmentReadError:
+        try:
+            return await self.attachment_reader.read_text(file_url)
+        except AttachmentReadError as exc:
+            return exc
+
+    async def _build(self, tender: Tender) -> TenderDocumentIndex:
+        unreadable: dict[str, str] = {}
+        urls: list[str] = []
+        for file_url in dict.fromkeys(tender.file_urls):
+            extension = get_file_extension(file_url)
+            if extension in SUPPORTED_FILE_EXTENSIONS:
+                urls.append(file_url)
+            else:
+                unreadable[file_url] = f"unsupported format '{extension}'"
+
+        texts: dict[str, str] = {}
+        complete = True
+        results = await asyncio.gather(*(self._read(url) for url in urls))
+        for file_url, result in zip(urls, results):
+            if isinstance(result, AttachmentReadError):
+                unreadable[file_url] = str(result)
+                complete = False
+            elif result.strip():
+                texts[file_url] = result
+            else:
+                unreadable[file_url] = "no extractable text"
+
+        index = await asyncio.to_thread(TenderDocumentIndex.build, texts, unreadable)
+        index.complete = complete
+        logger.info(
+            "Indexed %d chunk(s) from %d document(s) of tender %s",
+            len(index.chunks),
+            len(texts),
+            tender.tender_url,
+        )
+        return index
+
+    async def _build_and_keep(self, tender: Tender) -> TenderDocumentIndex:
+        key = tender.tender_url
+        task = asyncio.current_task()
+        try:
+            index = await self._build(tender)
+        finally:
+            entry = self._building.get(key)
+            # Popped by an invalidation while building: the index may be stale
+            current = entry is not None and entry[1] is task
+            if current:
+                del self._building[key]
+
+        if current:
+            self._indexes[key] = index
+            self._indexes.move_to_end(key)
+            while len(self._indexes) > self.max_indexed_tenders:
+                self._indexes.popitem(last=False)
+        return index
+
+    async def index_for(self, tender: Tender) -> TenderDocumentIndex:
+        key = tender.tender_url
+        index = self._indexes.get(key)
+        if index is not None and not index.expired:
+            self._indexes.move_to_end(key)
+            return index
+
+        # Concurrent questions about the same tender share a single build
+        entry = self._building.get(key)
+        if entry is None:
+            entry = (tender, asyncio.create_task(self._build_and_keep(tender)))
+            self._building[key] = entry
+        return await asyncio.shield(entry[1])
+
+    def _drop(self, tender_urls: list[str]) -> None:
+        for tender_url in tender_urls:
+            self._indexes.pop(tender_url, None)
+            self._building.pop(tender_url, None)
+
+    def invalidate(self, diff: TenderCatalogDiff) -> None:
+        self._drop([*diff.removed, *diff.changed])
+
+    async def invalidate_attachment(self, file_url: str) -> None:
+        self._drop(
+            [
+                *(
+                    key
+                    for key, index in self._indexes.items()
+                    if file_url in index.chunks_per_file or file_url in index.unreadable
+                ),
+                *(
+                    key
+                    for key, (tender, _) in self._building.items()
+                    if file_url in tender.file_urls
+                ),
+            ]
+        )
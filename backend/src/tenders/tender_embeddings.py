@@ -0,0 +1,155 @@
+"""Precomputed tender embeddings stored as a memory-mapped NumPy matrix.
+
+``python -m src.cli build-embeddings`` embeds every tender's name and
+organization with the configured local model and writes two files next to
+``tenders.json``:
+
+- ``tenders.embeddings.npy``  - float32 matrix, one unit-length row per tender
+- ``tenders.embeddings.json`` - model name, source hash and the tender URL of
+  each row
+
+At runtime the matrix is opened with ``mmap_mode="r"``, so it is paged in on
+demand and shared between processes, and ranking every tender against a
+query is a single matrix-vector product. ``numpy`` (like ``fastembed``) is
+optional; without it the index is unavailable.
+"""
+
+import json
+import logging
+import os
+from pathlib import Path
+from typing import Any
+
+from src.llm.embeddings import LocalEmbedder
+from src.tenders.tender_schemas import Tender
+from src.tenders.tender_snapshot import source_digest
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+logger = logging.getLogger(__name__)
+
+_DTYPE = "float32"
+
+
+def embeddings_paths(tenders_path: Path) -> tuple[Path, Path]:
+    return (
+        tenders_path.with_suffix(".embeddings.npy"),
+        tenders_path.with_suffix(".embeddings.json"),
+    )
+
+
+def embedding_text(tender: Tender) -> str:
+    return f"{tender.metadata.name}\n{tender.metadata.organization}"
+
+
+def write_tender_embeddings(
+    tenders: list[Tender],
+    embedder: LocalEmbedder,
+    tenders_path: Path,
+    batch_size: int,
+) -> Path:
+    if np is None:
+        raise RuntimeError("numpy is required to build tender embeddings")
+
+    unique: dict[str, Tender] = {}
+    for tender in tenders:
+        unique.setdefault(tender.tender_url, tender)
+    rows = list(unique.values())
+    if not rows:
+        raise ValueError("No tenders to embed")
+
+    matrix_path, ids_path = embeddings_paths(tenders_path)
+    tmp_path = matrix_path.with_suffix(".tmp.npy")
+    matrix: Any = None
+    for start in range(0, len(rows), batch_size):
+        batch = rows[start : start + batch_size]
+        vectors = embedder.embed_sync([embedding_text(t) for t in batch])
+        if matrix is None:
+            # Written straight to disk, so the full matrix is never held in memory
+            matrix = np.lib.format.open_memmap(
+                tmp_path, mode="w+", dtype=_DTYPE, shape=(len(rows), len(vectors[0]))
+            )
+        matrix[start : start + len(batch)] = vectors
+        logger.info("Embedded %d/%d tenders", start + len(batch), len(rows))
+    matrix.flush()
+    dimensions = matrix.shape[1]
+    del matrix
+    os.replace(tmp_path, matrix_path)
+
+    with open(ids_path, "w", encoding="utf-8") as f:
+        json.dump(
+            {
+                "model": embedder.model_name,
+                "source_hash": source_digest(tenders_path).hex(),
+                "dimensions": dimensions,
+                "tender_urls": [t.tender_url for t in rows],
+            },
+            f,
+            ensure_ascii=False,
+        )
+    logger.info(
+        "Wrote %d x %d tender embeddings to %s", len(rows), dimensions, matrix_path
+    )
+    return matrix_path
+
+
+class TenderEmbeddingIndex:
+    def __init__(self, matrix: Any, tender_urls: list[str], model_name: str) -> None:
+        self._matrix = matrix
+        self.tender_urls = tender_urls
+        self.model_name = model_name
+
+    def __len__(self) -> int:
+        return len(self.tender_urls)
+
+    @classmethod
+    def load(cls, tenders_path: Path, model_name: str) -> "TenderEmbeddingIndex | None":
+        matrix_path, ids_path = embeddings_paths(tenders_path)
+        if np is None:
+            logger.warning("numpy is not installed; tender embeddings are disabled")
+            return None
+        if not matrix_path.exists() or not ids_path.exists():
+            logger.warning(
+                "No tender embeddings at %s; run: python -m src.cli build-embeddings",
+                matrix_path,
+            )
+            return None
+
+        with open(ids_path, encoding="utf-8") as f:
+            meta = json.load(f)
+        if meta["model"] != model_name:
+            logger.warning(
+                "Tender embeddings were built with %s, not %s; rebuild them",
+                meta["model"],
+                model_name,
+            )
+            return None
+        if meta["source_hash"] != source_digest(tenders_path).hex():
+            # Still usable: rows of removed tenders are skipped by callers and
+            # new tenders are missing until the next build
+            logger.warning("Tender embeddings are older than %s", tenders_path)
+
+        matrix = np.load(matrix_path, mmap_mode="r")
+        if matrix.shape[0] != len(meta["tender_urls"]):
+            logger.warning("Tender embeddings at %s are inconsistent", matrix_path)
+            return None
+        logger.info(
+            "Loaded %d x %d tender embeddings (%s)",
+            matrix.shape[0],
+            matrix.shape[1],
+            model_name,
+        )
+        return cls(matrix, meta["tender_urls"], model_name)
+
+    def top_k(self, query: list[float], k: int) -> list[tuple[str, float]]:
+        """``(tender_url, cosine similarity)`` of the ``k`` closest tenders."""
+        scores = self._matrix @ np.asarray(query, dtype=_DTYPE)
+        k = min(k, len(scores))
+        if k <= 0:
+            return []
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        return [(self.tender_urls[i], float(scores[i])) for i in top]
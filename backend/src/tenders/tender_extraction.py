@@ -0,0 +1,219 @@
+"""Text extraction from PDF/DOCX/TXT attachments.
+
+pypdf is pure Python and CPU-bound, so running it on threads serializes
+concurrent requests on the GIL. :class:`DocumentExtractionEngine` runs the
+extractors in a process pool instead and splits large PDFs into page ranges
+that are extracted in parallel. This module is imported by pool workers, so it
+must stay free of heavy imports such as LangChain.
+"""
+
+import asyncio
+import io
+import logging
+from collections.abc import Callable
+from concurrent.futures import Executor, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+from typing import BinaryIO, Literal, TypeVar
+
+from src.config import settings
+
+logger = logging.getLogger(__name__)
+
+ExtractionSource = bytes | Path
+ExtractionMode = Literal["process", "thread"]
+
+_T = TypeVar("_T")
+
+
+def _as_stream(source: ExtractionSource) -> BinaryIO | str:
+    return io.BytesIO(source) if isinstance(source, bytes) else str(source)
+
+
+def _pdf_page_count(source: ExtractionSource) -> int:
+    from pypdf import PdfReader
+
+    return len(PdfReader(_as_stream(source)).pages)
+
+
+def _extract_pdf_pages(source: ExtractionSource, start: int, stop: int) -> str:
+    from pypdf import PdfReader
+
+    reader = PdfReader(_as_stream(source))
+    pages: list[str] = []
+    for page in reader.pages[start:stop]:
+        text = page.extract_text()
+        if text:
+            pages.append(text)
+    return "\n\n".join(pages)
+
+
+def _extract_text_from_pdf(source: ExtractionSource) -> str:
+    return _extract_pdf_pages(source, 0, _pdf_page_count(source))
+
+
+def _extract_text_from_docx(source: ExtractionSource) -> str:
+    from docx import Document
+
+    doc = Document(_as_stream(source))
+    paragraphs = [p.text for p in doc.paragraphs if p.text.strip()]
+    return "\n\n".join(paragraphs)
+
+
+def _extract_text_from_txt(source: ExtractionSource) -> str:
+    content = source if isinstance(source, bytes) else source.read_bytes()
+    for encoding in ("utf-8", "cp1250", "latin-1"):
+        try:
+            return content.decode(encoding)
+        except (UnicodeDecodeError, ValueError):
+            continue
+    return content.decode("utf-8", errors="replace")
+
+
+def extract_text(source: ExtractionSource, extension: str) -> str:
+    if extension == ".pdf":
+        return _extract_text_from_pdf(source)
+    if extension == ".docx":
+        return _extract_text_from_docx(source)
+    if extension == ".txt":
+        return _extract_text_from_txt(source)
+    return f"Unsupported file format: {extension}"
+
+
+class DocumentExtractionEngine:
+    """Runs text extraction off the event loop.
+
+    In ``"process"`` mode, work goes to a lazily created process pool whose
+    workers are replaced after ``max_tasks_per_child`` tasks. A task exceeding
+    ``timeout_seconds`` (or a crashed worker) tears the pool down so that a
+    hung parser cannot hold a worker forever. That also fails the other tasks
+    in flight on the pool; each of them is retried once in a dedicated
+    single-worker pool, so only the task that hung or crashed (when it does
+    so again) fails. ``"thread"`` mode keeps the old ``asyncio.to_thread``
+    behaviour.
+    """
+
+    def __init__(
+        self,
+        mode: ExtractionMode,
+        max_workers: int,
+        max_tasks_per_child: int,
+        timeout_seconds: float,
+        pdf_pages_per_task: int,
+    ) -> None:
+        self.mode = mode
+        self.max_workers = max_workers
+        self.max_tasks_per_child = max_tasks_per_child
+        self.timeout_seconds = timeout_seconds
+        self.pdf_pages_per_task = pdf_pages_per_task
+        self._pool: ProcessPoolExecutor | None = None
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            logger.info(
+                "Starting extraction process pool (%d workers, recycled every %d tasks)",
+                self.max_workers,
+                self.max_tasks_per_child,
+            )
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                max_tasks_per_child=self.max_tasks_per_child,
+            )
+        return self._pool
+
+    def _discard_pool(self, pool: Executor) -> None:
+        if self._pool is pool:
+            self._pool = None
+        # ProcessPoolExecutor cannot cancel running tasks; terminate the workers
+        # so a stuck parser does not keep burning a CPU. There is no public
+        # access to the workers, and _processes is None once the pool shut down.
+        processes = getattr(pool, "_processes", None) or {}
+        for process in list(processes.values()):
+            process.terminate()
+        pool.shutdown(wait=False, cancel_futures=True)
+
+    def _timeout_error(self) -> TimeoutError:
+        return TimeoutError(
+            f"text extraction took longer than {self.timeout_seconds:.0f}s"
+        )
+
+    async def _run_isolated(self, func: Callable[..., _T], *args: object) -> _T:
+        # A throwaway single worker: if the task hangs or crashes again, it
+        # takes nothing else down with it
+        pool = ProcessPoolExecutor(max_workers=1)
+        try:
+            return await asyncio.wait_for(
+                asyncio.wrap_future(pool.submit(func, *args)), self.timeout_seconds
+            )
+        except asyncio.TimeoutError:
+            raise self._timeout_error() from None
+        finally:
+            self._discard_pool(pool)
+
+    async def _run(self, func: Callable[..., _T], *args: object) -> _T:
+        if self.mode == "thread":
+            return await asyncio.wait_for(
+                asyncio.to_thread(func, *args), self.timeout_seconds
+            )
+
+        pool = self._get_pool()
+        future = pool.submit(func, *args)
+        try:
+            return await asyncio.wait_for(
+                asyncio.wrap_future(future), self.timeout_seconds
+            )
+        except asyncio.TimeoutError:
+            logger.warning(
+                "Extraction task %s timed out after %.0fs; recycling process pool",
+                func.__name__,
+                self.timeout_seconds,
+            )
+            self._discard_pool(pool)
+            raise self._timeout_error() from None
+        except BrokenProcessPool:
+            if self._pool is pool:
+                logger.warning("Extraction worker crashed; recycling process pool")
+                self._discard_pool(pool)
+        except asyncio.CancelledError:
+            task = asyncio.current_task()
+            # Queued work is cancelled when its pool is recycled; only a
+            # cancellation of the caller itself propagates
+            if not future.cancelled() or (task is not None and task.cancelling()):
+                raise
+
+        # The pool was torn down under this task, by its own crash or by
+        # another task's; which one is unknown, so it gets one retry alone
+        logger.info("Retrying extraction task %s in a dedicated worker", func.__name__)
+        return await self._run_isolated(func, *args)
+
+    async def extract(self, source: ExtractionSource, extension: str) -> str:
+        # Only large PDFs (spooled to disk) are worth a page-count round trip;
+        # workers then open the file by path instead of receiving its bytes.
+        if self.mode == "process" and extension == ".pdf" and isinstance(source, Path):
+            page_count = await self._run(_pdf_page_count, source)
+            if page_count > self.pdf_pages_per_task:
+                step = self.pdf_pages_per_task
+                parts = await asyncio.gather(
+                    *(
+                        self._run(_extract_pdf_pages, source, start, start + step)
+                        for start in range(0, page_count, step)
+                    )
+                )
+                return "\n\n".join(part for part in parts if part)
+
+        return await self._run(extract_text, source, extension)
+
+    @classmethod
+    def from_settings(cls) -> "DocumentExtractionEngine":
+        return cls(
+            mode=settings.extraction_mode,
+            max_workers=settings.extraction_workers,
+            max_tasks_per_child=settings.extraction_max_tasks_per_child,
+            timeout_seconds=settings.extraction_timeout_seconds,
+            pdf_pages_per_task=settings.extraction_pdf_pages_per_task,
+        )
+
+    def shutdown(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=True, cancel_futures=True)
+            self._pool = None
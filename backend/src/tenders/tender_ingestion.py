@@ -0,0 +1,235 @@
+import asyncio
+import contextlib
+import logging
+import time
+from collections.abc import Iterable
+from datetime import datetime, timezone
+
+from motor.motor_asyncio import AsyncIOMotorDatabase
+
+from src.config import settings
+from src.tenders.tender_attachments import AttachmentReader, get_file_extension
+from src.tenders.tender_catalog import TenderCatalogStore
+from src.tenders.tender_constants import (
+    ATTACHMENT_INGESTION_COLLECTION_NAME,
+    INGESTION_LOG_EVERY,
+    SUPPORTED_FILE_EXTENSIONS,
+    finished_ingestions_filter,
+)
+from src.tenders.tender_exceptions import AttachmentReadError
+from src.tenders.tender_schemas import (
+    AttachmentIngestionReport,
+    Tender,
+    TenderCatalogDiff,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class AttachmentIngestionPipeline:
+    """Pre-extracts the text of every supported tender attachment.
+
+    Files are read through :class:`AttachmentReader`, so the text lands in the
+    extracted text cache exactly as if the chat agent had asked for it. The
+    outcome for each file URL is recorded in MongoDB: an interrupted pass
+    resumes where it stopped, and files that keep failing are skipped after
+    ``max_attempts`` unless explicitly retried. Files of added or changed
+    tenders are ingested afresh on catalog reload. A file whose text is
+    evicted from the cache is marked ``evicted`` and not ingested again: once
+    the catalog outgrows the cache, re-ingesting would only evict other
+    files, so it is re-extracted lazily when it is next read.
+    """
+
+    def __init__(
+        self,
+        db: AsyncIOMotorDatabase,
+        attachment_reader: AttachmentReader,
+        concurrency: int,
+        max_attempts: int,
+    ) -> None:
+        self.collection = db[ATTACHMENT_INGESTION_COLLECTION_NAME]
+        self.attachment_reader = attachment_reader
+        self.concurrency = max(concurrency, 1)
+        self.max_attempts = max_attempts
+        self._run_lock = asyncio.Lock()
+        self._tasks: set[asyncio.Task[AttachmentIngestionReport]] = set()
+
+    async def _finished_urls(self, retry_failed: bool) -> set[str]:
+        cursor = self.collection.find(
+            finished_ingestions_filter(retry_failed, self.max_attempts), {"_id": 1}
+        )
+        return {doc["_id"] async for doc in cursor}
+
+    async def _pending(
+        self, tenders: Iterable[Tender], retry_failed: bool
+    ) -> tuple[list[tuple[str, str]], int]:
+        """``(file_url, tender_url)`` pairs still to ingest, and the total count."""
+        seen: dict[str, str] = {}
+        for tender in tenders:
+            for file_url in tender.file_urls:
+                if get_file_extension(file_url) in SUPPORTED_FILE_EXTENSIONS:
+                    seen.setdefault(file_url, tender.tender_url)
+
+        finished = await self._finished_urls(retry_failed)
+        pending = [(url, tender) for url, tender in seen.items() if url not in finished]
+        return pending, len(seen)
+
+    async def _forget(self, file_urls: list[str]) -> None:
+        """Drop the recorded outcome (and attempts) of ``file_urls``."""
+        if file_urls:
+            await self.collection.delete_many({"_id": {"$in": file_urls}})
+
+    async def _mark_evicted(self, file_urls: list[str]) -> None:
+        await self.collection.update_many(
+            {"_id": {"$in": file_urls}, "status": "done"},
+            {"$set": {"status": "evicted", "updated_at": datetime.now(timezone.utc)}},
+        )
+
+    async def _ingest_one(self, file_url: str, tender_url: str) -> bool:
+        try:
+            await self.attachment_reader.read_text(file_url)
+        except AttachmentReadError as exc:
+            error = str(exc)
+        except Exception as exc:
+            logger.exception("Unexpected error while ingesting %s", file_url)
+            error = f"{type(exc).__name__}: {exc}"
+        else:
+            error = None
+
+        update: dict[str, object] = {
+            "$set": {
+                "tender_url": tender_url,
+                "status": "done" if error is None else "failed",
+                "error": error,
+                "updated_at": datetime.now(timezone.utc),
+            }
+        }
+        if error is not None:
+            update["$inc"] = {"attempts": 1}
+            logger.warning("Failed to ingest %s: %s", file_url, error)
+        await self.collection.update_one({"_id": file_url}, update, upsert=True)
+        return error is None
+
+    async def run(
+        self,
+        tenders: Iterable[Tender],
+        retry_failed: bool = False,
+        refresh: bool = False,
+    ) -> AttachmentIngestionReport:
+        """Ingest the attachments of ``tenders``.
+
+        ``refresh`` forgets earlier outcomes for these tenders' files first, so
+        done and given-up files are read again; unchanged ones are then only
+        revalidated against the text cache.
+        """
+        async with self._run_lock:
+            if refresh:
+                tenders = list(tenders)
+                await self._forget(
+                    [url for tender in tenders for url in tender.file_urls]
+                )
+            return await self._run(tenders, retry_failed)
+
+    async def _run(
+        self, tenders: Iterable[Tender], retry_failed: bool
+    ) -> AttachmentIngestionReport:
+        start = time.perf_counter()
+        pending, total = await self._pending(tenders, retry_failed)
+        report = AttachmentIngestionReport(total=total, skipped=total - len(pending))
+        logger.info(
+            "Ingesting %d attachment(s) (%d already done or given up), concurrency %d",
+            len(pending),
+            report.skipped,
+            self.concurrency,
+        )
+
+        queue: asyncio.Queue[tuple[str, str]] = asyncio.Queue()
+        for item in pending:
+            queue.put_nowait(item)
+
+        async def worker() -> None:
+            while True:
+                try:
+                    file_url, tender_url = queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    return
+                if await self._ingest_one(file_url, tender_url):
+                    report.succeeded += 1
+                else:
+                    report.failed += 1
+                if report.processed % INGESTION_LOG_EVERY == 0:
+                    logger.info(
+                        "Ingested %d/%d attachment(s) (%d failed)",
+                        report.processed,
+                        len(pending),
+                        report.failed,
+                    )
+
+        await asyncio.gather(*(worker() for _ in range(self.concurrency)))
+
+        report.elapsed_seconds = time.perf_counter() - start
+        logger.info(
+            "Attachment ingestion finished in %.1fs: %d succeeded, %d failed, %d skipped",
+            report.elapsed_seconds,
+            report.succeeded,
+            report.failed,
+            report.skipped,
+        )
+        return report
+
+    def _spawn(self, tenders: list[Tender], refresh: bool = False) -> None:
+        task = asyncio.create_task(self.run(tenders, refresh=refresh))
+        self._tasks.add(task)
+        task.add_done_callback(self._on_task_done)
+
+    def _on_task_done(self, task: asyncio.Task[AttachmentIngestionReport]) -> None:
+        self._tasks.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            logger.error(
+                "Background attachment ingestion failed", exc_info=task.exception()
+            )
+
+    def _on_catalog_change(
+        self, catalog_store: TenderCatalogStore, diff: TenderCatalogDiff
+    ) -> None:
+        catalog = catalog_store.catalog
+        tenders = [
+            tender
+            for url in (*diff.added, *diff.changed)
+            if (tender := catalog.get_by_url(url)) is not None
+        ]
+        if tenders:
+            # A changed tender may list new or replaced files under old URLs
+            self._spawn(tenders, refresh=True)
+
+    async def start(self, catalog_store: TenderCatalogStore) -> None:
+        """Ingest the whole catalog in the background, then follow its changes."""
+        if not self.attachment_reader.text_cache.enabled:
+            logger.warning(
+                "Extracted text cache is disabled; skipping attachment ingestion"
+            )
+            return
+        catalog_store.subscribe(
+            lambda diff: self._on_catalog_change(catalog_store, diff)
+        )
+        self.attachment_reader.text_cache.subscribe_evictions(self._mark_evicted)
+        self._spawn(list(catalog_store.catalog.tenders))
+
+    async def stop(self) -> None:
+        for task in list(self._tasks):
+            task.cancel()
+        for task in list(self._tasks):
+            with contextlib.suppress(asyncio.CancelledError, Exception):
+                await task
+        self._tasks.clear()
+
+    @classmethod
+    def from_settings(
+        cls, db: AsyncIOMotorDatabase, attachment_reader: AttachmentReader
+    ) -> "AttachmentIngestionPipeline":
+        return cls(
+            db=db,
+            attachment_reader=attachment_reader,
+            concurrency=settings.attachment_ingestion_concurrency,
+            max_attempts=settings.attachment_ingestion_max_attempts,
+        )
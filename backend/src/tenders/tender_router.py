@@ -1,12 +1,23 @@
 import logging
+from datetime import date
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
 
+from src.tenders.tender_constants import (
+    MAX_SEARCH_RESULTS_LIMIT,
+    MAX_TENDER_PAGE_SIZE,
+    SEARCH_RESULTS_LIMIT,
+    TENDER_PAGE_SIZE,
+)
 from src.tenders.tender_dependencies import get_tender_service
 from src.tenders.tender_schemas import (
+    AnswerCacheMetricsResponse,
+    TenderListResponse,
     TenderQuestionRequest,
     TenderQuestionResponse,
     TenderResponse,
+    TenderSearchResponse,
 )
 from src.tenders.tender_service import TenderService
 
@@ -15,6 +26,85 @@ logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/tenders", tags=["tenders"])
 
 
+@router.get(
+    "",
+    response_model=TenderListResponse,
+    description="List tenders by submission deadline, soonest first. "
+    "By default only tenders still open on the reference date "
+    "(TENDER_DEADLINE_DATE env var, or today) are returned.",
+)
+async def list_tenders(
+    open_after: date | None = Query(
+        default=None,
+        description="Only tenders with a deadline on or after this date "
+        "(defaults to the reference date)",
+    ),
+    deadline_before: date | None = Query(
+        default=None,
+        description="Only tenders with a deadline strictly before this date",
+    ),
+    offset: int = Query(default=0, ge=0),
+    limit: int = Query(default=TENDER_PAGE_SIZE, ge=1, le=MAX_TENDER_PAGE_SIZE),
+    service: TenderService = Depends(get_tender_service),
+) -> TenderListResponse:
+    open_after = open_after or service.reference_date()
+    logger.info(
+        "GET tenders open_after=%s, deadline_before=%s (offset=%d, limit=%d)",
+        open_after,
+        deadline_before,
+        offset,
+        limit,
+    )
+    tenders, total = service.list_by_deadline(
+        open_after, deadline_before, offset, limit
+    )
+    logger.info("Returning %d of %d tender(s)", len(tenders), total)
+    return TenderListResponse(
+        total=total,
+        offset=offset,
+        limit=limit,
+        tenders=[tender.to_response() for tender in tenders],
+    )
+
+
+@router.get(
+    "/search",
+    response_model=TenderSearchResponse,
+    description="Full-text search over tender names and organizations. "
+    "Matching ignores Polish diacritics and word endings; results are ranked by BM25.",
+)
+async def search_tenders(
+    q: str = Query(min_length=1, description="Search query"),
+    limit: int = Query(
+        default=SEARCH_RESULTS_LIMIT,
+        ge=1,
+        le=MAX_SEARCH_RESULTS_LIMIT,
+        description="Maximum number of results",
+    ),
+    service: TenderService = Depends(get_tender_service),
+) -> TenderSearchResponse:
+    logger.info("GET tender search: '%s' (limit=%d)", q, limit)
+    hits, total = service.search(q, limit)
+    logger.info("Returning %d of %d tender(s) matching '%s'", len(hits), total, q)
+    return TenderSearchResponse(
+        query=q,
+        total=total,
+        results=[hit.to_response() for hit in hits],
+    )
+
+
+@router.get(
+    "/answer-cache/metrics",
+    response_model=AnswerCacheMetricsResponse,
+    description="Hit/miss counters of the tender question answer cache "
+    "since the process started.",
+)
+async def get_answer_cache_metrics(
+    service: TenderService = Depends(get_tender_service),
+) -> AnswerCacheMetricsResponse:
+    return service.answer_cache_metrics().to_response()
+
+
 @router.get(
     "/{tender_name}",
     response_model=TenderResponse,
@@ -47,7 +137,8 @@ async def get_tender(
     response_model=TenderQuestionResponse,
     description="Ask a question about a specific tender. "
     "A LangChain agent analyzes tender details (name, organization, dates, files) "
-    "and generates an answer.",
+    "and generates an answer. Pass the returned `session_id` with follow-up questions "
+    "to continue the conversation and reuse documents already read.",
     responses={
         status.HTTP_404_NOT_FOUND: {"description": "Tender not found"},
     },
@@ -63,8 +154,8 @@ async def ask_tender_question(
         body.question,
     )
     try:
-        answer = await service.ask_question(
-            body.tender_name, body.question, body.company_name
+        answer, session_id = await service.ask_question(
+            body.tender_name, body.question, body.company_name, body.session_id
         )
     except ValueError as exc:
         logger.warning(
@@ -86,4 +177,49 @@ async def ask_tender_question(
         tender_name=body.tender_name,
         question=body.question,
         answer=answer,
+        session_id=session_id,
+    )
+
+
+@router.post(
+    "/ask/stream",
+    description="Streaming variant of `/ask`. Returns Server-Sent Events: "
+    "`tool_start`/`tool_end` while the agent looks up data and reads documents, "
+    "`token` for each piece of the answer as it is generated, and a final `answer` "
+    "(or `error`) event with the complete text and the `session_id`.",
+    response_class=StreamingResponse,
+    responses={
+        status.HTTP_200_OK: {"content": {"text/event-stream": {}}},
+        status.HTTP_404_NOT_FOUND: {"description": "Tender not found"},
+    },
+)
+async def ask_tender_question_stream(
+    body: TenderQuestionRequest,
+    service: TenderService = Depends(get_tender_service),
+) -> StreamingResponse:
+    logger.info(
+        "POST ask question (stream) for tender='%s', company='%s': '%s'",
+        body.tender_name,
+        body.company_name,
+        body.question,
+    )
+    try:
+        events = await service.stream_question(
+            body.tender_name, body.question, body.company_name, body.session_id
+        )
+    except ValueError as exc:
+        logger.warning(
+            "Ask question failed for tender='%s': %s",
+            body.tender_name,
+            exc,
+        )
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=str(exc),
+        ) from exc
+
+    return StreamingResponse(
+        (event.to_sse() async for event in events),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
     )
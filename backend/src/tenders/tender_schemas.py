@@ -1,10 +1,74 @@
-from dataclasses import dataclass
+import json
+import sys
+from collections.abc import Iterable, Iterator, Sequence
+from dataclasses import dataclass, field
 from datetime import date, datetime
+from typing import Literal, overload
 
 from pydantic import BaseModel
 
 
-@dataclass
+def _intern_optional(value: str | None) -> str | None:
+    return sys.intern(value) if value is not None else None
+
+
+class CompressedUrlList(Sequence[str]):
+    """Read-only list of URLs sharing one interned prefix.
+
+    Attachment URLs point at the same S3 bucket, so storing the bucket prefix
+    once per process (instead of once per URL) saves most of each URL string.
+    """
+
+    __slots__ = ("_prefix", "_suffixes")
+
+    def __init__(self, urls: Iterable[str]) -> None:
+        urls = list(urls)
+        prefix = urls[0][: urls[0].rfind("/") + 1] if urls else ""
+        if not all(url.startswith(prefix) for url in urls):
+            prefix = ""
+        self._prefix = sys.intern(prefix)
+        self._suffixes = tuple(url[len(prefix) :] for url in urls)
+
+    @overload
+    def __getitem__(self, index: int) -> str: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> list[str]: ...
+
+    def __getitem__(self, index: int | slice) -> str | list[str]:
+        if isinstance(index, slice):
+            return [self._prefix + suffix for suffix in self._suffixes[index]]
+        return self._prefix + self._suffixes[index]
+
+    def __len__(self) -> int:
+        return len(self._suffixes)
+
+    def __iter__(self) -> Iterator[str]:
+        return (self._prefix + suffix for suffix in self._suffixes)
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, CompressedUrlList):
+            return list(self) == list(other)
+        if isinstance(other, (list, tuple)):
+            return list(self) == list(other)
+        return NotImplemented
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __repr__(self) -> str:
+        return f"CompressedUrlList({list(self)!r})"
+
+
+def parse_deadline(value: str) -> date | None:
+    for fmt in ("%Y-%m-%d %H:%M", "%Y-%m-%d %H:%M:%S"):
+        try:
+            return datetime.strptime(value, fmt).date()
+        except ValueError:
+            continue
+    return None
+
+
+@dataclass(slots=True)
 class TenderMetadata:
     name: str
     organization: str
@@ -12,23 +76,37 @@ class TenderMetadata:
     initiation_date: str
     procedure_type: str | None = None
     source_type: str = ""
+    # Parsed once at load time; None when submission_deadline is malformed
+    parsed_deadline: date | None = field(
+        init=False, default=None, repr=False, compare=False
+    )
+
+    def __post_init__(self) -> None:
+        # These values repeat across thousands of tenders; share one copy each
+        self.organization = sys.intern(self.organization)
+        self.submission_deadline = sys.intern(self.submission_deadline)
+        self.initiation_date = sys.intern(self.initiation_date)
+        self.procedure_type = _intern_optional(self.procedure_type)
+        self.source_type = sys.intern(self.source_type)
+        self.parsed_deadline = parse_deadline(self.submission_deadline)
 
     @property
     def deadline_date(self) -> date:
-        for fmt in ("%Y-%m-%d %H:%M", "%Y-%m-%d %H:%M:%S"):
-            try:
-                return datetime.strptime(self.submission_deadline, fmt).date()
-            except ValueError:
-                continue
-        raise ValueError(f"Invalid deadline format: {self.submission_deadline}")
+        if self.parsed_deadline is None:
+            raise ValueError(f"Invalid deadline format: {self.submission_deadline}")
+        return self.parsed_deadline
 
 
-@dataclass
+@dataclass(slots=True)
 class Tender:
     tender_url: str
     metadata: TenderMetadata
     files_count: int
-    file_urls: list[str]
+    file_urls: Sequence[str]
+
+    def __post_init__(self) -> None:
+        if not isinstance(self.file_urls, CompressedUrlList):
+            self.file_urls = CompressedUrlList(self.file_urls)
 
     @classmethod
     def from_json(cls, data: dict) -> "Tender":
@@ -49,10 +127,243 @@ class Tender:
             procedure_type=self.metadata.procedure_type,
             source_type=self.metadata.source_type,
             files_count=self.files_count,
-            file_urls=self.file_urls,
+            file_urls=list(self.file_urls),
+        )
+
+
+@dataclass
+class TenderCatalogDiff:
+    """Tender URLs that differ between two consecutive catalog loads."""
+
+    added: list[str]
+    removed: list[str]
+    changed: list[str]
+
+    @property
+    def is_empty(self) -> bool:
+        return not (self.added or self.removed or self.changed)
+
+    @property
+    def affected_urls(self) -> list[str]:
+        return [*self.added, *self.removed, *self.changed]
+
+
+@dataclass
+class TenderSearchHit:
+    tender: Tender
+    score: float
+
+    def to_response(self) -> "TenderSearchResult":
+        return TenderSearchResult(
+            tender_url=self.tender.tender_url,
+            name=self.tender.metadata.name,
+            organization=self.tender.metadata.organization,
+            submission_deadline=self.tender.metadata.submission_deadline,
+            score=round(self.score, 4),
+        )
+
+
+@dataclass(slots=True)
+class DocumentChunk:
+    """Overlapping window of text extracted from one tender attachment."""
+
+    file_url: str
+    position: int
+    text: str
+
+
+@dataclass
+class DocumentChunkHit:
+    chunk: DocumentChunk
+    score: float
+
+
+@dataclass
+class TenderAgentEvent:
+    """One step of a streamed agent answer, sent to the client as a Server-Sent Event."""
+
+    event: Literal["tool_start", "tool_end", "token", "answer", "error"]
+    data: dict[str, object]
+
+    def to_sse(self) -> str:
+        payload = json.dumps(self.data, ensure_ascii=False, default=str)
+        return f"event: {self.event}\ndata: {payload}\n\n"
+
+
+@dataclass
+class AnswerCacheMetrics:
+    exact_hits: int = 0
+    similar_hits: int = 0
+    misses: int = 0
+    stores: int = 0
+    invalidated: int = 0
+
+    def to_response(self) -> "AnswerCacheMetricsResponse":
+        lookups = self.exact_hits + self.similar_hits + self.misses
+        return AnswerCacheMetricsResponse(
+            exact_hits=self.exact_hits,
+            similar_hits=self.similar_hits,
+            misses=self.misses,
+            hit_rate=(
+                round((self.exact_hits + self.similar_hits) / lookups, 4)
+                if lookups
+                else 0.0
+            ),
+            stores=self.stores,
+            invalidated=self.invalidated,
         )
 
 
+@dataclass
+class AttachmentIngestionReport:
+    """Outcome of one pre-extraction pass over tender attachments."""
+
+    total: int = 0
+    skipped: int = 0
+    succeeded: int = 0
+    failed: int = 0
+    elapsed_seconds: float = 0.0
+
+    @property
+    def processed(self) -> int:
+        return self.succeeded + self.failed
+
+
+# --- Document (MongoDB) ---
+
+
+@dataclass
+class ExtractedTextDocument:
+    file_url: str
+    content_hash: str
+    etag: str | None
+    last_modified: str | None
+    extension: str
+    text: str
+    size_bytes: int
+    created_at: datetime
+    last_accessed_at: datetime
+
+    def to_mongo(self) -> dict[str, object]:
+        return {
+            "_id": self.file_url,
+            "content_hash": self.content_hash,
+            "etag": self.etag,
+            "last_modified": self.last_modified,
+            "extension": self.extension,
+            "text": self.text,
+            "size_bytes": self.size_bytes,
+            "created_at": self.created_at,
+            "last_accessed_at": self.last_accessed_at,
+        }
+
+    @classmethod
+    def from_mongo(cls, doc: dict[str, object]) -> "ExtractedTextDocument":
+        return cls(
+            file_url=doc["_id"],  # type: ignore[arg-type]
+            content_hash=doc["content_hash"],  # type: ignore[arg-type]
+            etag=doc.get("etag"),  # type: ignore[arg-type]
+            last_modified=doc.get("last_modified"),  # type: ignore[arg-type]
+            extension=doc["extension"],  # type: ignore[arg-type]
+            text=doc["text"],  # type: ignore[arg-type]
+            size_bytes=doc["size_bytes"],  # type: ignore[arg-type]
+            created_at=doc["created_at"],  # type: ignore[arg-type]
+            last_accessed_at=doc["last_accessed_at"],  # type: ignore[arg-type]
+        )
+
+
+@dataclass
+class ChatSessionDocument:
+    session_id: str
+    company_name: str
+    tender_name: str
+    # Prior turns as {"question": ..., "answer": ...}, oldest first
+    turns: list[dict[str, str]]
+    # Memoized tool outputs keyed by tool name + arguments
+    tool_results: dict[str, str]
+    created_at: datetime
+    updated_at: datetime
+    expires_at: datetime
+
+    def to_mongo(self) -> dict[str, object]:
+        return {
+            "_id": self.session_id,
+            "company_name": self.company_name,
+            "tender_name": self.tender_name,
+            "turns": self.turns,
+            # Stored as a list: keys embed URLs, and dots are awkward in field names
+            "tool_results": [
+                {"key": key, "output": output}
+                for key, output in self.tool_results.items()
+            ],
+            "created_at": self.created_at,
+            "updated_at": self.updated_at,
+            "expires_at": self.expires_at,
+        }
+
+    @classmethod
+    def from_mongo(cls, doc: dict[str, object]) -> "ChatSessionDocument":
+        return cls(
+            session_id=doc["_id"],  # type: ignore[arg-type]
+            company_name=doc["company_name"],  # type: ignore[arg-type]
+            tender_name=doc["tender_name"],  # type: ignore[arg-type]
+            turns=doc.get("turns", []),  # type: ignore[arg-type]
+            tool_results={
+                item["key"]: item["output"]
+                for item in doc.get("tool_results", [])  # type: ignore[attr-defined]
+            },
+            created_at=doc["created_at"],  # type: ignore[arg-type]
+            updated_at=doc["updated_at"],  # type: ignore[arg-type]
+            expires_at=doc["expires_at"],  # type: ignore[arg-type]
+        )
+
+
+@dataclass
+class CachedAnswerDocument:
+    cache_key: str
+    tender_url: str
+    tender_name: str
+    file_urls: list[str]
+    normalized_question: str
+    profile_hash: str
+    answer: str
+    embedding: list[float] | None
+    created_at: datetime
+    expires_at: datetime
+
+    def to_mongo(self) -> dict[str, object]:
+        return {
+            "_id": self.cache_key,
+            "tender_url": self.tender_url,
+            "tender_name": self.tender_name,
+            "file_urls": self.file_urls,
+            "normalized_question": self.normalized_question,
+            "profile_hash": self.profile_hash,
+            "answer": self.answer,
+            "embedding": self.embedding,
+            "created_at": self.created_at,
+            "expires_at": self.expires_at,
+        }
+
+    @classmethod
+    def from_mongo(cls, doc: dict[str, object]) -> "CachedAnswerDocument":
+        return cls(
+            cache_key=doc["_id"],  # type: ignore[arg-type]
+            tender_url=doc["tender_url"],  # type: ignore[arg-type]
+            tender_name=doc["tender_name"],  # type: ignore[arg-type]
+            file_urls=doc.get("file_urls", []),  # type: ignore[arg-type]
+            normalized_question=doc["normalized_question"],  # type: ignore[arg-type]
+            profile_hash=doc["profile_hash"],  # type: ignore[arg-type]
+            answer=doc["answer"],  # type: ignore[arg-type]
+            embedding=doc.get("embedding"),  # type: ignore[arg-type]
+            created_at=doc["created_at"],  # type: ignore[arg-type]
+            expires_at=doc["expires_at"],  # type: ignore[arg-type]
+        )
+
+
+# --- Response ---
+
+
 class TenderResponse(BaseModel):
     tender_url: str
     name: str
@@ -65,13 +376,45 @@ class TenderResponse(BaseModel):
     file_urls: list[str]
 
 
+class TenderSearchResult(BaseModel):
+    tender_url: str
+    name: str
+    organization: str
+    submission_deadline: str
+    score: float
+
+
+class TenderListResponse(BaseModel):
+    total: int
+    offset: int
+    limit: int
+    tenders: list[TenderResponse]
+
+
+class TenderSearchResponse(BaseModel):
+    query: str
+    total: int
+    results: list[TenderSearchResult]
+
+
 class TenderQuestionRequest(BaseModel):
     tender_name: str
     question: str
     company_name: str
+    session_id: str | None = None
 
 
 class TenderQuestionResponse(BaseModel):
     tender_name: str
     question: str
     answer: str
+    session_id: str
+
+
+class AnswerCacheMetricsResponse(BaseModel):
+    exact_hits: int
+    similar_hits: int
+    misses: int
+    hit_rate: float
+    stores: int
+    invalidated: int
@@ -0,0 +1,141 @@
+import heapq
+import math
+import re
+import unicodedata
+from bisect import bisect_left
+from collections import defaultdict
+
+_POLISH_FOLDING = str.maketrans(
+    {
+        "ą": "a",
+        "ć": "c",
+        "ę": "e",
+        "ł": "l",
+        "ń": "n",
+        "ó": "o",
+        "ś": "s",
+        "ź": "z",
+        "ż": "z",
+    }
+)
+
+_TOKEN_PATTERN = re.compile(r"\w+")
+
+_STOP_WORDS = frozenset(
+    {"a", "i", "w", "z", "o", "u", "na", "do", "dla", "od", "po", "we", "ze", "oraz"}
+)
+
+# Longest suffixes first so that e.g. "owi" wins over "i".
+_SUFFIXES = tuple(
+    sorted(
+        (
+            "owiach", "ach", "ami", "owi", "ow", "om", "ie", "ego", "emu", "ej",
+            "ych", "ymi", "ich", "imi", "iem", "em", "ym", "im",
+            "a", "e", "i", "o", "u", "y",
+        ),
+        key=len,
+        reverse=True,
+    )
+)  # fmt: skip
+_MIN_STEM_LENGTH = 4
+
+_BM25_K1 = 1.2
+_BM25_B = 0.75
+_MAX_PREFIX_EXPANSIONS = 50
+
+
+def fold_diacritics(text: str) -> str:
+    folded = text.casefold().translate(_POLISH_FOLDING)
+    decomposed = unicodedata.normalize("NFKD", folded)
+    return "".join(ch for ch in decomposed if not unicodedata.combining(ch))
+
+
+def stem(token: str) -> str:
+    for suffix in _SUFFIXES:
+        if token.endswith(suffix) and len(token) - len(suffix) >= _MIN_STEM_LENGTH:
+            return token[: -len(suffix)]
+    return token
+
+
+def tokenize(text: str) -> list[str]:
+    return [
+        stem(token)
+        for token in _TOKEN_PATTERN.findall(fold_diacritics(text))
+        if token not in _STOP_WORDS
+    ]
+
+
+def term_frequencies(
+    fields: list[tuple[str, float]],
+) -> dict[str, float]:
+    """Weighted term frequencies for a document made of ``(text, weight)`` fields."""
+    frequencies: dict[str, float] = defaultdict(float)
+    for text, weight in fields:
+        for token in tokenize(text):
+            frequencies[token] += weight
+    return dict(frequencies)
+
+
+class Bm25Index:
+    """In-memory inverted index with BM25 ranking.
+
+    Query terms that have no exact postings are expanded to vocabulary terms
+    sharing that prefix, so partial words typed by a user still match.
+    """
+
+    def __init__(self, documents: list[dict[str, float]]) -> None:
+        postings: dict[str, list[tuple[int, float]]] = defaultdict(list)
+        self._doc_lengths: list[float] = []
+        for doc_id, frequencies in enumerate(documents):
+            for term, tf in frequencies.items():
+                postings[term].append((doc_id, tf))
+            self._doc_lengths.append(sum(frequencies.values()))
+
+        self._postings = dict(postings)
+        self._vocabulary = sorted(self._postings)
+        self._doc_count = len(documents)
+        self._avg_doc_length = (
+            sum(self._doc_lengths) / self._doc_count if self._doc_count else 0.0
+        )
+
+    def __len__(self) -> int:
+        return self._doc_count
+
+    def _expand(self, term: str) -> list[str]:
+        if term in self._postings:
+            return [term]
+        expanded: list[str] = []
+        index = bisect_left(self._vocabulary, term)
+        while (
+            index < len(self._vocabulary)
+            and len(expanded) < _MAX_PREFIX_EXPANSIONS
+            and self._vocabulary[index].startswith(term)
+        ):
+            expanded.append(self._vocabulary[index])
+            index += 1
+        return expanded
+
+    def _idf(self, term: str) -> float:
+        df = len(self._postings[term])
+        return math.log(1.0 + (self._doc_count - df + 0.5) / (df + 0.5))
+
+    def search(self, query: str, limit: int) -> tuple[list[tuple[int, float]], int]:
+        """Return the top ``limit`` ``(doc_id, score)`` pairs and the total match count."""
+        scores: dict[int, float] = defaultdict(float)
+        for query_term in set(tokenize(query)):
+            for term in self._expand(query_term):
+                idf = self._idf(term)
+                for doc_id, tf in self._postings[term]:
+                    norm = (
+                        1.0
+                        - _BM25_B
+                        + _BM25_B * (self._doc_lengths[doc_id] / self._avg_doc_length)
+                    )
+                    scores[doc_id] += (
+                        idf * tf * (_BM25_K1 + 1.0) / (tf + _BM25_K1 * norm)
+                    )
+
+        top = heapq.nlargest(
+            limit, scores.items(), key=lambda item: (item[1], -item[0])
+        )
+        return top, len(scores)
@@ -1,45 +1,65 @@
-import asyncio
-import io
-import json
 import logging
+from collections.abc import AsyncIterator
 from datetime import date
-from functools import lru_cache
-from urllib.parse import unquote, urlparse
 
 import httpx
+from langchain_core.runnables import RunnableConfig
 from langchain_core.tools import BaseTool, tool
 from langchain_openai import ChatOpenAI
-from langgraph.prebuilt import create_react_agent
+from langgraph.prebuilt import ToolNode, create_react_agent
+from motor.motor_asyncio import AsyncIOMotorDatabase
 
-from src.constants import TENDERS_PATH
 from src.companies.company_service import CompanyService
+from src.config import settings
+from src.llm.embeddings import create_local_embedder
 from src.llm.langfuse_client import LangfuseTrace
+from src.llm.llm_scheduler import llm_request_config
+from src.llm.llm_schemas import LLMPriority
+from src.tenders.tender_answer_cache import AnswerCache, profile_hash
+from src.tenders.tender_attachments import AttachmentReader
+from src.tenders.tender_catalog import TenderCatalog, tender_catalog_store
 from src.tenders.tender_constants import (
+    DOCUMENT_SEARCH_TOP_K,
     MAX_EXTRACTED_TEXT_CHARS,
-    MAX_FILE_SIZE_BYTES,
-    SUPPORTED_FILE_EXTENSIONS,
+    MAX_INDEXED_TENDERS,
+    SEARCH_RESULTS_LIMIT,
     TENDER_AGENT_SYSTEM_PROMPT,
 )
-from src.tenders.tender_schemas import Tender
+from src.tenders.tender_context_budget import (
+    CONTEXT_BUDGET_METADATA_KEY,
+    build_context_budget_hook,
+    summarize_context_budget,
+)
+from src.tenders.tender_documents import TenderDocumentRetriever
+from src.tenders.tender_exceptions import AttachmentReadError
+from src.tenders.tender_extraction import DocumentExtractionEngine
+from src.tenders.tender_schemas import (
+    AnswerCacheMetrics,
+    ChatSessionDocument,
+    Tender,
+    TenderAgentEvent,
+    TenderSearchHit,
+)
+from src.tenders.tender_sessions import (
+    TOOL_RESULTS_CONFIG_KEY,
+    ChatSessionStore,
+    memoize_tool_results,
+)
+from src.tenders.tender_text_cache import ExtractedTextCache
 
 logger = logging.getLogger(__name__)
 
 
-@lru_cache(maxsize=1)
+def _load_catalog() -> TenderCatalog:
+    return tender_catalog_store.catalog
+
+
 def _load_tenders() -> list[Tender]:
-    logger.info("Loading tenders from %s", TENDERS_PATH)
-    with open(TENDERS_PATH, "r", encoding="utf-8") as f:
-        data = json.load(f)
-    tenders = [Tender.from_json(t) for t in data["tenders"]]
-    logger.info("Loaded %d tenders", len(tenders))
-    return tenders
+    return _load_catalog().tenders
 
 
 def _get_tender_by_name(name: str) -> Tender | None:
-    for tender in _load_tenders():
-        if tender.metadata.name == name:
-            return tender
-    return None
+    return _load_catalog().get_by_name(name)
 
 
 def _format_tender(tender: Tender) -> str:
@@ -66,26 +86,23 @@ def get_tender_details(tender_name: str) -> str:
 
 @tool
 def search_tenders(query: str) -> str:
-    query_lower = query.lower()
-    matches = [t for t in _load_tenders() if query_lower in t.metadata.name.lower()]
-    if not matches:
+    hits, total = _load_catalog().search(query, SEARCH_RESULTS_LIMIT)
+    if not hits:
         return f"No tenders found matching '{query}'."
 
     results = [
-        f"- {t.metadata.name} (org: {t.metadata.organization})" for t in matches[:20]
+        f"- {hit.tender.metadata.name} (org: {hit.tender.metadata.organization})"
+        for hit in hits
     ]
-    header = f"Found {len(matches)} tender(s)"
-    if len(matches) > 20:
-        header += f" (showing first 20 of {len(matches)})"
+    header = f"Found {total} tender(s)"
+    if total > SEARCH_RESULTS_LIMIT:
+        header += f" (showing top {SEARCH_RESULTS_LIMIT} of {total})"
     return header + ":\n" + "\n".join(results)
 
 
 @tool
 def list_tenders_by_organization(organization: str) -> str:
-    org_lower = organization.lower()
-    matches = [
-        t for t in _load_tenders() if org_lower in t.metadata.organization.lower()
-    ]
+    matches = _load_catalog().list_by_organization(organization)
     if not matches:
         return f"No tenders found for organization matching '{organization}'."
 
@@ -117,101 +134,96 @@ def get_today_date() -> str:
     return str(date.today())
 
 
-def _get_file_extension(url: str) -> str:
-    path = unquote(urlparse(url).path)
-    dot_index = path.rfind(".")
-    if dot_index == -1:
-        return ""
-    return path[dot_index:].lower()
-
-
-def _extract_text_from_pdf(content: bytes) -> str:
-    from pypdf import PdfReader
-
-    reader = PdfReader(io.BytesIO(content))
-    pages: list[str] = []
-    for page in reader.pages:
-        text = page.extract_text()
-        if text:
-            pages.append(text)
-    return "\n\n".join(pages)
+AGENT_TOOLS = [
+    get_tender_details,
+    search_tenders,
+    list_tenders_by_organization,
+    get_tender_files,
+    get_today_date,
+]
 
 
-def _extract_text_from_docx(content: bytes) -> str:
-    from docx import Document
+def _build_read_file_tool(attachment_reader: AttachmentReader) -> BaseTool:
+    @tool
+    async def read_file_content(file_url: str) -> str:
+        try:
+            text = await attachment_reader.read_text(file_url)
+        except AttachmentReadError as exc:
+            return str(exc)
 
-    doc = Document(io.BytesIO(content))
-    paragraphs = [p.text for p in doc.paragraphs if p.text.strip()]
-    return "\n\n".join(paragraphs)
+        if not text.strip():
+            return "The file appears to be empty or contains no extractable text (e.g., scanned image PDF)."
 
+        if len(text) > MAX_EXTRACTED_TEXT_CHARS:
+            text = (
+                text[:MAX_EXTRACTED_TEXT_CHARS]
+                + "\n\n[... content truncated due to length ...]"
+            )
 
-def _extract_text_from_txt(content: bytes) -> str:
-    for encoding in ("utf-8", "cp1250", "latin-1"):
-        try:
-            return content.decode(encoding)
-        except (UnicodeDecodeError, ValueError):
-            continue
-    return content.decode("utf-8", errors="replace")
+        return text
 
+    return read_file_content  # type: ignore[return-value]
 
-def _extract_text(content: bytes, extension: str) -> str:
-    if extension == ".pdf":
-        return _extract_text_from_pdf(content)
-    if extension == ".docx":
-        return _extract_text_from_docx(content)
-    if extension == ".txt":
-        return _extract_text_from_txt(content)
-    return f"Unsupported file format: {extension}"
 
+def _build_document_search_tool(retriever: TenderDocumentRetriever) -> BaseTool:
+    @tool
+    async def search_tender_documents(tender_name: str, query: str) -> str:
+        tender = _get_tender_by_name(tender_name)
+        if tender is None:
+            return f"Tender '{tender_name}' not found."
+        if not tender.file_urls:
+            return f"Tender '{tender_name}' has no attached files."
 
-@tool
-async def read_file_content(file_url: str) -> str:
-    extension = _get_file_extension(file_url)
-    if extension not in SUPPORTED_FILE_EXTENSIONS:
-        return (
-            f"Cannot read file with extension '{extension}'. "
-            f"Supported formats: {', '.join(sorted(SUPPORTED_FILE_EXTENSIONS))}."
-        )
+        index = await retriever.index_for(tender)
+        hits, total = index.search(query, DOCUMENT_SEARCH_TOP_K)
 
-    try:
-        async with httpx.AsyncClient(timeout=60.0, follow_redirects=True) as client:
-            response = await client.get(file_url)
-            response.raise_for_status()
-    except httpx.HTTPStatusError as exc:
-        return f"Failed to download file: HTTP {exc.response.status_code}"
-    except httpx.RequestError as exc:
-        return f"Failed to download file: {exc}"
-
-    if len(response.content) > MAX_FILE_SIZE_BYTES:
-        size_mb = len(response.content) / (1024 * 1024)
-        return f"File too large ({size_mb:.1f} MB). Maximum supported size is {MAX_FILE_SIZE_BYTES // (1024 * 1024)} MB."
-
-    try:
-        text = await asyncio.to_thread(_extract_text, response.content, extension)
-    except Exception as exc:
-        logger.exception("Failed to extract text from %s", file_url)
-        return f"Failed to extract text from file: {exc}"
-
-    if not text.strip():
-        return "The file appears to be empty or contains no extractable text (e.g., scanned image PDF)."
-
-    if len(text) > MAX_EXTRACTED_TEXT_CHARS:
-        text = (
-            text[:MAX_EXTRACTED_TEXT_CHARS]
-            + "\n\n[... content truncated due to length ...]"
-        )
+        sections: list[str] = []
+        if not hits:
+            sections.append(
+                f"No passages matching '{query}' in the documents of '{tender_name}'."
+            )
+        else:
+            header = f"Found {total} matching passage(s)"
+            if total > DOCUMENT_SEARCH_TOP_K:
+                header += f" (showing top {DOCUMENT_SEARCH_TOP_K} of {total})"
+            sections.append(header + ":")
+            for hit in hits:
+                chunk = hit.chunk
+                sections.append(
+                    f"--- {chunk.file_url} "
+                    f"(passage {chunk.position + 1} of "
+                    f"{index.chunks_per_file[chunk.file_url]}) ---\n{chunk.text}"
+                )
+
+        if index.unreadable:
+            skipped = "\n".join(
+                f"- {url}: {reason}" for url, reason in index.unreadable.items()
+            )
+            sections.append(f"Files that could not be searched:\n{skipped}")
+        return "\n\n".join(sections)
 
-    return text
+    return search_tender_documents  # type: ignore[return-value]
 
 
-AGENT_TOOLS = [
-    get_tender_details,
-    search_tenders,
-    list_tenders_by_organization,
-    get_tender_files,
-    get_today_date,
-    read_file_content,
-]
+def _tool_events(update: dict) -> list[TenderAgentEvent]:
+    """Tool start/end events from one ``updates`` chunk of the agent stream."""
+    events: list[TenderAgentEvent] = []
+    for node, node_update in update.items():
+        for message in (node_update or {}).get("messages", []):
+            if node == "agent" and getattr(message, "tool_calls", None):
+                events.extend(
+                    TenderAgentEvent(
+                        "tool_start", {"tool": call["name"], "args": call["args"]}
+                    )
+                    for call in message.tool_calls
+                )
+            elif node == "tools" and message.type == "tool":
+                events.append(
+                    TenderAgentEvent(
+                        "tool_end", {"tool": message.name, "status": message.status}
+                    )
+                )
+    return events
 
 
 def _build_company_tool(company_service: CompanyService) -> BaseTool:
@@ -240,31 +252,103 @@ def _build_company_tool(company_service: CompanyService) -> BaseTool:
 class TenderService:
     def __init__(
         self,
+        db: AsyncIOMotorDatabase,
         llm_client: ChatOpenAI,
+        http_client: httpx.AsyncClient,
+        extraction_engine: DocumentExtractionEngine,
         company_service: CompanyService,
     ) -> None:
-        tools = [*AGENT_TOOLS, _build_company_tool(company_service)]
+        self.http_client = http_client
+        self.text_cache = ExtractedTextCache(
+            db, settings.extracted_text_cache_max_bytes
+        )
+        self.attachment_reader = AttachmentReader(
+            http_client, self.text_cache, extraction_engine
+        )
+        self.document_retriever = TenderDocumentRetriever(
+            self.attachment_reader, MAX_INDEXED_TENDERS
+        )
+        tender_catalog_store.subscribe(self.document_retriever.invalidate)
+        self.attachment_reader.subscribe_content_changes(
+            self.document_retriever.invalidate_attachment
+        )
+        tools = [
+            *AGENT_TOOLS,
+            _build_document_search_tool(self.document_retriever),
+            _build_read_file_tool(self.attachment_reader),
+            _build_company_tool(company_service),
+        ]
+        self.company_service = company_service
+        self.session_store = ChatSessionStore(db, settings.chat_session_ttl_seconds)
+        self.answer_cache = AnswerCache(
+            db,
+            settings.answer_cache_ttl_seconds,
+            create_local_embedder(settings.answer_cache_embedding_model),
+            settings.answer_cache_similarity_threshold,
+        )
+        tender_catalog_store.subscribe(self.answer_cache.invalidate_tenders)
+        self.attachment_reader.subscribe_content_changes(
+            self.answer_cache.invalidate_attachment
+        )
+        self.context_budget_tokens = settings.agent_context_budget_tokens
         self.agent = create_react_agent(
             model=llm_client,
-            tools=tools,
+            tools=ToolNode(tools, awrap_tool_call=memoize_tool_results),
             prompt=TENDER_AGENT_SYSTEM_PROMPT,
+            pre_model_hook=(
+                build_context_budget_hook(self.context_budget_tokens)
+                if self.context_budget_tokens > 0
+                else None
+            ),
         )
 
     @staticmethod
     def load_tenders() -> list[Tender]:
         return _load_tenders()
 
+    @staticmethod
+    def load_catalog() -> TenderCatalog:
+        return _load_catalog()
+
     @staticmethod
     def get_tender_by_name(name: str) -> Tender | None:
         return _get_tender_by_name(name)
 
-    async def ask_question(
-        self, tender_name: str, question: str, company_name: str
-    ) -> str:
+    @staticmethod
+    def reference_date() -> date:
+        return settings.tender_deadline_date or date.today()
+
+    @staticmethod
+    def list_by_deadline(
+        open_after: date | None,
+        deadline_before: date | None,
+        offset: int,
+        limit: int,
+    ) -> tuple[list[Tender], int]:
+        return _load_catalog().list_by_deadline(
+            open_after, deadline_before, offset, limit
+        )
+
+    @staticmethod
+    def search(query: str, limit: int) -> tuple[list[TenderSearchHit], int]:
+        return _load_catalog().search(query, limit)
+
+    @staticmethod
+    def get_tender_by_url(tender_url: str) -> Tender | None:
+        return _load_catalog().get_by_url(tender_url)
+
+    async def _start_question(
+        self,
+        tender_name: str,
+        question: str,
+        company_name: str,
+        session_id: str | None,
+    ) -> tuple[Tender, ChatSessionDocument, LangfuseTrace]:
         logger.info(
-            "Ask question for tender='%s', company='%s': '%s'",
+            "Ask question for tender='%s', company='%s' (session=%s): '%s'",
             tender_name,
             company_name,
+            session_id,
             question,
         )
         tender = _get_tender_by_name(tender_name)
@@ -272,23 +356,95 @@ class TenderService:
             logger.warning("Tender not found for question: '%s'", tender_name)
             raise ValueError(f"Tender not found: {tender_name}")
 
-        user_message = (
-            f'The user is asking about the tender named: "{tender_name}"\n'
-            f'The user\'s company name is: "{company_name}"\n\n'
-            f"Question: {question}"
+        session = await self.session_store.load_or_create(
+            session_id, company_name, tender_name
         )
-
         trace = LangfuseTrace(
             name="tender-agent-question",
+            http_client=self.http_client,
             user_id=company_name,
+            session_id=session.session_id,
             tags=["tender-chat"],
         )
+        return tender, session, trace
+
+    async def _lookup_cached_answer(
+        self, tender: Tender, session: ChatSessionDocument, question: str
+    ) -> tuple[str | None, str | None]:
+        """Cached answer and profile hash for the opening question of a session.
+
+        Follow-ups depend on the conversation so far and are never cached;
+        for those the profile hash is ``None``.
+        """
+        if session.turns or not self.answer_cache.enabled:
+            return None, None
+        company = await self.company_service.get_company(session.company_name)
+        profile = profile_hash(
+            company.profile.model_dump_json() if company is not None else None,
+            session.company_name,
+        )
+        return await self.answer_cache.get(tender, question, profile), profile
+
+    async def _finish_cached_answer(
+        self,
+        trace: LangfuseTrace,
+        session: ChatSessionDocument,
+        tender_name: str,
+        question: str,
+        answer: str,
+    ) -> None:
+        await self.session_store.save(session, question, answer)
+        trace.tags.append("answer-cache-hit")
+        await trace.flush(
+            input_data={"tender_name": tender_name, "question": question},
+            output_data={"answer": answer, "cached": True},
+        )
+        logger.info("Answered question for tender='%s' from cache", tender_name)
+
+    def answer_cache_metrics(self) -> AnswerCacheMetrics:
+        return self.answer_cache.metrics
+
+    @staticmethod
+    def _agent_input(
+        session: ChatSessionDocument, user_message: str
+    ) -> tuple[dict, RunnableConfig]:
+        history: list[dict[str, str]] = []
+        for turn in session.turns:
+            history.append({"role": "user", "content": turn["question"]})
+            history.append({"role": "assistant", "content": turn["answer"]})
+        return (
+            {"messages": [*history, {"role": "user", "content": user_message}]},
+            {
+                **llm_request_config(LLMPriority.INTERACTIVE, session.company_name),
+                "configurable": {TOOL_RESULTS_CONFIG_KEY: session.tool_results},
+            },
+        )
 
-        result = await self.agent.ainvoke(
-            {"messages": [{"role": "user", "content": user_message}]}
+    @staticmethod
+    def _user_message(tender_name: str, question: str, company_name: str) -> str:
+        return (
+            f'The user is asking about the tender named: "{tender_name}"\n'
+            f'The user\'s company name is: "{company_name}"\n\n'
+            f"Question: {question}"
         )
 
-        ai_messages = [m for m in result["messages"] if m.type == "ai" and m.content]
+    async def _finish_question(
+        self,
+        trace: LangfuseTrace,
+        tender: Tender,
+        session: ChatSessionDocument,
+        profile: str | None,
+        messages: list,
+        user_message: str,
+        question: str,
+    ) -> str:
+        tender_name = tender.metadata.name
+        # Only look at this run, not at earlier turns replayed from the session
+        last_human = max(
+            (i for i, m in enumerate(messages) if m.type == "human"), default=-1
+        )
+        messages = messages[last_human:]
+        ai_messages = [m for m in messages if m.type == "ai" and m.content]
         if not ai_messages:
             logger.warning("No AI response generated for tender='%s'", tender_name)
             await trace.flush(
@@ -299,8 +455,11 @@ class TenderService:
 
         answer: str = ai_messages[-1].content  # type: ignore[assignment]
 
+        await self.session_store.save(session, question, answer)
+        if profile is not None:
+            await self.answer_cache.put(tender, question, profile, answer)
         await self._record_agent_trace(
-            trace, result["messages"], user_message, answer, tender_name, question
+            trace, messages, user_message, answer, tender_name, question
         )
 
         logger.info(
@@ -310,8 +469,112 @@ class TenderService:
         )
         return answer
 
+    async def ask_question(
+        self,
+        tender_name: str,
+        question: str,
+        company_name: str,
+        session_id: str | None = None,
+    ) -> tuple[str, str]:
+        """Answer a question; returns the answer and the chat session ID to reuse."""
+        tender, session, trace = await self._start_question(
+            tender_name, question, company_name, session_id
+        )
+        cached, profile = await self._lookup_cached_answer(tender, session, question)
+        if cached is not None:
+            await self._finish_cached_answer(
+                trace, session, tender_name, question, cached
+            )
+            return cached, session.session_id
+
+        user_message = self._user_message(tender_name, question, company_name)
+        agent_input, config = self._agent_input(session, user_message)
+        result = await self.agent.ainvoke(agent_input, config=config)
+        answer = await self._finish_question(
+            trace, tender, session, profile, result["messages"], user_message, question
+        )
+        return answer, session.session_id
+
+    async def stream_question(
+        self,
+        tender_name: str,
+        question: str,
+        company_name: str,
+        session_id: str | None = None,
+    ) -> AsyncIterator[TenderAgentEvent]:
+        """Validate the question eagerly, then stream the agent's progress and answer.
+
+        Raises ``ValueError`` before any event is produced if the tender is unknown.
+        """
+        tender, session, trace = await self._start_question(
+            tender_name, question, company_name, session_id
+        )
+        cached, profile = await self._lookup_cached_answer(tender, session, question)
+        if cached is not None:
+            await self._finish_cached_answer(
+                trace, session, tender_name, question, cached
+            )
+            return self._stream_cached_answer(cached, session.session_id)
+        return self._stream_answer(
+            trace, tender, session, profile, question, company_name
+        )
+
     @staticmethod
+    async def _stream_cached_answer(
+        answer: str, session_id: str
+    ) -> AsyncIterator[TenderAgentEvent]:
+        yield TenderAgentEvent(
+            "answer", {"answer": answer, "session_id": session_id, "cached": True}
+        )
+
+    async def _stream_answer(
+        self,
+        trace: LangfuseTrace,
+        tender: Tender,
+        session: ChatSessionDocument,
+        profile: str | None,
+        question: str,
+        company_name: str,
+    ) -> AsyncIterator[TenderAgentEvent]:
+        tender_name = tender.metadata.name
+        user_message = self._user_message(tender_name, question, company_name)
+        agent_input, config = self._agent_input(session, user_message)
+        messages: list = []
+        try:
+            async for mode, chunk in self.agent.astream(
+                agent_input,
+                config=config,
+                stream_mode=["updates", "messages", "values"],
+            ):
+                if mode == "values":
+                    messages = chunk["messages"]
+                elif mode == "messages":
+                    message, metadata = chunk
+                    if (
+                        metadata.get("langgraph_node") == "agent"
+                        and isinstance(message.content, str)
+                        and message.content
+                    ):
+                        yield TenderAgentEvent("token", {"text": message.content})
+                else:
+                    for event in _tool_events(chunk):
+                        yield event
+        except Exception:
+            logger.exception("Streaming answer failed for tender='%s'", tender_name)
+            yield TenderAgentEvent(
+                "error", {"detail": "The agent failed to answer the question."}
+            )
+            return
+
+        answer = await self._finish_question(
+            trace, tender, session, profile, messages, user_message, question
+        )
+        yield TenderAgentEvent(
+            "answer", {"answer": answer, "session_id": session.session_id}
+        )
+
     async def _record_agent_trace(
+        self,
         trace: LangfuseTrace,
         messages: list,
         user_message: str,
@@ -319,20 +582,40 @@ class TenderService:
         tender_name: str,
         question: str,
     ) -> None:
-        tool_outputs: dict[str, str] = {}
-        for msg in messages:
-            if msg.type == "tool":
-                tool_outputs[msg.tool_call_id] = msg.content
+        tool_messages = {
+            msg.tool_call_id: msg for msg in messages if msg.type == "tool"
+        }
 
         for msg in messages:
             if msg.type == "ai" and hasattr(msg, "tool_calls") and msg.tool_calls:
                 for tc in msg.tool_calls:
+                    tool_message = tool_messages.get(tc.get("id", ""))
                     trace.add_span(
                         name=f"tool:{tc['name']}",
                         input_data=tc.get("args"),
-                        output_data=tool_outputs.get(tc.get("id", "")),
+                        output_data=tool_message.content if tool_message else None,
+                        metadata=(
+                            tool_message.response_metadata.get(
+                                CONTEXT_BUDGET_METADATA_KEY
+                            )
+                            if tool_message
+                            else None
+                        ),
                     )
 
+        if self.context_budget_tokens > 0:
+            budget = summarize_context_budget(messages, self.context_budget_tokens)
+            logger.info(
+                "Context budget for tender='%s': kept %d of %d tool output tokens "
+                "(budget %d, %d output(s) truncated)",
+                tender_name,
+                budget["kept_tokens"],
+                budget["tool_output_tokens"],
+                budget["budget_tokens"],
+                budget["truncated_outputs"],
+            )
+            trace.add_span(name="context-budget", metadata=budget)
+
         trace.add_generation(
             name="agent-response",
             model="gpt-4o-mini",
@@ -0,0 +1,121 @@
+import json
+import logging
+import uuid
+from collections.abc import Awaitable, Callable
+from datetime import datetime, timedelta, timezone
+
+from langchain_core.messages import ToolMessage
+from langgraph.prebuilt.tool_node import ToolCallRequest
+from langgraph.types import Command
+from motor.motor_asyncio import AsyncIOMotorDatabase
+
+from src.tenders.tender_constants import (
+    CHAT_SESSION_COLLECTION_NAME,
+    MAX_SESSION_TOOL_RESULTS_CHARS,
+    MAX_SESSION_TURNS,
+)
+from src.tenders.tender_schemas import ChatSessionDocument
+
+logger = logging.getLogger(__name__)
+
+# Key under RunnableConfig["configurable"] holding the session's memoized tool outputs
+TOOL_RESULTS_CONFIG_KEY = "tool_results"
+
+# Tools whose output only depends on their arguments within a session's lifetime
+MEMOIZED_TOOLS = frozenset(
+    {
+        "get_tender_details",
+        "search_tenders",
+        "list_tenders_by_organization",
+        "get_tender_files",
+        "read_file_content",
+        "search_tender_documents",
+        "get_company_info",
+    }
+)
+
+
+def tool_result_key(name: str, args: dict) -> str:
+    return f"{name}:{json.dumps(args, sort_keys=True, ensure_ascii=False)}"
+
+
+async def memoize_tool_results(
+    request: ToolCallRequest,
+    execute: Callable[[ToolCallRequest], Awaitable[ToolMessage | Command]],
+) -> ToolMessage | Command:
+    """``ToolNode`` wrapper that answers repeated tool calls from the session."""
+    configurable = request.runtime.config.get("configurable", {})
+    tool_results: dict[str, str] | None = configurable.get(TOOL_RESULTS_CONFIG_KEY)
+    call = request.tool_call
+    if tool_results is None or call["name"] not in MEMOIZED_TOOLS:
+        return await execute(request)
+
+    key = tool_result_key(call["name"], call["args"])
+    cached = tool_results.get(key)
+    if cached is not None:
+        logger.info("Reusing session result of %s", key)
+        return ToolMessage(content=cached, name=call["name"], tool_call_id=call["id"])
+
+    result = await execute(request)
+    if (
+        isinstance(result, ToolMessage)
+        and result.status != "error"
+        and isinstance(result.content, str)
+        and sum(map(len, tool_results.values())) + len(result.content)
+        <= MAX_SESSION_TOOL_RESULTS_CHARS
+    ):
+        tool_results[key] = result.content
+    return result
+
+
+class ChatSessionStore:
+    """MongoDB-backed tender chat sessions, expired by a TTL index when idle."""
+
+    def __init__(self, db: AsyncIOMotorDatabase, ttl_seconds: int) -> None:
+        self.collection = db[CHAT_SESSION_COLLECTION_NAME]
+        self.ttl = timedelta(seconds=ttl_seconds)
+
+    def _new(self, company_name: str, tender_name: str) -> ChatSessionDocument:
+        now = datetime.now(timezone.utc)
+        return ChatSessionDocument(
+            session_id=uuid.uuid4().hex,
+            company_name=company_name,
+            tender_name=tender_name,
+            turns=[],
+            tool_results={},
+            created_at=now,
+            updated_at=now,
+            expires_at=now + self.ttl,
+        )
+
+    async def load_or_create(
+        self, session_id: str | None, company_name: str, tender_name: str
+    ) -> ChatSessionDocument:
+        if session_id is not None:
+            raw = await self.collection.find_one({"_id": session_id})
+            if raw is None:
+                logger.info("Chat session %s not found or expired", session_id)
+            elif raw["company_name"] != company_name:
+                logger.warning(
+                    "Chat session %s belongs to another company; starting a new one",
+                    session_id,
+                )
+            else:
+                session = ChatSessionDocument.from_mongo(raw)
+                session.tender_name = tender_name
+                return session
+        return self._new(company_name, tender_name)
+
+    async def save(
+        self, session: ChatSessionDocument, question: str, answer: str
+    ) -> None:
+        session.turns = [
+            *session.turns,
+            {"question": question, "answer": answer},
+        ][-MAX_SESSION_TURNS:]
+        session.updated_at = datetime.now(timezone.utc)
+        session.expires_at = session.updated_at + self.ttl
+        mongo_doc = session.to_mongo()
+        await self.collection.replace_one(
+            {"_id": mongo_doc["_id"]}, mongo_doc, upsert=True
+        )
@@ -0,0 +1,186 @@
+"""Compiled binary snapshot of the parsed tender dataset.
+
+Layout (little-endian)::
+
+    magic          8 bytes   b"TNDRSNP1"
+    marshal ver.   1 byte    marshal.version used to encode the records
+    source hash   32 bytes   SHA-256 of the tenders.json the snapshot was built from
+    record count   4 bytes
+    offsets        (count + 1) * 8 bytes, relative to the start of the records
+    records        marshal-encoded tuples, one per tender
+
+:class:`TenderSnapshot` memory-maps the file and decodes a record only when it
+is accessed, so opening one costs a hash of the source file plus a header
+read. :func:`read_snapshot`, used to load the catalog, decodes every record up
+front: the catalog indexes all tenders at load anyway, and decoding marshal
+tuples is what saves the JSON parsing. A snapshot whose source hash no longer
+matches ``tenders.json`` is ignored.
+"""
+
+import hashlib
+import logging
+import marshal
+import mmap
+import os
+import struct
+from array import array
+from collections.abc import Iterator
+from pathlib import Path
+
+from src.tenders.tender_schemas import Tender, TenderMetadata
+
+logger = logging.getLogger(__name__)
+
+_MAGIC = b"TNDRSNP1"
+_HEADER = struct.Struct("<8sB32sI")
+_OFFSET_TYPECODE = "Q"
+
+_Record = tuple[str, str, str, str, str, str | None, str, int, tuple[str, ...]]
+
+
+def snapshot_path_for(tenders_path: Path) -> Path:
+    return tenders_path.with_suffix(".snapshot")
+
+
+def source_digest(tenders_path: Path) -> bytes:
+    digest = hashlib.sha256()
+    with open(tenders_path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.digest()
+
+
+def _to_record(tender: Tender) -> _Record:
+    metadata = tender.metadata
+    return (
+        tender.tender_url,
+        metadata.name,
+        metadata.organization,
+        metadata.submission_deadline,
+        metadata.initiation_date,
+        metadata.procedure_type,
+        metadata.source_type,
+        tender.files_count,
+        tuple(tender.file_urls),
+    )
+
+
+def _from_record(record: _Record) -> Tender:
+    (
+        tender_url,
+        name,
+        organization,
+        submission_deadline,
+        initiation_date,
+        procedure_type,
+        source_type,
+        files_count,
+        file_urls,
+    ) = record
+    return Tender(
+        tender_url=tender_url,
+        metadata=TenderMetadata(
+            name=name,
+            organization=organization,
+            submission_deadline=submission_deadline,
+            initiation_date=initiation_date,
+            procedure_type=procedure_type,
+            source_type=source_type,
+        ),
+        files_count=files_count,
+        file_urls=file_urls,
+    )
+
+
+def write_snapshot(tenders: list[Tender], tenders_path: Path) -> Path:
+    snapshot_path = snapshot_path_for(tenders_path)
+    payloads = [marshal.dumps(_to_record(t)) for t in tenders]
+
+    offsets = array(_OFFSET_TYPECODE, [0])
+    for payload in payloads:
+        offsets.append(offsets[-1] + len(payload))
+
+    header = _HEADER.pack(
+        _MAGIC, marshal.version, source_digest(tenders_path), len(payloads)
+    )
+    tmp_path = snapshot_path.with_suffix(".snapshot.tmp")
+    with open(tmp_path, "wb") as f:
+        f.write(header)
+        f.write(offsets.tobytes())
+        for payload in payloads:
+            f.write(payload)
+    os.replace(tmp_path, snapshot_path)
+
+    logger.info("Wrote snapshot of %d tenders to %s", len(payloads), snapshot_path)
+    return snapshot_path
+
+
+class TenderSnapshot:
+    """Read-only, lazily decoded view over a memory-mapped snapshot file."""
+
+    def __init__(self, snapshot_path: Path) -> None:
+        with open(snapshot_path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, self.marshal_version, self.source_hash, count = _HEADER.unpack_from(
+            self._mmap
+        )
+        if magic != _MAGIC:
+            self.close()
+            raise ValueError(f"Not a tender snapshot: {snapshot_path}")
+
+        offsets_start = _HEADER.size
+        offsets_end = offsets_start + (count + 1) * array(_OFFSET_TYPECODE).itemsize
+        self._offsets = array(_OFFSET_TYPECODE)
+        self._offsets.frombytes(self._mmap[offsets_start:offsets_end])
+        self._records_start = offsets_end
+
+    def __enter__(self) -> "TenderSnapshot":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self._mmap.close()
+
+    def __len__(self) -> int:
+        return len(self._offsets) - 1
+
+    def __getitem__(self, index: int) -> Tender:
+        start = self._records_start + self._offsets[index]
+        end = self._records_start + self._offsets[index + 1]
+        return _from_record(marshal.loads(self._mmap[start:end]))
+
+    def __iter__(self) -> Iterator[Tender]:
+        for index in range(len(self)):
+            yield self[index]
+
+    def is_fresh(self, tenders_path: Path) -> bool:
+        return (
+            self.marshal_version == marshal.version
+            and self.source_hash == source_digest(tenders_path)
+        )
+
+
+def read_snapshot(tenders_path: Path) -> list[Tender] | None:
+    """Return tenders from a fresh snapshot, or ``None`` if there is no usable one.
+
+    All records are decoded eagerly and the file is unmapped before returning.
+    """
+    snapshot_path = snapshot_path_for(tenders_path)
+    if not snapshot_path.exists():
+        return None
+
+    try:
+        with TenderSnapshot(snapshot_path) as snapshot:
+            if not snapshot.is_fresh(tenders_path):
+                logger.warning(
+                    "Snapshot %s is stale (source hash mismatch), falling back to JSON",
+                    snapshot_path,
+                )
+                return None
+            return list(snapshot)
+    except (OSError, ValueError, EOFError, struct.error):
+        logger.warning("Cannot read snapshot %s", snapshot_path, exc_info=True)
+        return None
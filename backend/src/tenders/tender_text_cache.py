@@ -0,0 +1,159 @@
+import logging
+from collections.abc import Awaitable, Callable
+from datetime import datetime, timezone
+
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import ReturnDocument
+
+from src.tenders.tender_constants import (
+    EXTRACTED_TEXT_COLLECTION_NAME,
+    EXTRACTED_TEXT_EVICTION_SORT,
+    EXTRACTED_TEXT_STATS_COLLECTION_NAME,
+    MAX_CACHED_TEXT_BYTES,
+    extracted_text_by_hash_filter,
+)
+from src.tenders.tender_schemas import ExtractedTextDocument
+
+logger = logging.getLogger(__name__)
+
+# Called with the file URLs of entries dropped to stay under the size limit
+EvictionListener = Callable[[list[str]], Awaitable[None]]
+
+_TOTAL_ID = "total"
+
+
+class ExtractedTextCache:
+    """MongoDB cache of text extracted from tender attachments.
+
+    Entries are keyed by file URL and carry the HTTP validators (ETag,
+    Last-Modified) and a SHA-256 of the downloaded bytes, so an unchanged file
+    is never parsed twice - even when it is served under a different URL.
+    Total cached text is bounded by ``max_bytes`` with least-recently-read
+    eviction. The total is kept as a running counter, adjusted on every
+    write and eviction, so a put doesn't have to sum the whole collection.
+    """
+
+    def __init__(self, db: AsyncIOMotorDatabase, max_bytes: int) -> None:
+        self.collection = db[EXTRACTED_TEXT_COLLECTION_NAME]
+        self.stats = db[EXTRACTED_TEXT_STATS_COLLECTION_NAME]
+        self.max_bytes = max_bytes
+        self._eviction_listeners: list[EvictionListener] = []
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_bytes > 0
+
+    def subscribe_evictions(self, listener: EvictionListener) -> None:
+        self._eviction_listeners.append(listener)
+
+    async def get(self, file_url: str) -> ExtractedTextDocument | None:
+        if not self.enabled:
+            return None
+        raw = await self.collection.find_one({"_id": file_url})
+        return ExtractedTextDocument.from_mongo(raw) if raw else None
+
+    async def find_by_hash(self, content_hash: str) -> ExtractedTextDocument | None:
+        if not self.enabled:
+            return None
+        raw = await self.collection.find_one(
+            extracted_text_by_hash_filter(content_hash)
+        )
+        return ExtractedTextDocument.from_mongo(raw) if raw else None
+
+    async def touch(
+        self,
+        file_url: str,
+        etag: str | None = None,
+        last_modified: str | None = None,
+    ) -> None:
+        if not self.enabled:
+            return
+        update: dict[str, object] = {"last_accessed_at": datetime.now(timezone.utc)}
+        if etag is not None:
+            update["etag"] = etag
+        if last_modified is not None:
+            update["last_modified"] = last_modified
+        await self.collection.update_one({"_id": file_url}, {"$set": update})
+
+    async def put(self, document: ExtractedTextDocument) -> None:
+        if not self.enabled:
+            return
+        if document.size_bytes > MAX_CACHED_TEXT_BYTES:
+            logger.info(
+                "Not caching text of %s (%d bytes exceeds document limit)",
+                document.file_url,
+                document.size_bytes,
+            )
+            return
+
+        mongo_doc = document.to_mongo()
+        previous = await self.collection.find_one_and_replace(
+            {"_id": mongo_doc["_id"]},
+            mongo_doc,
+            projection={"size_bytes": 1},
+            upsert=True,
+        )
+        total = await self._add_bytes(
+            document.size_bytes - (previous["size_bytes"] if previous else 0)
+        )
+        logger.info(
+            "Cached extracted text for %s (%d bytes)",
+            document.file_url,
+            document.size_bytes,
+        )
+        if total > self.max_bytes:
+            await self._evict(total - self.max_bytes)
+
+    async def _add_bytes(self, delta: int) -> int:
+        """Adjust the running total by ``delta`` and return the new total."""
+        doc = await self.stats.find_one_and_update(
+            {"_id": _TOTAL_ID},
+            {"$inc": {"size_bytes": delta}},
+            return_document=ReturnDocument.AFTER,
+        )
+        if doc is not None:
+            return int(doc["size_bytes"])
+
+        # First write since the counter was introduced: count what's there
+        cursor = self.collection.aggregate(
+            [{"$group": {"_id": None, "total": {"$sum": "$size_bytes"}}}]
+        )
+        result = await cursor.to_list(length=1)
+        total = int(result[0]["total"]) if result else 0
+        doc = await self.stats.find_one_and_update(
+            {"_id": _TOTAL_ID},
+            {"$setOnInsert": {"size_bytes": total}},
+            upsert=True,
+            return_document=ReturnDocument.AFTER,
+        )
+        return int(doc["size_bytes"])
+
+    async def _evict(self, excess: int) -> None:
+        cursor = self.collection.find(
+            {}, {"size_bytes": 1}, sort=EXTRACTED_TEXT_EVICTION_SORT
+        )
+        candidates: list[str] = []
+        async for doc in cursor:
+            if excess <= 0:
+                break
+            candidates.append(doc["_id"])
+            excess -= doc["size_bytes"]
+
+        # One by one, so an entry a concurrent eviction already removed is
+        # not subtracted from the total twice
+        evicted: list[str] = []
+        freed = 0
+        for file_url in candidates:
+            doc = await self.collection.find_one_and_delete(
+                {"_id": file_url}, projection={"size_bytes": 1}
+            )
+            if doc is not None:
+                evicted.append(file_url)
+                freed += doc["size_bytes"]
+        await self._add_bytes(-freed)
+        logger.info("Evicted %d extracted text(s) from cache", len(evicted))
+        for listener in self._eviction_listeners:
+            try:
+                await listener(evicted)
+            except Exception:
+                logger.exception("Extracted text eviction listener %r failed", listener)